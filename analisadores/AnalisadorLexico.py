@@ -1,5 +1,19 @@
+import glob
+import hashlib
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+from array import array
+
 import ply.lex as lex
+from analisadores.ScannerManual import ScannerManual
 from utils.Cor import Cor
+from utils.Diagnosticos import LEXICO, Diagnostico, Diagnosticos
+from utils.Identificadores import TabelaIdentificadores
+from utils.TabelaTokens import TabelaTokens
+from utils.TokensEmBlocos import TokensEmBlocos
 from utils.Token import Token
 
 
@@ -66,7 +80,7 @@ class AnalisadorLexico:
     # Identificadores e palavras reservadas
     def t_ID(self, token):
         r'[a-zA-Z_][a-zA-Z0-9_]*'
-        token.type = self.palavras_reservadas.get(token.value, 'ID')
+        token.type, token.value, _ = self.identificadores.classificar(token.value)
         return token
 
     # Comentários no formato $ ... $
@@ -83,32 +97,320 @@ class AnalisadorLexico:
     # Espaços em branco ignorados
     t_ignore = ' \t\r'
 
-    # Tratamento de erro
+    # Tratamento de erro: a sequência inteira de caracteres ilegais vira um único
+    # erro (texto, linha, início, quantidade), com a mesma regra do ScannerManual
     def t_error(self, t):
-        self.erros.append((t.value[0], t.lineno))
-        t.lexer.skip(1)
+        dados = t.lexer.lexdata
+        m = ScannerManual.ILEGAIS.match(dados, t.lexpos)
+        if self.max_erros is not None and len(self.erros) >= self.max_erros:
+            # um erro além do limite: é descartado, junto com o resto da entrada
+            self._abortado = True
+            t.lexer.lexpos = len(dados)
+            return
+        fim = m.end() if m else t.lexpos + 1
+        self.erros.append((dados[t.lexpos:fim], t.lineno, t.lexpos, fim - t.lexpos))
+        t.lexer.lexpos = fim
+
+    # Lexer já construído, compartilhado por todas as instâncias do processo
+    _lexer_base = None
+    # ScannerManual do backend "manual" (as subclasses que lexam sozinhas não têm)
+    scanner = None
+    _abortado = False
 
     # Construtor
-    def __init__(self, codigo):
-        self.lexo = lex.lex(module=self)
+    def __init__(self, codigo, otimizado=False, streaming=False, compacto=False, backend="ply", incremental=False, max_erros=None):
+        # backend "ply" usa as regras t_* via ply.lex; "manual" usa o ScannerManual,
+        # que produz o mesmo fluxo de tokens e de erros sem callbacks por token
+        if incremental and max_erros is not None:
+            raise ValueError("max_erros não é suportado no modo incremental")
+        self.backend = backend
         self.erros = list()
-        self.tokens = list()
-        self.gerarTokens(codigo)
+        # com max_erros, a análise é interrompida no primeiro erro além do limite
+        self.max_erros = max_erros
+        self.identificadores = TabelaIdentificadores(self.palavras_reservadas)
+        if backend == "manual":
+            self.lexo = None
+            self.scanner = ScannerManual(self.identificadores, self.erros, max_erros)
+        else:
+            self.lexo = self.construirLexer(otimizado)
+        # No modo compacto os tokens ficam em colunas de array (TabelaTokens),
+        # com o mesmo acesso por índice/iteração da lista de tuplas.
+        self.tokens = TabelaTokens(codigo) if compacto else list()
+        # No modo streaming os tokens são produzidos sob demanda por self.fluxo;
+        # os erros aparecem em self.erros à medida que o fluxo é consumido.
+        self.fluxo = None
+        # No modo incremental o código e o início de cada token são mantidos (em
+        # TokensEmBlocos) para que reLexar() reprocesse apenas o trecho afetado
+        # por uma edição.
+        self.codigo = None
+        if streaming:
+            self.fluxo = self.iterarTokens(codigo)
+        elif incremental:
+            self.codigo = codigo
+            self.tokens = TokensEmBlocos()
+            for tipo, inicio, fim, linha in self.iterarSpans(codigo):
+                self.tokens.adicionar((tipo, self.lexemaInternado(tipo, codigo[inicio:fim]), linha), inicio)
+        else:
+            self.gerarTokens(codigo)
+
+    def construirLexer(self, otimizado=False):
+        # O PLY reintrospecta a classe e recompila a regex mestre a cada lex.lex();
+        # o lexer é construído uma vez por processo e clonado para cada instância.
+        # No modo otimizado as tabelas ficam gravadas em um módulo lextab reutilizado
+        # entre execuções, cujo nome carrega a assinatura das regras.
+        base = AnalisadorLexico._lexer_base
+        if base is None or (otimizado and not base.lexoptimize):
+            if otimizado:
+                base = self.construirLexerOtimizado()
+            else:
+                base = lex.lex(module=self)
+            AnalisadorLexico._lexer_base = base
+        lexer = base.clone(self)
+        # clone() religa as tabelas de estado, mas não a regex e o t_error ativos
+        lexer.begin("INITIAL")
+        return lexer
+
+    # onde o módulo lextab é gravado e procurado: por padrão, ao lado deste arquivo
+    DIRETORIO_LEXTAB = os.path.dirname(os.path.abspath(__file__))
+
+    def construirLexerOtimizado(self):
+        # As tabelas vêm do módulo lextab, carregado aqui e passado pronto ao PLY,
+        # que então não grava nada. Sem lextab, ou com um ilegível (de uma
+        # gravação interrompida), o lexer é construído a partir das regras e o
+        # lextab é gravado num temporário ao lado e movido com os.replace, então
+        # outra execução ao mesmo tempo nunca lê um arquivo pela metade.
+        nome = f"lextab_{self.assinaturaRegras()}"
+        diretorio = self.DIRETORIO_LEXTAB
+        caminho = os.path.join(diretorio, nome + ".py")
+        try:
+            especificacao = importlib.util.spec_from_file_location(nome, caminho)
+            tabelas = importlib.util.module_from_spec(especificacao)
+            especificacao.loader.exec_module(tabelas)
+            # com outro _tabversion o PLY reconstruiria sem regravar o arquivo
+            if getattr(tabelas, "_tabversion", None) == lex.__tabversion__:
+                return lex.lex(module=self, optimize=True, lextab=tabelas, errorlog=lex.NullLogger())
+        except Exception:
+            pass
+        base = lex.lex(module=self, optimize=True, lextab="", errorlog=lex.NullLogger())
+        try:
+            temporario = tempfile.mkdtemp(prefix=".lextab-", dir=diretorio)
+        except OSError:
+            # diretório só de leitura: as tabelas valem só para este processo
+            return base
+        try:
+            base.writetab(nome, temporario)
+            os.replace(os.path.join(temporario, nome + ".py"), caminho)
+        except OSError:
+            pass
+        else:
+            self.removerLextabsAntigos(diretorio, nome)
+        finally:
+            shutil.rmtree(temporario, ignore_errors=True)
+        return base
+
+    @staticmethod
+    def removerLextabsAntigos(diretorio, atual):
+        # cada mudança nas regras grava um lextab com outro nome; os das regras
+        # anteriores (e os bytecodes deles) nunca mais seriam lidos
+        antigos = glob.glob(os.path.join(diretorio, "lextab_*.py"))
+        antigos += glob.glob(os.path.join(diretorio, "__pycache__", "lextab_*.pyc"))
+        for arquivo in antigos:
+            if os.path.basename(arquivo).split(".", 1)[0] != atual:
+                try:
+                    os.remove(arquivo)
+                except OSError:
+                    pass
+
+    @property
+    def abortado(self):
+        """Se um erro além de max_erros foi descartado, com o resto da entrada."""
+        if self.scanner is not None:
+            return self.scanner.abortado
+        return self._abortado
+
+    @classmethod
+    def regrasOrdenadas(cls):
+        # Mesma ordem da regex mestre do PLY: regras-função na ordem em que foram
+        # definidas, depois as regras-string da maior para a menor expressão.
+        funcoes = []
+        simples = []
+        for nome in dir(cls):
+            if not nome.startswith("t_") or nome in ("t_ignore", "t_error"):
+                continue
+            regra = getattr(cls, nome)
+            if callable(regra):
+                funcoes.append((regra.__code__.co_firstlineno, nome, regra.__doc__))
+            else:
+                simples.append((nome, regra))
+        funcoes.sort()
+        simples.sort(key=lambda item: len(item[1]), reverse=True)
+        return [(nome, regex) for _, nome, regex in funcoes] + simples
+
+    @classmethod
+    def assinaturaRegras(cls):
+        regras = [cls.t_ignore, repr(cls.tokens)]
+        for nome in sorted(vars(cls)):
+            if nome.startswith("t_"):
+                regra = vars(cls)[nome]
+                regras.append(f"{nome}={getattr(regra, '__doc__', None) if callable(regra) else regra}")
+        return hashlib.sha1("\n".join(regras).encode()).hexdigest()[:12]
 
     # Função principal
     def gerarTokens(self, codigo):
+        if isinstance(self.tokens, TabelaTokens):
+            self.gerarTokensCompactos(codigo)
+        else:
+            self.tokens.extend(self.iterarTokens(codigo))
+
+    def gerarTokensCompactos(self, codigo):
+        adicionar = self.tokens.adicionar
+        for tipo, inicio, fim, linha in self.iterarSpans(codigo):
+            adicionar(tipo, inicio, fim, linha)
+
+    def iterarTokens(self, codigo):
+        if self.backend == "manual":
+            return self.scanner.iterarTokens(codigo)
+        return self.iterarTokensPly(codigo)
+
+    def iterarTokensPly(self, codigo):
         self.lexo.input(codigo)
+        self.lexo.lineno = 1
+        proximo = self.lexo.token
         while True:
-            tok = self.lexo.token()
+            tok = proximo()
             if not tok:
                 break
-            self.tokens.append((tok.type, tok.value, tok.lineno))
+            yield (tok.type, tok.value, tok.lineno)
+
+    def lexemaInternado(self, tipo, lexema):
+        if tipo == Token.ID.value:
+            return self.identificadores.classificar(lexema)[1]
+        return lexema
+
+    def iterarSpans(self, codigo, pos=0, linha=1):
+        # (tipo, início, fim, linha) a partir de pos/linha, para qualquer backend
+        if self.backend == "manual":
+            return self.scanner.iterarSpans(codigo, pos, linha)
+        return self.iterarSpansPly(codigo, pos, linha)
+
+    def iterarSpansPly(self, codigo, pos=0, linha=1):
+        self.lexo.input(codigo)
+        self.lexo.lexpos = pos
+        self.lexo.lineno = linha
+        proximo = self.lexo.token
+        while True:
+            tok = proximo()
+            if not tok:
+                break
+            yield (tok.type, tok.lexpos, tok.lexpos + len(tok.value), tok.lineno)
+
+    # Re-lexing incremental
+    def reLexar(self, offset, removidos, inseridos):
+        """Aplica a edição (offset, removidos, inseridos) e re-lexa só o trecho afetado.
+
+        Atualiza self.codigo, self.tokens e self.erros e devolve
+        (inicio, fim_antigo, fim_novo): os tokens antigos [inicio:fim_antigo] foram
+        trocados pelos novos [inicio:fim_novo]; o resto do fluxo é igual ao
+        anterior, com linhas deslocadas se a edição mudou a quantidade de linhas.
+        Os tokens depois do trecho não são tocados: TokensEmBlocos desloca os
+        blocos deles de uma vez.
+        """
+        if not isinstance(self.tokens, TokensEmBlocos):
+            raise ValueError("reLexar exige AnalisadorLexico(..., incremental=True)")
+        antigo = self.codigo
+        novo = antigo[:offset] + inseridos + antigo[offset + removidos:]
+        delta = len(inseridos) - removidos
+        delta_linhas = inseridos.count("\n") - antigo.count("\n", offset, offset + removidos)
+        fim_edicao = offset + len(inseridos)
+
+        # Ponto de reinício seguro: o último token que começa antes da linha editada.
+        # Um STRING só alcança aspas da própria linha e um comentário não contém
+        # tokens, então nada antes desse token depende do texto editado. A exceção
+        # é um '$' sem par: não existe outro '$' depois dele, e um '$' inserido
+        # transformaria tudo entre os dois em comentário.
+        limite = antigo.rfind("\n", 0, offset) + 1
+        for erro in self.erros:
+            if erro[0] == "$" and erro[2] < limite:
+                limite = erro[2]
+                break
+        tokens = self.tokens
+        inicio = tokens.buscar(limite) - 1
+        if inicio >= 0:
+            pos, linha = tokens.inicio(inicio), tokens[inicio][2]
+        else:
+            inicio, pos, linha = 0, 0, 1
+
+        # Re-lexa até um token novo cair, depois da edição, exatamente no início
+        # de um token antigo: dali em diante o texto é o mesmo e o fluxo também.
+        erros_antigos = self.erros
+        novos_erros = []
+        self.erros = novos_erros
+        if self.backend == "manual":
+            self.scanner.erros = novos_erros
+        novos_tokens = []
+        novos_inicios = array("q")
+        retomada = len(tokens)
+        try:
+            for tipo, ini, fim, lin in self.iterarSpans(novo, pos, linha):
+                if ini >= fim_edicao:
+                    k = tokens.buscar(ini - delta, inicio)
+                    if k < len(tokens) and tokens.inicio(k) == ini - delta:
+                        retomada = k
+                        break
+                novos_tokens.append((tipo, self.lexemaInternado(tipo, novo[ini:fim]), lin))
+                novos_inicios.append(ini)
+        finally:
+            self.erros = erros_antigos
+            if self.backend == "manual":
+                self.scanner.erros = erros_antigos
+
+        # tokens re-lexados iguais aos antigos no começo do trecho não contam como mudança
+        iguais = 0
+        while (
+            iguais < len(novos_tokens)
+            and inicio + iguais < retomada
+            and novos_inicios[iguais] == tokens.inicio(inicio + iguais)
+            and novos_tokens[iguais] == tokens[inicio + iguais]
+        ):
+            iguais += 1
+
+        pos_retomada = tokens.inicio(retomada) if retomada < len(tokens) else len(antigo) + 1
+        tokens.substituir(inicio, retomada, novos_tokens, novos_inicios, delta, delta_linhas)
+        self.erros[:] = (
+            [erro for erro in erros_antigos if erro[2] < pos]
+            + novos_erros
+            + [
+                (texto, lin + delta_linhas, ini + delta, quantidade)
+                for texto, lin, ini, quantidade in erros_antigos
+                if ini >= pos_retomada
+            ]
+        )
+        self.codigo = novo
+        return inicio + iguais, retomada, inicio + len(novos_tokens)
 
     # Funções auxiliares
     def printTokens(self):
-        for token in self.tokens:
+        self.imprimirTokens(self.tokens)
+
+    @staticmethod
+    def imprimirTokens(tokens):
+        # também usado com tokens vindos do cache, sem um lexer
+        for token in tokens:
             print(Cor.pintar(f"{token[0]} {(20-len(token[0]))*' '} Lexema: {token[1]} {(10-len(str(token[1])))*' '} linha: {token[2]}" , Cor.VERDE))
 
+    def diagnosticos(self):
+        """Os erros como Diagnostico, montados só à medida que são consumidos."""
+        for texto, linha, inicio, quantidade in self.erros:
+            if quantidade == 1:
+                yield Diagnostico(LEXICO, "caracter-ilegal", (self.visivel(texto),), linha, inicio, quantidade)
+            else:
+                amostra = self.visivel(texto[:20]) + ("..." if len(texto) > 20 else "")
+                yield Diagnostico(LEXICO, "caracteres-ilegais", (quantidade, amostra), linha, inicio, quantidade)
+
     def printErros(self):
-        for token in self.erros:
-            print(Cor.pintar(f"Caracter ilegal '{token[0]}' na linha {token[1]}" , Cor.VERMELHO))
+        Diagnosticos().relatar(LEXICO, self.diagnosticos(), interrompida=self.abortado)
+
+    @staticmethod
+    def visivel(texto):
+        # caracteres de controle (entrada binária) aparecem escapados
+        return "".join(c if c.isprintable() else f"\\x{ord(c):02x}" for c in texto)
@@ -0,0 +1,96 @@
+import mmap
+import re
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from utils.TabelaTokens import TabelaTokens
+
+
+class AnalisadorLexicoMapeado(AnalisadorLexico):
+    """Lexer sobre o arquivo mapeado em memória, operando direto nos bytes.
+
+    Usa as mesmas regras declaradas em AnalisadorLexico, compiladas como uma
+    regex mestre de bytes na ordem do PLY. Os tokens vão para uma TabelaTokens
+    cuja fonte é o próprio mapeamento: os lexemas continuam no arquivo até
+    alguém pedi-los. Em bytes, \\d casa apenas os dígitos ASCII e as posições
+    (inclusive as dos erros) são offsets em bytes.
+    """
+
+    _regex_mestre = None
+    _reservadas_bytes = None
+    # ScannerManual.ILEGAIS em bytes: sem \d Unicode, todo byte não ASCII é ilegal
+    _ILEGAIS = re.compile(rb'[^a-zA-Z0-9_ \t\r\n$":;,.()\[\]<>=!+\-*/]+')
+
+    def __init__(self, caminho, max_erros=None, mapeamento=None):
+        # mapeamento: o (arquivo, fonte) de mapear(caminho), se já foi aberto
+        self.erros = list()
+        self.max_erros = max_erros
+        self.fluxo = None
+        self._arquivo, self.fonte = mapeamento or self.mapear(caminho)
+        self.tokens = TabelaTokens(self.fonte)
+        self.gerarTokens(self.fonte)
+
+    @staticmethod
+    def mapear(caminho):
+        """Abre o arquivo e o mapeia só para leitura: devolve (arquivo, fonte)."""
+        arquivo = open(caminho, "rb")
+        try:
+            return arquivo, mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # arquivo vazio não pode ser mapeado
+            return arquivo, b""
+        except OSError:
+            arquivo.close()
+            raise
+
+    @classmethod
+    def regexMestre(cls):
+        if cls._regex_mestre is None:
+            grupos = [f"(?P<{nome}>{regex})" for nome, regex in cls.regrasOrdenadas()]
+            cls._regex_mestre = re.compile("|".join(grupos).encode(), re.VERBOSE)
+            cls._reservadas_bytes = {
+                palavra.encode(): tipo for palavra, tipo in cls.palavras_reservadas.items()
+            }
+        return cls._regex_mestre
+
+    def gerarTokens(self, fonte):
+        casar = self.regexMestre().match
+        reservadas = self._reservadas_bytes
+        ignorar = set(self.t_ignore.encode())
+        adicionar = self.tokens.adicionar
+        pos = 0
+        linha = 1
+        tamanho = len(fonte)
+        while pos < tamanho:
+            if fonte[pos] in ignorar:
+                pos += 1
+                continue
+            m = casar(fonte, pos)
+            if m is None:
+                if self.max_erros is not None and len(self.erros) >= self.max_erros:
+                    # um erro além do limite: é descartado, junto com o resto da entrada
+                    self._abortado = True
+                    break
+                # a sequência só para em caracteres ASCII, então não corta um
+                # caractere UTF-8 ao meio
+                ilegais = self._ILEGAIS.match(fonte, pos)
+                fim = ilegais.end() if ilegais else pos + 1
+                texto = bytes(fonte[pos:fim]).decode("utf-8", "replace")
+                self.erros.append((texto, linha, pos, fim - pos))
+                pos = fim
+                continue
+            regra = m.lastgroup
+            fim = m.end()
+            if regra == "t_newline":
+                linha += fim - pos
+            elif regra == "t_COMENTARIO":
+                linha += m.group().count(b"\n")
+            elif regra == "t_ID":
+                adicionar(reservadas.get(fonte[pos:fim], "ID"), pos, fim, linha)
+            else:
+                adicionar(regra[2:], pos, fim, linha)
+            pos = fim
+
+    def fechar(self):
+        if isinstance(self.fonte, mmap.mmap):
+            self.fonte.close()
+        self._arquivo.close()
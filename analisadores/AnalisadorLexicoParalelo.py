@@ -0,0 +1,96 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from utils.Token import Token
+
+
+def _lexarTrecho(argumentos):
+    # executado nos processos do pool: lexa um trecho a partir da linha informada
+    trecho, linha, backend, max_erros = argumentos
+    lexo = AnalisadorLexico("", otimizado=True, backend=backend, max_erros=max_erros)
+    tokens = [
+        (tipo, trecho[inicio:fim], lin)
+        for tipo, inicio, fim, lin in lexo.iterarSpans(trecho, 0, linha)
+    ]
+    return tokens, lexo.erros, lexo.abortado
+
+
+class AnalisadorLexicoParalelo(AnalisadorLexico):
+    """Lexa arquivos grandes em trechos, em paralelo, num pool de processos.
+
+    O código é cortado em quebras de linha seguras (fora de comentários $ ... $
+    e de strings), cada trecho é lexado a partir da sua linha inicial e os
+    fluxos são costurados em ordem. Tokens, erros e ids dos identificadores
+    ficam idênticos aos do AnalisadorLexico sequencial.
+    """
+
+    # Comentários e strings na mesma semântica das regras t_COMENTARIO e t_STRING.
+    # Nenhum outro token contém '$' ou '"', então percorrer o texto só com esta
+    # regex encontra exatamente as mesmas regiões que o lexer.
+    _ZONAS = re.compile(r'\$[^$]*\$|"[^\n]*"')
+
+    def __init__(self, codigo, trabalhadores=None, backend="ply", tamanho_minimo=1 << 16, max_erros=None):
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1
+        self.tamanho_minimo = tamanho_minimo
+        super().__init__(codigo, otimizado=True, backend=backend, max_erros=max_erros)
+
+    def gerarTokens(self, codigo):
+        if self.trabalhadores <= 1 or len(codigo) < self.tamanho_minimo:
+            super().gerarTokens(codigo)
+            return
+
+        limites = self.limitesSeguros(codigo, self.trabalhadores)
+        trechos = []
+        linhas = []
+        linha = 1
+        for inicio, fim in zip(limites, limites[1:]):
+            trechos.append((codigo[inicio:fim], linha, self.backend, self.max_erros))
+            linhas.append(linha)
+            linha += codigo.count("\n", inicio, fim)
+
+        with ProcessPoolExecutor(max_workers=self.trabalhadores) as pool:
+            resultados = list(pool.map(_lexarTrecho, trechos))
+
+        # ids de identificadores são atribuídos na ordem da primeira ocorrência,
+        # como no lexer sequencial
+        classificar = self.identificadores.classificar
+        identificador = Token.ID.value
+        for inicio, linha, (tokens, erros, abortado) in zip(limites, linhas, resultados):
+            if self.max_erros is not None and (abortado or len(self.erros) + len(erros) > self.max_erros):
+                # o limite de erros cai neste trecho: ele é re-lexado aqui a partir do
+                # seu início, parando no mesmo ponto que o lexer sequencial
+                for tipo, ini, fim, lin in self.iterarSpans(codigo, inicio, linha):
+                    self.tokens.append((tipo, self.lexemaInternado(tipo, codigo[ini:fim]), lin))
+                break
+            for token in tokens:
+                if token[0] == identificador:
+                    token = (identificador, classificar(token[1])[1], token[2])
+                self.tokens.append(token)
+            self.erros.extend(
+                (texto, lin, pos + inicio, quantidade) for texto, lin, pos, quantidade in erros
+            )
+
+    def limitesSeguros(self, codigo, partes):
+        """Offsets de corte: 0, início de cada trecho e len(codigo)."""
+        tamanho = len(codigo)
+        zonas = self._ZONAS.finditer(codigo)
+        zona = next(zonas, None)
+        limites = [0]
+        for parte in range(1, partes):
+            pos = codigo.find("\n", max(parte * tamanho // partes, limites[-1]))
+            while pos >= 0:
+                while zona is not None and zona.end() <= pos:
+                    zona = next(zonas, None)
+                if zona is not None and zona.start() <= pos:
+                    pos = codigo.find("\n", zona.end())
+                    continue
+                break
+            if pos < 0:
+                break
+            if pos + 1 > limites[-1]:
+                limites.append(pos + 1)
+        if limites[-1] != tamanho:
+            limites.append(tamanho)
+        return limites
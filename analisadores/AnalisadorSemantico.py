@@ -1,13 +1,24 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
+from utils import Ast, Atributos, Tipos
+from utils.Diagnosticos import SEMANTICO, Diagnostico, LimiteDeErros
 from utils.No import No
 from utils.Token import Token
 from utils.TabelaSimbolos import EntradaTabelaSimbolos, TabelaSimbolos
+from utils.Visitante import Visitante, executar
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ContextoSemantico:
+    """Contexto herdado pelos nós durante o percurso; imutável e compartilhado.
+
+    Os com_* devolvem o próprio contexto quando o campo não muda e, quando
+    muda, a instância canônica com aqueles valores: existe uma por combinação
+    em uso, e não uma nova a cada nó visitado.
+    """
+
     escopo: str = "global"
     em_declaracao: bool = False
     tipo_atual: Optional[str] = None
@@ -15,88 +26,92 @@ class ContextoSemantico:
     quantidade_atual: Optional[int] = None
 
     def com_escopo(self, escopo: str) -> "ContextoSemantico":
-        return ContextoSemantico(
-            escopo=escopo,
-            em_declaracao=self.em_declaracao,
-            tipo_atual=self.tipo_atual,
-            classificacao_atual=self.classificacao_atual,
-            quantidade_atual=self.quantidade_atual,
-        )
+        if escopo == self.escopo:
+            return self
+        return _contexto(escopo, self.em_declaracao, self.tipo_atual, self.classificacao_atual, self.quantidade_atual)
 
     def com_declaracao(self, em_declaracao: bool) -> "ContextoSemantico":
-        return ContextoSemantico(
-            escopo=self.escopo,
-            em_declaracao=em_declaracao,
-            tipo_atual=self.tipo_atual,
-            classificacao_atual=self.classificacao_atual,
-            quantidade_atual=self.quantidade_atual,
-        )
+        if em_declaracao == self.em_declaracao:
+            return self
+        return _contexto(self.escopo, em_declaracao, self.tipo_atual, self.classificacao_atual, self.quantidade_atual)
 
     def com_tipo(self, tipo: Optional[str]) -> "ContextoSemantico":
-        return ContextoSemantico(
-            escopo=self.escopo,
-            em_declaracao=self.em_declaracao,
-            tipo_atual=tipo,
-            classificacao_atual=self.classificacao_atual,
-            quantidade_atual=self.quantidade_atual,
-        )
+        if tipo == self.tipo_atual:
+            return self
+        return _contexto(self.escopo, self.em_declaracao, tipo, self.classificacao_atual, self.quantidade_atual)
 
     def com_classificacao(self, classificacao: Optional[str]) -> "ContextoSemantico":
-        return ContextoSemantico(
-            escopo=self.escopo,
-            em_declaracao=self.em_declaracao,
-            tipo_atual=self.tipo_atual,
-            classificacao_atual=classificacao,
-            quantidade_atual=self.quantidade_atual,
-        )
+        if classificacao == self.classificacao_atual:
+            return self
+        return _contexto(self.escopo, self.em_declaracao, self.tipo_atual, classificacao, self.quantidade_atual)
 
     def com_quantidade(self, quantidade: Optional[int]) -> "ContextoSemantico":
-        return ContextoSemantico(
-            escopo=self.escopo,
-            em_declaracao=self.em_declaracao,
-            tipo_atual=self.tipo_atual,
-            classificacao_atual=self.classificacao_atual,
-            quantidade_atual=quantidade,
-        )
+        if quantidade == self.quantidade_atual:
+            return self
+        return _contexto(self.escopo, self.em_declaracao, self.tipo_atual, self.classificacao_atual, quantidade)
+
+
+@lru_cache(maxsize=4096)
+def _contexto(escopo, em_declaracao, tipo_atual, classificacao_atual, quantidade_atual):
+    return ContextoSemantico(escopo, em_declaracao, tipo_atual, classificacao_atual, quantidade_atual)
 
 
-class AnalisadorSemantico:
-    """Percorre a árvore sintática preenchendo a tabela de símbolos."""
+class AnalisadorSemantico(Visitante):
+    """Percorre a árvore sintática preenchendo a tabela de símbolos.
+
+    A árvore concreta (No) é percorrida pelo Visitante, sem recursão: entrar
+    abre os escopos e ajusta o contexto, sair processa o nó em pós-ordem.
+    Também aceita a AST compacta (utils.Ast.Programa); para ela os métodos
+    _ast_* reproduzem a mesma sequência de verificações do percurso em
+    pós-ordem da árvore concreta, com a mesma tabela e os mesmos erros. Os
+    _ast_* que descem em blocos e tipos aninhados são geradores executados
+    por utils.Visitante.executar e os nomes (a[b[c]]) são percorridos em
+    laço, então também não há limite de profundidade.
+    """
 
     NOS_DECLARACAO = {"CONSTANTE", "TIPO", "VARIAVEL", "NOME_FUNCAO"}
     NOS_TIPO_PRIMITIVO = {Token.INTEGER.value, Token.REAL.value}
 
-    def __init__(self, arvore_sintatica: No):
+    def __init__(self, arvore_sintatica: No, max_erros: Optional[int] = None, importadas=()):
         self.arvore = arvore_sintatica
         self.tabela = TabelaSimbolos()
+        # entradas de outras unidades (utils.Interface), visíveis no escopo global
+        self.importadas = tuple(importadas)
+        self._importar()
         self.erros = []
+        # com max_erros, a análise para no primeiro erro além do limite (tabela incompleta)
+        self.max_erros = max_erros
+        self.abortado = False
         self._funcao_atual: Optional[str] = None
         self._escopo_pendente: Optional[str] = None
         self._definindo_parametros: bool = False
         self._ultimo_simbolo: Optional[EntradaTabelaSimbolos] = None
 
+    def _importar(self):
+        for entrada in self.importadas:
+            self.tabela.adicionar(entrada, escopo="global")
+
     def analisar(self) -> TabelaSimbolos:
-        self._percorrer(self.arvore, ContextoSemantico())
+        try:
+            if isinstance(self.arvore, Ast.Programa):
+                executar(self._ast_programa(self.arvore))
+            else:
+                self.percorrer(self.arvore, ContextoSemantico())
+        except LimiteDeErros:
+            self.abortado = True
         return self.tabela
 
-    def _percorrer(self, no: No, contexto: ContextoSemantico):
-        if not no:
-            return
-
+    def entrar(self, no: No, contexto: ContextoSemantico):
         if no.tipo == "FUNCAO":
             cabecalho = no.filhos[0] if no.filhos else None
             self._registrar_funcao_cabecalho(cabecalho)
 
-        entrou_escopo = False
-        escopo_anterior = self.tabela.escopo_atual
-        funcao_anterior = self._funcao_atual
-        definindo_parametros_anterior = self._definindo_parametros
-
+        anterior = None
         if self._abre_escopo(no):
+            anterior = (self._funcao_atual, self._definindo_parametros)
             nome_escopo = self._nome_escopo(no)
             self.tabela.entrar_escopo(nome_escopo)
             contexto = contexto.com_escopo(self.tabela.escopo_atual)
-            entrou_escopo = True
             if no.tipo == "FUNCAO":
                 self._funcao_atual = self._escopo_pendente or nome_escopo
                 self._definindo_parametros = True
@@ -104,16 +119,15 @@ class AnalisadorSemantico:
                 self._definindo_parametros = False
 
         contexto_declaracao = self._ajustar_contexto(no, contexto)
+        return (contexto_declaracao, anterior), contexto_declaracao
 
-        for filho in no.filhos:
-            self._percorrer(filho, contexto_declaracao)
-
+    def sair(self, no: No, estado):
+        contexto_declaracao, anterior = estado
         self._processar_no(no, contexto_declaracao)
 
-        if entrou_escopo:
+        if anterior is not None:
             self.tabela.sair_escopo()
-            self._funcao_atual = funcao_anterior
-            self._definindo_parametros = definindo_parametros_anterior
+            self._funcao_atual, self._definindo_parametros = anterior
 
         self._escopo_pendente = None
 
@@ -131,7 +145,7 @@ class AnalisadorSemantico:
             return
         self._escopo_pendente = nome
         if self.tabela.existe_no_escopo(nome):
-            self._registrar_erro(f"Identificador '{nome}' já declarado no escopo '{self.tabela.escopo_atual}'.", no)
+            self._registrar_erro("redeclaracao", no, nome, self.tabela.escopo_atual)
             return
         entrada = EntradaTabelaSimbolos(
             nome=nome,
@@ -186,14 +200,14 @@ class AnalisadorSemantico:
         if not identificador:
             return
         if self.tabela.existe_no_escopo(identificador):
-            self._registrar_erro(f"Identificador '{identificador}' já declarado no escopo '{self.tabela.escopo_atual}'.", no)
+            self._registrar_erro("redeclaracao", no, identificador, self.tabela.escopo_atual)
             return
         tipo_valor = None
         if no.filhos:
             const_valor = no.filhos[2] if len(no.filhos) > 2 else None
             if const_valor:
                 tipo_valor = getattr(const_valor, "tipo_inferido", None) or (
-                    "string" if const_valor.tipo == Token.STRING.value else "integer"
+                    Tipos.STRING if const_valor.tipo == Token.STRING.value else Tipos.INTEGER
                 )
 
         entrada = EntradaTabelaSimbolos(
@@ -209,7 +223,7 @@ class AnalisadorSemantico:
         if not identificador:
             return
         if self.tabela.existe_no_escopo(identificador):
-            self._registrar_erro(f"Identificador '{identificador}' já declarado no escopo '{self.tabela.escopo_atual}'.", no)
+            self._registrar_erro("redeclaracao", no, identificador, self.tabela.escopo_atual)
             return
         tipo_dado = no.filhos[-1]
         tipo = getattr(tipo_dado, "tipo_inferido", None)
@@ -230,10 +244,7 @@ class AnalisadorSemantico:
         ids = self._coletar_ids(lista_id_no)
         for identificador in ids:
             if self.tabela.existe_no_escopo(identificador):
-                self._registrar_erro(
-                    f"Identificador '{identificador}' já declarado no escopo '{self.tabela.escopo_atual}'.",
-                    no,
-                )
+                self._registrar_erro("redeclaracao", no, identificador, self.tabela.escopo_atual)
                 continue
             classificacao = "parametro" if self._definindo_parametros else "variavel"
             entrada = EntradaTabelaSimbolos(
@@ -276,19 +287,13 @@ class AnalisadorSemantico:
             valor_tipo = self._avaliar_valor(valor_no) if valor_no else None
             if not self._verificar_declaracao_nome(primeiro):
                 return
-            if valor_tipo and alvo_tipo and valor_tipo != alvo_tipo:
-                self._registrar_erro(
-                    f"Tipos incompatíveis na atribuição: '{alvo_tipo}' e '{valor_tipo}'.",
-                    no,
-                )
+            if valor_tipo and alvo_tipo and valor_tipo is not alvo_tipo:
+                self._registrar_erro("tipos-atribuicao", no, alvo_tipo, valor_tipo)
             primeiro_id = self._buscar_primeiro_id(primeiro)
             if self._funcao_atual and (self._nome_igual_funcao(primeiro) or primeiro_id == "result"):
                 funcao = self.tabela.buscar(self._funcao_atual, escopo=self._escopo_pai())
-                if funcao and funcao.tipo and funcao.tipo != valor_tipo:
-                    self._registrar_erro(
-                        f"Tipo de retorno '{valor_tipo}' difere do tipo da função '{funcao.tipo}'.",
-                        no,
-                    )
+                if funcao and funcao.tipo and funcao.tipo is not valor_tipo:
+                    self._registrar_erro("tipo-retorno", no, valor_tipo, funcao.tipo)
         elif primeiro.tipo in {Token.WHILE.value, Token.IF.value} and len(no.filhos) >= 2:
             condicao = no.filhos[1]
             self._avaliar_exp_logica(condicao)
@@ -298,23 +303,23 @@ class AnalisadorSemantico:
             return None
         primeiro = no.filhos[0]
         if primeiro.tipo == Token.NUMERO.value:
-            return "integer"
+            return Tipos.INTEGER
         if primeiro.tipo == Token.ID.value:
-            identificador = primeiro.valor
-            valor_no = no.filhos[1] if len(no.filhos) > 1 else None
-            if valor_no and valor_no.filhos and valor_no.filhos[0].tipo == "LISTA_PARAM":
-                return self._avaliar_chamada_funcao(identificador, valor_no.filhos[0])
-            nome_no = No("NOME", [primeiro] + ([valor_no] if valor_no else []))
-            return self._avaliar_nome(nome_no)
+            # VALOR → ID VALOR': chamada se VALOR' é LISTA_PARAM; senão, ID seguido do sufixo
+            valor_linha = Atributos.filho(no, "VALOR'")
+            lista_param = Atributos.filho(valor_linha, "LISTA_PARAM") if valor_linha else None
+            if lista_param:
+                return self._avaliar_chamada_funcao(primeiro.valor, lista_param)
+            return self._avaliar_identificador(primeiro, valor_linha, no)
         return None
 
     def _avaliar_chamada_funcao(self, identificador: str, lista_param_no: No):
         entrada = self.tabela.buscar(identificador)
         if not entrada:
-            self._registrar_erro(f"Identificador '{identificador}' não declarado antes do uso.", lista_param_no)
+            self._registrar_erro("nao-declarado", lista_param_no, identificador)
             return None
         if entrada.classificacao != "funcao":
-            self._registrar_erro(f"'{identificador}' não é uma função para receber parâmetros.", lista_param_no)
+            self._registrar_erro("nao-funcao", lista_param_no, identificador)
             return entrada.tipo
 
         parametros_declarados = entrada.metadados.get("parametros", [])
@@ -323,45 +328,40 @@ class AnalisadorSemantico:
             argumentos = []
         if len(argumentos) != len(parametros_declarados):
             self._registrar_erro(
-                f"Quantidade de parâmetros incompatível em '{identificador}': esperado {len(parametros_declarados)}, recebido {len(argumentos)}.",
-                lista_param_no,
+                "quantidade-parametros", lista_param_no, identificador, len(parametros_declarados), len(argumentos)
             )
         else:
             for idx, (arg, decl) in enumerate(zip(argumentos, parametros_declarados)):
-                if arg != decl.get("tipo"):
-                    self._registrar_erro(
-                        f"Tipo do argumento {idx + 1} incompatível em '{identificador}': esperado '{decl.get('tipo')}', recebido '{arg}'.",
-                        lista_param_no,
-                    )
+                if arg is not decl.get("tipo"):
+                    self._registrar_erro("tipo-argumento", lista_param_no, idx + 1, identificador, decl.get("tipo"), arg)
         return entrada.tipo
 
     def _avaliar_exp_logica(self, no: Optional[No]):
-        if not no or not no.filhos:
-            return None
-        esquerda = no.filhos[0]
-        tipo_esquerda = self._avaliar_exp_mat(esquerda)
-        if len(no.filhos) > 1 and no.filhos[1].filhos:
-            direita = no.filhos[1].filhos[1]
-            tipo_direita = self._avaliar_exp_logica(direita)
-            if tipo_esquerda and tipo_direita and tipo_esquerda != tipo_direita:
-                self._registrar_erro("Expressão lógica com tipos incompatíveis.", no)
-        no.tipo_inferido = tipo_esquerda
-        return tipo_esquerda
+        # a cadeia EXP_MAT OP_LOGICO EXP_MAT ... é avaliada da esquerda para a
+        # direita e comparada da direita para a esquerda, como na recursão à direita
+        cadeia = []
+        while no and no.filhos:
+            cadeia.append((no, self._avaliar_exp_mat(no.filhos[0])))
+            no = no.filhos[1].filhos[1] if len(no.filhos) > 1 and no.filhos[1].filhos else None
+        return self._comparar_cadeia(cadeia, "tipos-expressao-logica")
 
     def _avaliar_exp_mat(self, no: Optional[No]):
-        if not no or not no.filhos:
-            return None
-        parametro = no.filhos[0]
-        tipo_parametro = None
-        if parametro.tipo == "PARAMETRO":
-            tipo_parametro = self._avaliar_parametro(parametro)
-        if len(no.filhos) > 1 and no.filhos[1].filhos:
-            prox = no.filhos[1].filhos[1]
-            tipo_prox = self._avaliar_exp_mat(prox)
-            if tipo_parametro and tipo_prox and tipo_parametro != tipo_prox:
-                self._registrar_erro("Operação matemática com tipos incompatíveis.", no)
-        no.tipo_inferido = tipo_parametro
-        return tipo_parametro
+        cadeia = []
+        while no and no.filhos:
+            parametro = no.filhos[0]
+            tipo_parametro = self._avaliar_parametro(parametro) if parametro.tipo == "PARAMETRO" else None
+            cadeia.append((no, tipo_parametro))
+            no = no.filhos[1].filhos[1] if len(no.filhos) > 1 and no.filhos[1].filhos else None
+        return self._comparar_cadeia(cadeia, "tipos-operacao-matematica")
+
+    def _comparar_cadeia(self, cadeia, codigo: str):
+        tipo_direita = None
+        for no, tipo in reversed(cadeia):
+            if tipo and tipo_direita and tipo is not tipo_direita:
+                self._registrar_erro(codigo, no)
+            no.tipo_inferido = tipo
+            tipo_direita = tipo
+        return cadeia[0][1] if cadeia else None
 
     def _avaliar_parametro(self, no: No):
         if not no.filhos:
@@ -370,19 +370,22 @@ class AnalisadorSemantico:
         if filho.tipo == "NOME":
             return self._avaliar_nome(filho)
         if filho.tipo == Token.NUMERO.value:
-            return "integer"
+            return Tipos.INTEGER
         return None
 
     def _avaliar_nome(self, no: No):
         if not no.filhos:
             return None
-        identificador = no.filhos[0].valor
+        return self._avaliar_identificador(no.filhos[0], no.filhos[1] if len(no.filhos) > 1 else None, no)
+
+    def _avaliar_identificador(self, id_no: No, restante: Optional[No], no: No):
+        # ID seguido do sufixo `restante` (NOME' ou VALOR'); os erros apontam para `no`
+        identificador = id_no.valor
         entrada = self.tabela.buscar(identificador)
         if not entrada:
-            self._registrar_erro(f"Identificador '{identificador}' não declarado antes do uso.", no)
+            self._registrar_erro("nao-declarado", no, identificador)
             return None
         tipo_atual = entrada.tipo
-        restante = no.filhos[1] if len(no.filhos) > 1 else None
         if restante and restante.filhos:
             filho = restante.filhos[0]
             conteudo = filho.filhos[0] if filho.tipo == "NOME'" and filho.filhos else filho
@@ -394,34 +397,32 @@ class AnalisadorSemantico:
             if conteudo.tipo == Token.PONTO.value:
                 membro_no = parametro_no
                 if not self._eh_record(tipo_atual):
-                    self._registrar_erro("Acesso de membro apenas permitido para tipos classe/record.", no)
+                    self._registrar_erro("membro-em-nao-record", no)
                     return tipo_atual
                 membro_nome = self._buscar_primeiro_id(membro_no)
-                campos = tipo_atual.get("campos", {}) if isinstance(tipo_atual, dict) else {}
+                campos = tipo_atual.campos
                 if membro_nome not in campos:
-                    self._registrar_erro(f"Membro '{membro_nome}' não declarado no tipo.", no)
+                    self._registrar_erro("membro-nao-declarado", no, membro_nome)
                     return None
                 tipo_atual = campos[membro_nome]
             elif conteudo.tipo == Token.COLCHETE_ESQ.value:
                 if not self._eh_array(tipo_atual):
-                    self._registrar_erro("Índice só pode ser usado em variáveis do tipo vetor.", no)
+                    self._registrar_erro("indice-em-nao-vetor", no)
                     return tipo_atual
                 parametro = parametro_no
                 self._avaliar_parametro(parametro)
-                tipo_atual = tipo_atual.get("tipo") if isinstance(tipo_atual, dict) else None
+                tipo_atual = tipo_atual.base
         return tipo_atual
 
     def _coletar_argumentos(self, no: Optional[No]):
         if not no:
             return []
         argumentos = []
-        if no.tipo == "LISTA_NOME" and no.filhos:
+        while no and no.tipo == "LISTA_NOME" and no.filhos:
             parametro_no = no.filhos[0]
             if parametro_no.tipo == "PARAMETRO":
                 argumentos.append(self._avaliar_parametro(parametro_no))
-            if len(no.filhos) > 1:
-                proximo = no.filhos[1].filhos[1] if no.filhos[1].filhos else None
-                argumentos.extend(self._coletar_argumentos(proximo))
+            no = no.filhos[1].filhos[1] if len(no.filhos) > 1 and no.filhos[1].filhos else None
         return argumentos
 
     def _tipo_do_dado(self, no: No):
@@ -429,15 +430,15 @@ class AnalisadorSemantico:
             return None
         primeiro = no.filhos[0]
         if primeiro.tipo == Token.INTEGER.value:
-            return "integer"
+            return Tipos.INTEGER
         if primeiro.tipo == Token.REAL.value:
-            return "real"
+            return Tipos.REAL
         if primeiro.tipo == Token.ARRAY.value:
             tamanho_no = no.filhos[2]
             base_no = no.filhos[-1]
             base_tipo = getattr(base_no, "tipo_inferido", None) or self._tipo_do_dado(base_no)
             tamanho = tamanho_no.valor if tamanho_no else None
-            return {"categoria": "array", "tipo": base_tipo, "tamanho": tamanho}
+            return Tipos.array(base_tipo, tamanho)
         if primeiro.tipo == Token.RECORD.value:
             campos = {}
             lista_var_no = no.filhos[1]
@@ -446,11 +447,11 @@ class AnalisadorSemantico:
                     tipo_campo = getattr(variavel_no.filhos[2], "tipo_inferido", None)
                     for nome_campo in self._coletar_ids(variavel_no.filhos[0]):
                         campos[nome_campo] = tipo_campo
-            return {"categoria": "record", "campos": campos}
+            return Tipos.record(campos)
         if primeiro.tipo == Token.ID.value:
             entrada = self.tabela.buscar(primeiro.valor)
             if not entrada:
-                self._registrar_erro(f"Identificador '{primeiro.valor}' não declarado antes do uso.", no)
+                self._registrar_erro("nao-declarado", no, primeiro.valor)
                 return None
             return entrada.tipo
         return None
@@ -458,32 +459,29 @@ class AnalisadorSemantico:
     def _coletar_ids(self, no: Optional[No]):
         if not no:
             return []
-        ids = []
-        if no.tipo == Token.ID.value:
-            ids.append(no.valor)
-        for filho in no.filhos:
-            ids.extend(self._coletar_ids(filho))
-        return ids
+        return Atributos.ids(no)
 
     def _buscar_primeiro_id(self, no: Optional[No]):
         if not no:
             return None
-        if no.tipo == Token.ID.value:
-            return no.valor
-        for filho in no.filhos:
-            encontrado = self._buscar_primeiro_id(filho)
-            if encontrado:
-                return encontrado
-        return None
+        return Atributos.primeiro_id(no)
+
+    def _registrar_erro(self, codigo: str, no, *argumentos):
+        # a linha é a do primeiro token do nó concreto; um nó da AST compacta já traz a dele
+        linha = Atributos.linha(no) if isinstance(no, No) else getattr(no, "linha", None)
+        self._registrar_erro_na_linha(codigo, linha, *argumentos)
 
-    def _registrar_erro(self, mensagem: str, no: Optional[No]):
-        self.erros.append(mensagem)
+    def _registrar_erro_na_linha(self, codigo: str, linha: Optional[int], *argumentos):
+        if self.max_erros is not None and len(self.erros) >= self.max_erros:
+            # um erro além do limite: descartado, e a análise para aqui
+            raise LimiteDeErros()
+        self.erros.append(Diagnostico(SEMANTICO, codigo, argumentos, linha))
 
     def _eh_array(self, tipo):
-        return isinstance(tipo, dict) and tipo.get("categoria") == "array"
+        return isinstance(tipo, Tipos.Array)
 
     def _eh_record(self, tipo):
-        return isinstance(tipo, dict) and tipo.get("categoria") == "record"
+        return isinstance(tipo, Tipos.Record)
 
     def _escopo_pai(self):
         atual = self.tabela.escopo_atual
@@ -496,7 +494,7 @@ class AnalisadorSemantico:
         if not identificador:
             return False
         if not self.tabela.buscar(identificador):
-            self._registrar_erro(f"Identificador '{identificador}' não declarado antes do uso.", nome_no)
+            self._registrar_erro("nao-declarado", nome_no, identificador)
             return False
         return True
 
@@ -506,3 +504,357 @@ class AnalisadorSemantico:
 
     def _abre_escopo(self, no: No) -> bool:
         return no.tipo in {"PROGRAMA", "FUNCAO"}
+
+    # --- AST compacta ---
+    # _ast_visitar_* fazem o que o percurso em pós-ordem faz na subárvore concreta
+    # equivalente (inclusive reavaliar cada sufixo das cadeias EXP_MAT, EXP_LOGICA
+    # e LISTA_NOME); _ast_avaliar_* correspondem aos _avaliar_* da árvore concreta.
+    # Programa, função, comandos e tipos são tarefas de executar: `tipo = yield
+    # self._ast_x(...)` chama outra sem crescer a pilha do Python.
+
+    def _ast_programa(self, programa: Ast.Programa):
+        self.tabela.entrar_escopo(programa.nome)
+        self._definindo_parametros = False
+        for constante in programa.constantes:
+            self._ast_constante(constante)
+        for decl in programa.tipos:
+            yield self._ast_decl_tipo(decl)
+        for decl in programa.variaveis:
+            yield self._ast_decl_var(decl)
+        for funcao in programa.funcoes:
+            yield self._ast_funcao(funcao)
+        yield self._ast_comandos(programa.comandos)
+        self.tabela.sair_escopo()
+
+    def _ast_constante(self, constante: Ast.Constante):
+        if not isinstance(constante.valor, Ast.Texto):
+            self._ast_visitar_exp_mat(constante.valor)
+        if self.tabela.existe_no_escopo(constante.nome):
+            self._registrar_erro("redeclaracao", constante, constante.nome, self.tabela.escopo_atual)
+            return
+        # CONST_VALOR nunca recebe tipo_inferido: toda constante fica "integer"
+        self.tabela.adicionar(
+            EntradaTabelaSimbolos(
+                nome=constante.nome,
+                classificacao="constante",
+                tipo=Tipos.INTEGER,
+                escopo=self.tabela.escopo_atual,
+            )
+        )
+
+    def _ast_decl_tipo(self, decl: Ast.DeclTipo):
+        tipo = yield self._ast_tipo(decl.tipo)
+        if self.tabela.existe_no_escopo(decl.nome):
+            self._registrar_erro("redeclaracao", decl, decl.nome, self.tabela.escopo_atual)
+            return
+        self.tabela.adicionar(
+            EntradaTabelaSimbolos(
+                nome=decl.nome,
+                classificacao="tipo",
+                tipo=tipo,
+                escopo=self.tabela.escopo_atual,
+            )
+        )
+
+    def _ast_decl_var(self, decl: Ast.DeclVar):
+        tipo = yield self._ast_tipo(decl.tipo)
+        for identificador in decl.nomes:
+            if self.tabela.existe_no_escopo(identificador):
+                self._registrar_erro("redeclaracao", decl, identificador, self.tabela.escopo_atual)
+                continue
+            classificacao = "parametro" if self._definindo_parametros else "variavel"
+            self.tabela.adicionar(
+                EntradaTabelaSimbolos(
+                    nome=identificador,
+                    classificacao=classificacao,
+                    tipo=tipo,
+                    escopo=self.tabela.escopo_atual,
+                )
+            )
+            if self._funcao_atual and classificacao == "parametro":
+                funcao = self.tabela.buscar(self._funcao_atual, escopo=self._escopo_pai())
+                if funcao:
+                    funcao.metadados.setdefault("parametros", []).append({"nome": identificador, "tipo": tipo})
+        return tipo
+
+    def _ast_tipo(self, tipo):
+        """Visita o tipo (registrando campos de record como variáveis) e devolve o tipo inferido."""
+        if isinstance(tipo, Ast.TipoPrimitivo):
+            return Tipos.primitivo(tipo.nome)
+        if isinstance(tipo, Ast.TipoArray):
+            base_tipo = yield self._ast_tipo(tipo.base)
+            if not base_tipo and isinstance(tipo.base, Ast.TipoNomeado):
+                base_tipo = self._ast_tipo_nomeado(tipo.base)
+            return Tipos.array(base_tipo, tipo.tamanho)
+        if isinstance(tipo, Ast.TipoRecord):
+            tipos_campos = []
+            for campo in tipo.campos:
+                tipos_campos.append((yield self._ast_decl_var(campo)))
+            # só o primeiro grupo de campos entra no tipo, como em _tipo_do_dado
+            campos = {}
+            if tipo.campos:
+                for nome_campo in tipo.campos[0].nomes:
+                    campos[nome_campo] = tipos_campos[0]
+            return Tipos.record(campos)
+        return self._ast_tipo_nomeado(tipo)
+
+    def _ast_tipo_nomeado(self, tipo: Ast.TipoNomeado):
+        entrada = self.tabela.buscar(tipo.nome)
+        if not entrada:
+            self._registrar_erro("nao-declarado", tipo, tipo.nome)
+            return None
+        return entrada.tipo
+
+    def _ast_funcao(self, funcao: Ast.Funcao):
+        self._escopo_pendente = funcao.nome
+        if self.tabela.existe_no_escopo(funcao.nome):
+            self._registrar_erro("redeclaracao", funcao, funcao.nome, self.tabela.escopo_atual)
+        else:
+            self.tabela.adicionar(
+                EntradaTabelaSimbolos(nome=funcao.nome, classificacao="funcao", metadados={"parametros": []}),
+                escopo=self.tabela.escopo_atual,
+            )
+
+        funcao_anterior = self._funcao_atual
+        definindo_parametros_anterior = self._definindo_parametros
+        self.tabela.entrar_escopo(funcao.nome)
+        self._funcao_atual = funcao.nome
+        self._definindo_parametros = True
+        self._escopo_pendente = None
+
+        for decl in funcao.parametros:
+            yield self._ast_decl_var(decl)
+        tipo_retorno = yield self._ast_tipo(funcao.retorno)
+        entrada = self.tabela.buscar(funcao.nome, escopo=self._escopo_pai())
+        if entrada:
+            entrada.tipo = tipo_retorno
+            entrada.metadados.setdefault("parametros", [])
+            if not self.tabela.existe_no_escopo("result"):
+                self.tabela.adicionar(
+                    EntradaTabelaSimbolos(
+                        nome="result",
+                        classificacao="variavel",
+                        tipo=tipo_retorno,
+                        escopo=self.tabela.escopo_atual,
+                    )
+                )
+        self._definindo_parametros = False
+
+        for decl in funcao.variaveis:
+            yield self._ast_decl_var(decl)
+        yield self._ast_comandos(funcao.corpo)
+
+        self.tabela.sair_escopo()
+        self._funcao_atual = funcao_anterior
+        self._definindo_parametros = definindo_parametros_anterior
+
+    def _ast_comandos(self, comandos):
+        # só os blocos de while/if viram subtarefas; os demais comandos não aninham
+        for comando in comandos:
+            if isinstance(comando, Ast.Enquanto):
+                self._ast_visitar_exp_logica(comando.condicao)
+                yield self._ast_comandos(comando.corpo)
+                self._ast_avaliar_exp_logica(comando.condicao)
+            elif isinstance(comando, Ast.Se):
+                self._ast_visitar_exp_logica(comando.condicao)
+                yield self._ast_comandos(comando.entao)
+                yield self._ast_comandos(comando.senao)
+                self._ast_avaliar_exp_logica(comando.condicao)
+            else:
+                self._ast_comando(comando)
+
+    def _ast_comando(self, comando):
+        if isinstance(comando, Ast.Atribuicao):
+            self._ast_visitar_nome(comando.alvo)
+            self._ast_visitar_valor(comando.valor)
+            self._ast_atribuicao(comando)
+        elif isinstance(comando, Ast.Escrita):
+            if not isinstance(comando.valor, Ast.Texto):
+                self._ast_visitar_exp_mat(comando.valor)
+        elif isinstance(comando, Ast.Leitura):
+            self._ast_visitar_nome(comando.alvo)
+
+    def _ast_atribuicao(self, comando: Ast.Atribuicao):
+        alvo_tipo = self._ast_avaliar_nome(comando.alvo)
+        valor_tipo = self._ast_avaliar_valor(comando.valor)
+        identificador = Ast.caminho(comando.alvo)[0][0]
+        if not self.tabela.buscar(identificador):
+            self._registrar_erro("nao-declarado", comando, identificador)
+            return
+        if valor_tipo and alvo_tipo and valor_tipo is not alvo_tipo:
+            self._registrar_erro("tipos-atribuicao", comando, alvo_tipo, valor_tipo)
+        if self._funcao_atual and identificador in (self._funcao_atual, "result"):
+            funcao = self.tabela.buscar(self._funcao_atual, escopo=self._escopo_pai())
+            if funcao and funcao.tipo and funcao.tipo is not valor_tipo:
+                self._registrar_erro("tipo-retorno", comando, valor_tipo, funcao.tipo)
+
+    # Um índice é outro NOME (a[b[c]]), e na árvore concreta ele é visitado por
+    # inteiro antes dos sufixos do NOME de fora, e avaliado por último, com o
+    # tipo descartado. A cadeia é linear, então os dois percursos são laços.
+    def _ast_visitar_nome(self, nome, inicio: int = 0):
+        # NOME a partir do inicio-ésimo identificador do caminho: o sufixo é
+        # visitado antes do próprio NOME ser avaliado
+        niveis = []
+        while True:
+            nomes, indice = Ast.caminho(nome)
+            niveis.append((nome, nomes, indice, inicio))
+            if indice is None or isinstance(indice, Ast.Numero):
+                break
+            nome, inicio = indice, 0
+        for nome, nomes, indice, inicio in reversed(niveis):
+            for posicao in range(len(nomes) - 1, inicio - 1, -1):
+                self._ast_avaliar_caminho(nome, nomes, indice, posicao)
+
+    def _ast_visitar_sufixo(self, nome, nomes, indice, inicio: int):
+        if indice is not None and not isinstance(indice, Ast.Numero):
+            self._ast_visitar_nome(indice)
+        for posicao in range(len(nomes) - 1, inicio, -1):
+            self._ast_avaliar_caminho(nome, nomes, indice, posicao)
+
+    def _ast_avaliar_nome(self, nome):
+        nomes, indice = Ast.caminho(nome)
+        return self._ast_avaliar_caminho(nome, nomes, indice, 0)
+
+    def _ast_avaliar_caminho(self, nome, nomes, indice, inicio: int):
+        tipo, pendente = self._ast_passo_caminho(nome, nomes, indice, inicio)
+        while pendente is not None and not isinstance(pendente, Ast.Numero):
+            nome = pendente
+            nomes, indice = Ast.caminho(nome)
+            _, pendente = self._ast_passo_caminho(nome, nomes, indice, 0)
+        return tipo
+
+    def _ast_passo_caminho(self, nome, nomes, indice, inicio: int):
+        # tipo do caminho (nomes, indice) = Ast.caminho(nome) a partir de
+        # nomes[inicio] e o índice que ainda falta avaliar (None quando não
+        # há); os erros ficam na linha de nomes[inicio]
+        identificador = nomes[inicio]
+        entrada = self.tabela.buscar(identificador)
+        if not entrada:
+            self._registrar_erro_na_linha("nao-declarado", Ast.linha_no_caminho(nome, inicio), identificador)
+            return None, None
+        tipo_atual = entrada.tipo
+        if inicio + 1 < len(nomes):
+            if not self._eh_record(tipo_atual):
+                self._registrar_erro_na_linha("membro-em-nao-record", Ast.linha_no_caminho(nome, inicio))
+                return tipo_atual, None
+            membro_nome = nomes[inicio + 1]
+            campos = tipo_atual.campos
+            if membro_nome not in campos:
+                self._registrar_erro_na_linha("membro-nao-declarado", Ast.linha_no_caminho(nome, inicio), membro_nome)
+                return None, None
+            return campos[membro_nome], None
+        if indice is not None:
+            if not self._eh_array(tipo_atual):
+                self._registrar_erro_na_linha("indice-em-nao-vetor", Ast.linha_no_caminho(nome, inicio))
+                return tipo_atual, None
+            return tipo_atual.base, indice
+        return tipo_atual, None
+
+    def _ast_visitar_parametro(self, parametro):
+        if not isinstance(parametro, Ast.Numero):
+            self._ast_visitar_nome(parametro)
+
+    def _ast_avaliar_parametro(self, parametro):
+        if isinstance(parametro, Ast.Numero):
+            return Tipos.INTEGER
+        return self._ast_avaliar_nome(parametro)
+
+    # As cadeias a op (b op (c ...)) são percorridas em laço: os operandos da
+    # esquerda para a direita e as avaliações dos sufixos (ou as comparações)
+    # da direita para a esquerda, na ordem em que a recursão as faria.
+
+    def _ast_visitar_exp_mat(self, expressao):
+        sufixos = []
+        while Ast.eh_op_mat(expressao):
+            self._ast_visitar_parametro(expressao.esquerda)
+            sufixos.append(expressao)
+            expressao = expressao.direita
+        self._ast_visitar_parametro(expressao)
+        sufixos.append(expressao)
+        for sufixo in reversed(sufixos):
+            self._ast_avaliar_exp_mat(sufixo)
+
+    def _ast_avaliar_exp_mat(self, expressao):
+        tipos = []
+        while Ast.eh_op_mat(expressao):
+            tipos.append((self._ast_avaliar_parametro(expressao.esquerda), expressao))
+            expressao = expressao.direita
+        tipo_direita = self._ast_avaliar_parametro(expressao)
+        return self._ast_comparar_cadeia(tipos, tipo_direita, "tipos-operacao-matematica")
+
+    def _ast_visitar_exp_logica(self, expressao):
+        sufixos = []
+        while Ast.eh_op_logica(expressao):
+            self._ast_visitar_exp_mat(expressao.esquerda)
+            sufixos.append(expressao)
+            expressao = expressao.direita
+        self._ast_visitar_exp_mat(expressao)
+        sufixos.append(expressao)
+        for sufixo in reversed(sufixos):
+            self._ast_avaliar_exp_logica(sufixo)
+
+    def _ast_avaliar_exp_logica(self, expressao):
+        tipos = []
+        while Ast.eh_op_logica(expressao):
+            tipos.append((self._ast_avaliar_exp_mat(expressao.esquerda), expressao))
+            expressao = expressao.direita
+        tipo_direita = self._ast_avaliar_exp_mat(expressao)
+        return self._ast_comparar_cadeia(tipos, tipo_direita, "tipos-expressao-logica")
+
+    def _ast_comparar_cadeia(self, tipos, tipo_direita, codigo: str):
+        # tipos: (tipo do operando da esquerda, OpBinaria), da esquerda para a direita
+        for tipo, operacao in reversed(tipos):
+            if tipo and tipo_direita and tipo is not tipo_direita:
+                self._registrar_erro(codigo, operacao)
+            tipo_direita = tipo
+        return tipo_direita
+
+    def _ast_visitar_valor(self, valor):
+        # VALOR não tem nó NOME para o identificador inicial: só o sufixo dele
+        # (NOME') e o resto da expressão (EXP_MAT') são visitados
+        if isinstance(valor, Ast.Chamada):
+            argumentos = valor.argumentos
+            for argumento in argumentos:
+                self._ast_visitar_parametro(argumento)
+            # cada LISTA_NOME da cadeia coleta os argumentos dela até o fim
+            for inicio in range(len(argumentos) - 1, -1, -1):
+                for argumento in argumentos[inicio:]:
+                    self._ast_avaliar_parametro(argumento)
+        else:
+            cabeca = valor.esquerda if Ast.eh_op_mat(valor) else valor
+            if not isinstance(cabeca, Ast.Numero):
+                nomes, indice = Ast.caminho(cabeca)
+                self._ast_visitar_sufixo(cabeca, nomes, indice, 0)
+            if Ast.eh_op_mat(valor):
+                self._ast_visitar_exp_mat(valor.direita)
+        self._ast_avaliar_valor(valor)
+
+    def _ast_avaliar_valor(self, valor):
+        if isinstance(valor, Ast.Chamada):
+            return self._ast_avaliar_chamada(valor)
+        cabeca = valor.esquerda if Ast.eh_op_mat(valor) else valor
+        if isinstance(cabeca, Ast.Numero):
+            return Tipos.INTEGER
+        return self._ast_avaliar_nome(cabeca)
+
+    def _ast_avaliar_chamada(self, chamada: Ast.Chamada):
+        identificador = chamada.nome
+        entrada = self.tabela.buscar(identificador)
+        if not entrada:
+            self._registrar_erro("nao-declarado", chamada, identificador)
+            return None
+        if entrada.classificacao != "funcao":
+            self._registrar_erro("nao-funcao", chamada, identificador)
+            return entrada.tipo
+
+        parametros_declarados = entrada.metadados.get("parametros", [])
+        argumentos = [self._ast_avaliar_parametro(argumento) for argumento in chamada.argumentos]
+        if len(argumentos) != len(parametros_declarados):
+            self._registrar_erro(
+                "quantidade-parametros", chamada, identificador, len(parametros_declarados), len(argumentos)
+            )
+        else:
+            for idx, (arg, decl) in enumerate(zip(argumentos, parametros_declarados)):
+                if arg is not decl.get("tipo"):
+                    self._registrar_erro("tipo-argumento", chamada, idx + 1, identificador, decl.get("tipo"), arg)
+        return entrada.tipo
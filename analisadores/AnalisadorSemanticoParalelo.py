@@ -0,0 +1,164 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from analisadores.AnalisadorSemantico import AnalisadorSemantico, ContextoSemantico
+from utils import Ast
+from utils.No import No
+
+
+# BLOCO_FUNCAO de todas as funções e entradas importadas de outras unidades,
+# recebidos uma vez por processo do pool
+_blocos = None
+_importadas = ()
+
+
+def _receberBlocos(blocos, importadas=()):
+    global _blocos, _importadas
+    _blocos = blocos
+    _importadas = importadas
+
+
+def _analisarCorpos(lote):
+    # executado nos processos do pool. O lote traz o escopo do programa como
+    # estava antes da primeira função do lote e, para cada função em ordem, a
+    # entrada dela, o escopo dela após o cabeçalho e o índice do corpo. Cada
+    # corpo é verificado vendo só as funções declaradas até ele, como na
+    # análise em série; volta com os erros e o escopo da função completo.
+    escopo_programa, anteriores, corpos = lote
+    semantico = AnalisadorSemantico(None, importadas=_importadas)
+    tabela = semantico.tabela
+    tabela.entrar_escopo(escopo_programa)
+    for entrada in anteriores:
+        tabela.adicionar(entrada)
+
+    resultados = []
+    for funcao, entrada_funcao, locais, contexto, indice in corpos:
+        bloco = _blocos[indice]
+        if not isinstance(bloco, No):
+            bloco = No.reconstruir(bloco)
+        tabela.adicionar(entrada_funcao)
+        tabela.entrar_escopo(funcao)
+        for entrada in locais:
+            tabela.adicionar(entrada)
+        semantico.erros = []
+        semantico._funcao_atual = funcao
+        semantico._definindo_parametros = False
+        semantico.percorrer(bloco, contexto)
+        resultados.append((semantico.erros, tabela.listar_escopo()))
+        tabela.sair_escopo()
+    return resultados
+
+
+class AnalisadorSemanticoParalelo(AnalisadorSemantico):
+    """Análise semântica em duas fases, com os corpos das funções num pool de processos.
+
+    A primeira fase é o percurso de sempre, mas sem descer nos BLOCO_FUNCAO:
+    registra constantes, tipos, variáveis, cabeçalhos e parâmetros e verifica o
+    bloco principal. Na segunda, cada corpo é verificado num processo contra o
+    escopo do programa congelado naquele ponto. Um corpo só altera o escopo da
+    própria função, então os erros de cada um são intercalados na posição do
+    corpo e a tabela e a lista de erros ficam idênticas às da análise em série.
+
+    Se algum cabeçalho não registrar uma função nova (nome repetido ou já
+    usado no programa), o escopo da função seria compartilhado entre corpos e
+    tudo é refeito em série; com max_erros a análise também é em série, para
+    parar no mesmo erro. Os nós dos corpos analisados no pool não recebem
+    tipo_inferido nem argumentos.
+    """
+
+    def __init__(self, arvore_sintatica, trabalhadores=None, minimo_funcoes=64, max_erros=None, importadas=()):
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1
+        self.minimo_funcoes = minimo_funcoes
+        # só na primeira fase: (erros até ali, BLOCO_FUNCAO, contexto, função, escopo da função)
+        self._corpos = None
+        self._isolados = True
+        super().__init__(arvore_sintatica, max_erros=max_erros, importadas=importadas)
+
+    def analisar(self):
+        if (
+            isinstance(self.arvore, Ast.Programa)
+            or self.max_erros is not None
+            or self.trabalhadores <= 1
+            or len(self.funcoes()) < self.minimo_funcoes
+        ):
+            return super().analisar()
+
+        self._corpos = []
+        self._isolados = True
+        self.percorrer(self.arvore, ContextoSemantico())
+        if not self._isolados:
+            self.tabela = type(self.tabela)()
+            self._importar()
+            self.erros = []
+            self._funcao_atual = None
+            self._escopo_pendente = None
+            self._definindo_parametros = False
+            self._corpos = None
+            return super().analisar()
+
+        self.corposEmParalelo()
+        return self.tabela
+
+    def funcoes(self):
+        # FUNCAO de LISTA_FUNC, seguindo PROGRAMA → CORPO → DECLARACOES → LISTA_FUNC
+        no = self.arvore
+        for tipo in ("CORPO", "DECLARACOES", "LISTA_FUNC"):
+            no = next((filho for filho in no.filhos if filho.tipo == tipo), None) if no else None
+        funcoes = []
+        while no is not None and no.filhos:
+            funcoes.append(no.filhos[0])
+            no = no.filhos[1]
+        return funcoes
+
+    def filhos(self, no):
+        if no.tipo == "BLOCO_FUNCAO" and self._corpos is not None:
+            return ()
+        return no.filhos
+
+    def entrar(self, no, contexto):
+        estado, contexto_filhos = super().entrar(no, contexto)
+        if no.tipo == "BLOCO_FUNCAO" and self._corpos is not None:
+            self._corpos.append((len(self.erros), no, contexto, self._funcao_atual, self.tabela.escopo_atual))
+        return estado, contexto_filhos
+
+    def _registrar_funcao_cabecalho(self, no):
+        erros = len(self.erros)
+        super()._registrar_funcao_cabecalho(no)
+        if self._escopo_pendente is None or len(self.erros) != erros:
+            self._isolados = False
+
+    def corposEmParalelo(self):
+        """Verifica no pool os corpos guardados na primeira fase e junta os resultados."""
+        corpos, self._corpos = self._corpos, None
+        escopo_programa = corpos[0][4].rsplit(".", 1)[0]
+        do_programa = self.tabela.listar_escopo(escopo_programa)
+        posicao = {entrada.nome: i for i, entrada in enumerate(do_programa)}
+
+        lote = -(-len(corpos) // (self.trabalhadores * 4))
+        lotes = []
+        for inicio in range(0, len(corpos), lote):
+            parte = corpos[inicio:inicio + lote]
+            # o escopo do programa até a função anterior à primeira do lote
+            anteriores = do_programa[:posicao[parte[0][3]]]
+            lotes.append((escopo_programa, anteriores, [
+                (funcao, do_programa[posicao[funcao]], self.tabela.listar_escopo(escopo), contexto, inicio + i)
+                for i, (_, _, contexto, funcao, escopo) in enumerate(parte)
+            ]))
+
+        # com fork os processos herdam a árvore sem copiar nada; nos outros
+        # métodos de início os corpos vão achatados, uma vez por processo
+        blocos = [bloco for _, bloco, _, _, _ in corpos]
+        if multiprocessing.get_start_method() != "fork":
+            blocos = [bloco.achatar() for bloco in blocos]
+        with ProcessPoolExecutor(max_workers=self.trabalhadores, initializer=_receberBlocos, initargs=(blocos, self.importadas)) as pool:
+            resultados = [resultado for parcial in pool.map(_analisarCorpos, lotes) for resultado in parcial]
+
+        erros = []
+        anterior = 0
+        for (marca, _, _, _, escopo), (erros_corpo, locais) in zip(corpos, resultados):
+            erros += self.erros[anterior:marca]
+            erros += erros_corpo
+            anterior = marca
+            self.tabela.substituir_escopo(escopo, locais)
+        self.erros = erros + self.erros[anterior:]
@@ -1,25 +1,56 @@
-from utils.Cor import Cor
-from utils.No import No
+from collections.abc import Sequence
+
+from utils.Diagnosticos import SINTATICO, Diagnostico, Diagnosticos, LimiteDeErros
+from utils.No import No, Terminal
 from utils.Token import Token
 from utils.First import First
 from utils.Follow import Follow
 
 class AnalisadorSintatico:
-    def __init__(self, listaTokens):
-        self.tokens = listaTokens  # tuplas (tipo, valor, linha)
-        self.pos = 0
+    def __init__(self, listaTokens, max_erros=None):
+        self.iniciarFluxo(listaTokens)
         self.erro = False
-        self.arvoreSintatica = self.programa()
+        # Diagnostico de cada erro; o chamador decide quando exibir (printErros)
+        self.erros = []
+        # com max_erros, a análise para no primeiro erro além do limite, sem árvore
+        self.max_erros = max_erros
+        self.abortado = False
+        try:
+            self.arvoreSintatica = self.programa()
+        except LimiteDeErros:
+            self.abortado = True
+            self.arvoreSintatica = None
+
+    def iniciarFluxo(self, listaTokens):
+        # Aceita a lista de tuplas (tipo, valor, linha), uma TabelaTokens ou qualquer
+        # iterável que as produza sob demanda (ex.: AnalisadorLexico.fluxo). Em todos
+        # os casos o parser só enxerga um token de lookahead, guardado em self._atual.
+        self.pos = 0
+        if isinstance(listaTokens, Sequence):
+            self.tokens = listaTokens
+            self._fluxo = None
+            self._atual = listaTokens[0] if listaTokens else None
+        else:
+            self.tokens = None
+            self._fluxo = iter(listaTokens)
+            self._atual = next(self._fluxo, None)
 
     def token_atual(self):
-        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+        return self._atual
+
+    def avancar(self):
+        self.pos += 1
+        if self._fluxo is None:
+            self._atual = self.tokens[self.pos] if self.pos < len(self.tokens) else None
+        else:
+            self._atual = next(self._fluxo, None)
 
     def tratarTerminal(self, recebido: Token):
         esperado = recebido.value
         token = self.token_atual()
         if token and token[0] == esperado:
-            self.pos += 1
-            return No(esperado, valor=token[1])
+            self.avancar()
+            return Terminal(esperado, token[1], token[2])
         else:
             return self.tratarErro(valido=esperado)
             
@@ -30,24 +61,36 @@ class AnalisadorSintatico:
 
         if(not token):
             if(follow):
-                print(Cor.pintar(f"Erro: Token esperado, mas o arquivo terminou inesperadamente", Cor.VERMELHO))
+                self.registrarErro("fim-inesperado")
             else:
-                print(Cor.pintar(f"Erro: esperado {valido}, mas o arquivo terminou inesperadamente", Cor.VERMELHO))
+                self.registrarErro("fim-antes-de-esperado", valido)
             return No("ERRO", valor="EOF")
 
-        self.pos += 1
+        self.avancar()
         if(follow):
-            print(Cor.pintar(f"Erro no {token[1]}, na linha {token[2]}", Cor.VERMELHO))
-            while (self.token_atual() and self.token_atual()[0] not in follow):
-                self.pos += 1
+            self.registrarErro("token-invalido", token[1], linha=token[2])
+            self.sincronizar(follow)
         else:
-            print(Cor.pintar(f"Esperado {valido}, mas encontrado {token} na linha {token[2]}", Cor.VERMELHO))
-            while (self.token_atual() and self.token_atual()[0] != valido):
-                self.pos += 1
+            self.registrarErro("token-inesperado", valido, token, linha=token[2])
+            self.sincronizar((valido,))
         
-        self.pos += 1
+        self.avancar()
         return No("ERRO", valor=str(token))
 
+    def sincronizar(self, tipos):
+        # Modo pânico: descarta tokens até o próximo de um dos `tipos`.
+        while (self.token_atual() and self.token_atual()[0] not in tipos):
+            self.avancar()
+
+    def registrarErro(self, codigo, *argumentos, linha=None):
+        if self.max_erros is not None and len(self.erros) >= self.max_erros:
+            # um erro além do limite: descartado, e a análise para aqui
+            raise LimiteDeErros()
+        self.erros.append(Diagnostico(SINTATICO, codigo, argumentos, linha))
+
+    def printErros(self):
+        Diagnosticos().relatar(SINTATICO, self.erros, interrompida=self.abortado)
+
     # --- NÃO TERMINAIS ---
 
     def programa(self):
@@ -0,0 +1,135 @@
+from analisadores.AnalisadorSintatico import AnalisadorSintatico
+from utils.No import Terminal
+
+
+class Faixa:
+    """Faixa de tokens de um FUNCAO ou COMANDO já analisado.
+
+    As posições são relativas: `comprimento` é a quantidade de tokens do nó e
+    `filhos` guarda as faixas aninhadas pelo deslocamento em relação ao início
+    dele. Assim uma subárvore reaproveitada noutra posição leva as faixas
+    internas junto, sem renumerar nada.
+    """
+
+    __slots__ = ("no", "comprimento", "limpa", "filhos")
+
+    def __init__(self, no, comprimento, limpa, filhos):
+        self.no = no
+        self.comprimento = comprimento
+        # sem erros de sintaxe: só essas são reaproveitadas (nós ERRO carregam a linha)
+        self.limpa = limpa
+        self.filhos = filhos
+
+
+class AnalisadorSintaticoIncremental(AnalisadorSintatico):
+    """Parser que, após uma edição, reaproveita as subárvores FUNCAO e COMANDO intactas.
+
+    Cada FUNCAO e COMANDO analisado fica registrado com a sua Faixa de tokens.
+    reAnalisar recebe a lista de tokens editada e a diferença devolvida por
+    AnalisadorLexico.reLexar; a descida recomeça do início, mas toda FUNCAO ou
+    COMANDO sem erros cujos tokens (e o token de lookahead logo depois) ficaram
+    fora do trecho alterado é devolvido pronto, com um salto da posição atual.
+    Só os nós que contêm a edição são percorridos de novo. Quando a edição
+    muda a quantidade de linhas antes de um nó reaproveitado, as linhas dos
+    Terminal dele são deslocadas.
+    """
+
+    def __init__(self, listaTokens):
+        # faixas de nível mais externo, pela posição absoluta
+        self.faixas = {}
+        self.reutilizados = 0
+        self._edicao = None
+        # (início do nó, faixas filhas) dos nós em análise, na árvore nova e na antiga
+        self._novas = [(0, self.faixas)]
+        self._antigas = [(0, {})]
+        super().__init__(listaTokens)
+
+    def reAnalisar(self, listaTokens, inicio, fim_antigo, fim_novo):
+        """Reanalisa após a troca dos tokens antigos [inicio:fim_antigo] pelos novos [inicio:fim_novo]."""
+        self._edicao = (inicio, fim_antigo, fim_novo)
+        self._antigas = [(0, self.faixas)]
+        self.faixas = {}
+        self._novas = [(0, self.faixas)]
+        self.reutilizados = 0
+        self.iniciarFluxo(listaTokens)
+        self.erro = False
+        self.erros = []
+        self.arvoreSintatica = self.programa()
+        return self.arvoreSintatica
+
+    def funcao(self):
+        return self.analisarReutilizando(super().funcao)
+
+    def comando(self):
+        return self.analisarReutilizando(super().comando)
+
+    def analisarReutilizando(self, analisar):
+        inicio = self.pos
+        antiga, posicao_antiga = self.faixaAntiga(inicio)
+        if antiga is not None and antiga.limpa and self.intacta(posicao_antiga, antiga):
+            self.pos = inicio + antiga.comprimento
+            self._atual = self.tokens[self.pos] if self.pos < len(self.tokens) else None
+            self.reutilizados += 1
+            self.registrar(inicio, antiga)
+            self.deslocarLinhas(antiga.no, self.tokens[inicio][2])
+            return antiga.no
+
+        # os filhos são procurados entre as faixas filhas do nó antigo na mesma posição
+        filhos = {}
+        self._novas.append((inicio, filhos))
+        self._antigas.append((posicao_antiga, antiga.filhos if antiga is not None else {}))
+        erros = len(self.erros)
+        try:
+            no = analisar()
+        finally:
+            self._novas.pop()
+            self._antigas.pop()
+        self.registrar(inicio, Faixa(no, self.pos - inicio, len(self.erros) == erros, filhos))
+        return no
+
+    @staticmethod
+    def deslocarLinhas(no, linha):
+        # linhas inseridas ou removidas antes do nó reaproveitado mudam a linha
+        # de todos os tokens dele pela mesma diferença; sem diferença, nada a fazer
+        pilha = [no]
+        while pilha:
+            atual = pilha.pop()
+            if isinstance(atual, Terminal):
+                diferenca = linha - atual.linha
+                break
+            pilha.extend(reversed(atual.filhos))
+        else:
+            return
+        if not diferenca:
+            return
+        pilha = [no]
+        while pilha:
+            atual = pilha.pop()
+            if isinstance(atual, Terminal):
+                atual.linha += diferenca
+            pilha.extend(atual.filhos)
+
+    def registrar(self, inicio, faixa):
+        base, faixas = self._novas[-1]
+        faixas[inicio - base] = faixa
+
+    def faixaAntiga(self, pos):
+        # posição equivalente antes da edição; dentro do trecho editado não há
+        if self._edicao is None or self._fluxo is not None:
+            return None, None
+        inicio, fim_antigo, fim_novo = self._edicao
+        if pos < inicio:
+            antiga = pos
+        elif pos >= fim_novo:
+            antiga = pos - fim_novo + fim_antigo
+        else:
+            return None, None
+        base, faixas = self._antigas[-1]
+        if base is None:
+            return None, antiga
+        return faixas.get(antiga - base), antiga
+
+    def intacta(self, posicao_antiga, faixa):
+        # o token logo depois do nó foi lido como lookahead e também precisa estar intacto
+        inicio = self._edicao[0]
+        return posicao_antiga >= inicio or posicao_antiga + faixa.comprimento < inicio
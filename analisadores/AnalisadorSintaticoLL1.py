@@ -0,0 +1,49 @@
+from analisadores.AnalisadorSintatico import AnalisadorSintatico
+from utils.Gramatica import Gramatica
+from utils.No import No, Terminal
+
+
+class AnalisadorSintaticoLL1(AnalisadorSintatico):
+    """Parser LL(1) dirigido por tabela, com pilha explícita.
+
+    Gera as mesmas árvores (inclusive os nós ERRO e as mensagens de erro) que o
+    AnalisadorSintatico recursivo, mas sem uma chamada Python por não terminal:
+    o não terminal do topo da pilha e o tipo do token atual escolhem a produção
+    na tabela de Gramatica. Listas longas (comandos, variáveis, funções) não
+    esbarram no limite de recursão.
+    """
+
+    def programa(self):
+        return self.analisar("PROGRAMA")
+
+    def analisar(self, inicial):
+        tabela = Gramatica.tabela()
+        raiz = []
+        # (terminal?, símbolo, lista de filhos do nó pai)
+        pilha = [(False, inicial, raiz)]
+        while pilha:
+            terminal, simbolo, filhos = pilha.pop()
+            token = self._atual
+
+            if terminal:
+                if token and token[0] == simbolo:
+                    self.avancar()
+                    filhos.append(Terminal(simbolo, token[1], token[2]))
+                else:
+                    filhos.append(self.tratarErro(valido=simbolo))
+                continue
+
+            tipo, alternativas, padrao, follow = tabela[simbolo]
+            producao = alternativas.get(token[0], padrao) if token else padrao
+            if producao is None:
+                filhos.append(self.tratarErro(follow=follow))
+                continue
+
+            # o nó entra no pai antes dos filhos serem analisados; como os irmãos
+            # à direita estão abaixo na pilha, a ordem dos filhos é preservada
+            no = No(tipo)
+            filhos.append(no)
+            destino = no.filhos
+            for terminal, simbolo in producao:
+                pilha.append((terminal, simbolo, destino))
+        return raiz[0]
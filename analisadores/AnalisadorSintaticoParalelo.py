@@ -0,0 +1,98 @@
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+from analisadores.AnalisadorSintatico import AnalisadorSintatico
+from utils.First import First
+from utils.No import No
+from utils.Token import Token
+
+
+class _AnalisadorFuncao(AnalisadorSintatico):
+    # parser de um trecho que começa em (function): a raiz é o FUNCAO
+    def programa(self):
+        return self.funcao()
+
+
+def _analisarFuncoes(trechos):
+    # executado nos processos do pool. Cada trecho traz os tokens de uma função
+    # mais o (function) seguinte como lookahead; a árvore só é aproveitada se a
+    # função foi analisada sem erros e terminou exatamente antes desse token.
+    # Volta achatada: os nós com __slots__ são caros de serializar um a um.
+    resultados = []
+    for tokens in trechos:
+        sintatico = _AnalisadorFuncao(tokens)
+        if sintatico.erro or sintatico.pos != len(tokens) - 1:
+            resultados.append(None)
+        else:
+            resultados.append(sintatico.arvoreSintatica.achatar())
+    return resultados
+
+
+class AnalisadorSintaticoParalelo(AnalisadorSintatico):
+    """Analisa as funções de LISTA_FUNC em paralelo, num pool de processos.
+
+    Cada (function) começa um trecho que vai até o (function) seguinte; os
+    trechos são analisados nos processos e os nós FUNCAO são costurados na
+    cadeia de LISTA_FUNC. A última função, e tudo a partir do primeiro trecho
+    que não fecha sem erros, é analisado aqui em série, então árvore e
+    mensagens de erro ficam idênticas às do AnalisadorSintatico.
+    """
+
+    def __init__(self, listaTokens, trabalhadores=None, minimo_funcoes=64, max_erros=None):
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1
+        self.minimo_funcoes = minimo_funcoes
+        super().__init__(listaTokens, max_erros=max_erros)
+
+    def lista_func(self):
+        # [LISTA_FUNC] ::= [FUNCAO] [LISTA_FUNC] | ε
+        # a cadeia é montada em laço: milhares de funções não esgotam a recursão
+        raiz = No("LISTA_FUNC")
+        ultimo = raiz
+        prontas = iter(self.funcoesEmParalelo())
+        while True:
+            funcao = next(prontas, None)
+            if funcao is None:
+                token = self.token_atual()
+                if not (token and token[0] in First.FUNCAO):
+                    break
+                funcao = self.funcao()
+            proximo = No("LISTA_FUNC")
+            ultimo.filhos += [funcao, proximo]
+            ultimo = proximo
+        return raiz
+
+    def funcoesEmParalelo(self):
+        """FUNCAO das funções analisadas no pool, a partir da posição atual.
+
+        Deixa self.pos no início da primeira função que não veio do pool.
+        """
+        if self._fluxo is not None or self.trabalhadores <= 1 or not isinstance(self.tokens, Sequence):
+            return []
+        inicios = self.iniciosDeFuncao()
+        if len(inicios) < self.minimo_funcoes:
+            return []
+
+        # a última função não tem um (function) depois dela: fica para o serial
+        trechos = [self.tokens[inicio:fim + 1] for inicio, fim in zip(inicios, inicios[1:])]
+        lote = -(-len(trechos) // (self.trabalhadores * 4))
+        lotes = [trechos[i:i + lote] for i in range(0, len(trechos), lote)]
+        with ProcessPoolExecutor(max_workers=self.trabalhadores) as pool:
+            resultados = [plano for parcial in pool.map(_analisarFuncoes, lotes) for plano in parcial]
+
+        funcoes = []
+        for plano in resultados:
+            if plano is None:
+                break
+            funcoes.append(No.reconstruir(plano))
+        proxima = inicios[len(funcoes)]
+        self.pos = proxima
+        self._atual = self.tokens[proxima]
+        return funcoes
+
+    def iniciosDeFuncao(self):
+        # funções não se aninham, então cada (function) a partir daqui abre uma
+        funcao = Token.FUNCTION.value
+        if not self._atual or self._atual[0] != funcao:
+            return []
+        return [i for i in range(self.pos, len(self.tokens)) if self.tokens[i][0] == funcao]
@@ -0,0 +1,149 @@
+import re
+
+from utils.Token import Token
+
+# Classes de caractere usadas no despacho do primeiro caractere de cada token
+IGNORAR, NOVA_LINHA, LETRA, DIGITO, COMENTARIO, ASPAS, DOIS_PONTOS, SIMPLES = range(8)
+
+
+def _montarClasses():
+    classes = {}
+    for c in " \t\r":
+        classes[c] = IGNORAR
+    classes["\n"] = NOVA_LINHA
+    for c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_":
+        classes[c] = LETRA
+    for c in "0123456789":
+        classes[c] = DIGITO
+    classes["$"] = COMENTARIO
+    classes['"'] = ASPAS
+    classes[":"] = DOIS_PONTOS
+    for c in ";,.()[]<>=!+-*/":
+        classes[c] = SIMPLES
+    return classes
+
+
+class ScannerManual:
+    """Scanner de passada única, alternativa ao ply.lex.
+
+    O primeiro caractere de cada token é classificado por uma tabela
+    pré-calculada; o restante do lexema é consumido com buscas da própria str
+    (find/rfind) ou com uma regex curta ancorada, sem chamada de função Python
+    por token. Produz o mesmo fluxo de tokens e a mesma lista de erros que as
+    regras do AnalisadorLexico sob o PLY.
+    """
+
+    CLASSES = _montarClasses()
+    SIMPLES = {
+        ";": Token.PONTO_VIRGULA.value,
+        ",": Token.VIRGULA.value,
+        ".": Token.PONTO.value,
+        "(": Token.PARENTESES_ESQ.value,
+        ")": Token.PARENTESES_DIR.value,
+        "[": Token.COLCHETE_ESQ.value,
+        "]": Token.COLCHETE_DIR.value,
+        "<": Token.OP_LOGICO.value,
+        ">": Token.OP_LOGICO.value,
+        "=": Token.OP_LOGICO.value,
+        "!": Token.OP_LOGICO.value,
+        "+": Token.OP_MAT.value,
+        "-": Token.OP_MAT.value,
+        "*": Token.OP_MAT.value,
+        "/": Token.OP_MAT.value,
+    }
+
+    # \d segue a semântica de str do re (dígitos Unicode), como nas regras do PLY
+    _RESTO_ID = re.compile(r"[a-zA-Z0-9_]*")
+    _NUMERO = re.compile(r"\d+(\.\d+)?")
+    _NOVAS_LINHAS = re.compile(r"\n+")
+    # Sequência de caracteres que não iniciam token nem são ignorados; '$' e '"'
+    # encerram a sequência porque podem abrir um comentário ou uma string
+    ILEGAIS = re.compile(r'(?:(?!\d)[^a-zA-Z0-9_ \t\r\n$":;,.()\[\]<>=!+\-*/])+')
+
+    def __init__(self, identificadores, erros, max_erros=None):
+        self.identificadores = identificadores
+        self.erros = erros
+        self.max_erros = max_erros
+        # um erro além de max_erros foi descartado, com o resto da entrada
+        self.abortado = False
+
+    def iterarTokens(self, codigo):
+        classificar = self.identificadores.classificar
+        for tipo, inicio, fim, linha in self.iterarSpans(codigo):
+            if tipo == "ID":
+                yield (tipo, classificar(codigo[inicio:fim])[1], linha)
+            else:
+                yield (tipo, codigo[inicio:fim], linha)
+
+    def iterarSpans(self, codigo, pos=0, linha=1):
+        """Gera (tipo, início, fim, linha) para cada token de `codigo` a partir de pos."""
+        classes = self.CLASSES
+        simples = self.SIMPLES
+        classificar = self.identificadores.classificar
+        resto_id = self._RESTO_ID.match
+        numero = self._NUMERO.match
+        novas_linhas = self._NOVAS_LINHAS.match
+        erro = self.registrarErro
+        tamanho = len(codigo)
+
+        while pos < tamanho:
+            c = codigo[pos]
+            classe = classes.get(c)
+            if classe is None and c.isdecimal():
+                classe = DIGITO
+
+            if classe == IGNORAR:
+                pos += 1
+            elif classe == LETRA:
+                fim = resto_id(codigo, pos + 1).end()
+                yield (classificar(codigo[pos:fim])[0], pos, fim, linha)
+                pos = fim
+            elif classe == SIMPLES:
+                yield (simples[c], pos, pos + 1, linha)
+                pos += 1
+            elif classe == NOVA_LINHA:
+                fim = novas_linhas(codigo, pos).end()
+                linha += fim - pos
+                pos = fim
+            elif classe == DIGITO:
+                fim = numero(codigo, pos).end()
+                yield ("NUMERO", pos, fim, linha)
+                pos = fim
+            elif classe == DOIS_PONTOS:
+                if codigo.startswith("=", pos + 1):
+                    yield ("ATRIBUICAO", pos, pos + 2, linha)
+                    pos += 2
+                else:
+                    yield ("DOIS_PONTOS", pos, pos + 1, linha)
+                    pos += 1
+            elif classe == COMENTARIO:
+                fim = codigo.find("$", pos + 1)
+                if fim < 0:
+                    pos = erro(codigo, pos, linha)
+                else:
+                    linha += codigo.count("\n", pos, fim)
+                    pos = fim + 1
+            elif classe == ASPAS:
+                # \".*\" é guloso até a última aspa da mesma linha
+                fim_linha = codigo.find("\n", pos + 1)
+                if fim_linha < 0:
+                    fim_linha = tamanho
+                fim = codigo.rfind('"', pos + 1, fim_linha)
+                if fim < 0:
+                    pos = erro(codigo, pos, linha)
+                else:
+                    yield ("STRING", pos, fim + 1, linha)
+                    pos = fim + 1
+            else:
+                pos = erro(codigo, pos, linha)
+
+    def registrarErro(self, codigo, pos, linha):
+        """Registra a sequência de caracteres ilegais em pos e devolve onde retomar."""
+        if self.max_erros is not None and len(self.erros) >= self.max_erros:
+            # um erro além do limite: é descartado, junto com o resto da entrada
+            self.abortado = True
+            return len(codigo)
+        m = self.ILEGAIS.match(codigo, pos)
+        fim = m.end() if m else pos + 1
+        self.erros.append((codigo[pos:fim], linha, pos, fim - pos))
+        return fim
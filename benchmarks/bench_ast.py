@@ -0,0 +1,62 @@
+"""Árvore concreta x AST compacta: quantidade de nós e tempo das fases seguintes.
+
+Uso: python3 benchmarks/bench_ast.py [funcoes] [comandos] [repeticoes]
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSemantico import AnalisadorSemantico
+from analisadores.AnalisadorSintatico import AnalisadorSintatico
+from benchmarks.programas import gerar_programa
+from geradores.GeradorCI import GeradorCodigoIntermediario
+from utils import Ast
+
+
+def contar_nos(raiz):
+    total = 0
+    pilha = [raiz]
+    while pilha:
+        no = pilha.pop()
+        total += 1
+        pilha.extend(no.filhos)
+    return total
+
+
+def medir(funcao, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    repeticoes = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    tokens = AnalisadorLexico(gerar_programa(funcoes, comandos), otimizado=True).tokens
+    arvore = AnalisadorSintatico(tokens).arvoreSintatica
+    ast = Ast.reduzir(arvore)
+
+    nos_arvore = contar_nos(arvore)
+    nos_ast = sum(1 for _ in Ast.iterar(ast))
+    print(f"nós: árvore concreta {nos_arvore:,}, AST {nos_ast:,} ({nos_arvore / nos_ast:.1f}x menos)")
+    print(f"redução:             {medir(lambda: Ast.reduzir(arvore), repeticoes):6.3f} s")
+
+    for nome, fase in (
+        ("semântico", lambda raiz: AnalisadorSemantico(raiz).analisar()),
+        ("código intermediário", GeradorCodigoIntermediario),
+    ):
+        concreta = medir(lambda: fase(arvore), repeticoes)
+        compacta = medir(lambda: fase(ast), repeticoes)
+        print(f"{nome:21s}: árvore {concreta:6.3f} s, AST {compacta:6.3f} s ({concreta / compacta:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compilador inteiro sobre programas com milhares de erros, com e sem limite.
+
+Gera dois programas a partir do sintético: um com comandos quebrados (erros
+sintáticos em cascata) e um com identificadores não declarados em todo
+comando (erros semânticos). Mede compilador.py com a saída descartada, sem
+limite, com --max-erros, com --fail-fast e com --diagnosticos=json.
+
+Uso: python3 benchmarks/bench_diagnosticos.py [funcoes] [comandos] [max_erros]
+"""
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.programas import gerar_programa
+
+
+def medir(arquivo, *opcoes):
+    inicio = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(ROOT / "compilador.py"), arquivo, "--sem-cache", *opcoes],
+        stdout=subprocess.DEVNULL,
+        cwd=ROOT,
+    )
+    return time.perf_counter() - inicio
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    max_erros = sys.argv[3] if len(sys.argv) > 3 else "20"
+    codigo = gerar_programa(funcoes, comandos)
+    casos = {
+        "sintaticos": codigo.replace("result := result +", "result := result + +"),
+        "semanticos": codigo.replace("result := result +", "result := indefinido +"),
+    }
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for nome, fonte in casos.items():
+            arquivo = str(Path(diretorio) / f"{nome}.txt")
+            Path(arquivo).write_text(fonte)
+            print(f"erros {nome} ({funcoes} funções x {comandos} comandos):")
+            for rotulo, opcoes in (
+                ("sem limite", ()),
+                (f"--max-erros={max_erros}", (f"--max-erros={max_erros}",)),
+                ("--fail-fast", ("--fail-fast",)),
+                ("json", ("--diagnosticos=json",)),
+            ):
+                print(f"  {rotulo:16s}: {medir(arquivo, *opcoes):6.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Resolução de nomes na TabelaSimbolos com escopos profundamente aninhados.
+
+Monta uma cadeia de `profundidade` escopos com `identificadores` nomes cada e
+busca, a partir do mais interno, nomes de todos os níveis e nomes ausentes.
+
+Uso: python3 benchmarks/bench_escopos.py [profundidade] [identificadores] [buscas]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from utils.TabelaSimbolos import EntradaTabelaSimbolos, TabelaSimbolos
+
+
+def main():
+    profundidade = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    identificadores = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    buscas = int(sys.argv[3]) if len(sys.argv) > 3 else 500_000
+
+    tabela = TabelaSimbolos()
+    nomes = []
+    for nivel in range(profundidade):
+        tabela.entrar_escopo(f"e{nivel}")
+        for i in range(identificadores):
+            nome = f"v{nivel}_{i}"
+            tabela.adicionar(EntradaTabelaSimbolos(nome=nome, classificacao="variavel", tipo="integer"))
+            nomes.append(nome)
+    # um em cada dez nomes buscados não foi declarado
+    nomes += [f"ausente{i}" for i in range(len(nomes) // 9)]
+    sorteio = random.Random(0)
+    consultas = [sorteio.choice(nomes) for _ in range(buscas)]
+    print(f"{profundidade} escopos aninhados x {identificadores} identificadores, {buscas:,} buscas")
+
+    inicio = time.perf_counter()
+    for nome in consultas:
+        tabela.buscar(nome)
+    duracao = time.perf_counter() - inicio
+    print(f"busca: {duracao:6.3f} s ({buscas / duracao:12,.0f} buscas/s)")
+
+
+if __name__ == "__main__":
+    main()
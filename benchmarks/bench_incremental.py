@@ -0,0 +1,58 @@
+"""Reanálise incremental x análise completa após editar um corpo de função.
+
+Mede também o reLexar de cada edição, que não depende do número de tokens
+depois do trecho editado.
+
+Uso: python3 benchmarks/bench_incremental.py [funcoes] [comandos] [edicoes]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSintatico import AnalisadorSintatico
+from analisadores.AnalisadorSintaticoIncremental import AnalisadorSintaticoIncremental
+from benchmarks.programas import gerar_programa
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    edicoes = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    codigo = gerar_programa(funcoes, comandos)
+    lexo = AnalisadorLexico(codigo, incremental=True)
+    incremental = AnalisadorSintaticoIncremental(lexo.tokens)
+    print(f"{codigo.count(chr(10)):,} linhas, {len(lexo.tokens):,} tokens")
+
+    gerador = random.Random(0)
+    completo = reanalise = relexar = 0.0
+    for _ in range(edicoes):
+        # troca um operando "x" por "y" num corpo de função qualquer
+        funcao = gerador.randrange(funcoes)
+        offset = lexo.codigo.index("x * ", lexo.codigo.index(f"function f{funcao}("))
+        inicio = time.perf_counter()
+        diferenca = lexo.reLexar(offset, 1, "y" if lexo.codigo[offset] == "x" else "x")
+        relexar += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        incremental.reAnalisar(lexo.tokens, *diferenca)
+        reanalise += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        AnalisadorSintatico(lexo.tokens)
+        completo += time.perf_counter() - inicio
+
+    print(f"reLexar    : {relexar / edicoes * 1000:8.2f} ms por edição")
+    print(f"completa   : {completo / edicoes * 1000:8.2f} ms por edição")
+    print(
+        f"incremental: {reanalise / edicoes * 1000:8.2f} ms por edição "
+        f"({incremental.reutilizados:,} subárvores reaproveitadas na última)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Mede o tempo de inicialização a frio do compilador.
+
+"antes": todas as fases importadas de forma ansiosa e lexer construído com
+lex.lex() sem tabelas persistidas.
+"depois": geradores carregados sob demanda e lexer lido do módulo lextab.
+
+O processo inteiro é dominado pela partida do interpretador e pelas
+importações (ply.lex, utils.Ast), que as duas variantes pagam igual, então o
+ganho total é pequeno. A última linha isola o que o lextab muda: a
+construção do lexer base, com lex.lex() a partir das regras × lido do
+lextab, com o módulo importado e as regexes compiladas de novo a cada vez.
+
+Uso: python3 benchmarks/bench_inicializacao.py [arquivo.txt] [repeticoes]
+"""
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+
+ANTES = """
+import sys
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSintatico import AnalisadorSintatico
+from analisadores.AnalisadorSemantico import AnalisadorSemantico
+from geradores.GeradorCI import GeradorCodigoIntermediario
+from geradores.Otimizador import OtimizadorCodigo
+AnalisadorLexico(open(sys.argv[1]).read())
+"""
+
+DEPOIS = """
+import sys
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSintatico import AnalisadorSintatico
+from analisadores.AnalisadorSemantico import AnalisadorSemantico
+AnalisadorLexico(open(sys.argv[1]).read(), otimizado=True)
+"""
+
+
+def medir(script, arquivo, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script, arquivo], cwd=ROOT, check=True)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def construir(otimizado, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        AnalisadorLexico._lexer_base = None
+        re.purge()
+        inicio = time.perf_counter()
+        AnalisadorLexico("", otimizado=otimizado)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def main():
+    arquivo = sys.argv[1] if len(sys.argv) > 1 else str(ROOT / "programaCerto.txt")
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    # primeira execução grava o lextab; não entra na medição
+    medir(DEPOIS, arquivo, 1)
+
+    antes = medir(ANTES, arquivo, repeticoes)
+    depois = medir(DEPOIS, arquivo, repeticoes)
+    print(f"antes : {antes * 1000:8.2f} ms (mediana de {repeticoes})")
+    print(f"depois: {depois * 1000:8.2f} ms (mediana de {repeticoes})")
+    print(f"ganho : {antes / depois:8.2f}x")
+    regras = construir(False, repeticoes)
+    tabelas = construir(True, repeticoes)
+    print(f"lexer : {regras * 1000:8.2f} ms -> {tabelas * 1000:.2f} ms ({regras / tabelas:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compilação separada: programa com as declarações no fonte × importadas de uma interface.
+
+A unidade compartilhada é o programa sintético inteiro (const, type e as
+funções). O programa principal tem só as variáveis e o bloco principal do
+sintético, que usa a constante, os tipos e as funções. Mede compilador.py
+sem cache para o sintético completo (tudo no mesmo fonte) e para o
+principal com --importar, além da leitura da interface em si.
+
+Uso: python3 benchmarks/bench_interface.py [funcoes] [comandos]
+"""
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.programas import gerar_programa
+from utils.Interface import Interface
+
+
+def medir(arquivo, *opcoes):
+    inicio = time.perf_counter()
+    resultado = subprocess.run(
+        [sys.executable, str(ROOT / "compilador.py"), arquivo, "--sem-cache", *opcoes],
+        stdout=subprocess.PIPE,
+        text=True,
+        cwd=ROOT,
+    )
+    decorrido = time.perf_counter() - inicio
+    assert "Tudo OK" in resultado.stdout, resultado.stdout
+    return decorrido
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    biblioteca = gerar_programa(funcoes, comandos)
+    linhas = biblioteca.splitlines()
+    inicio_var = linhas.index("var")
+    bloco_principal = len(linhas) - 1 - linhas[::-1].index("begin")
+    principal = "\n".join(
+        ["program principal;"]
+        + linhas[inicio_var:inicio_var + 4]
+        + linhas[bloco_principal:]
+    ) + "\n"
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        completo = Path(diretorio) / "completo.txt"
+        completo.write_text(biblioteca)
+        separado = Path(diretorio) / "principal.txt"
+        separado.write_text(principal)
+        interface = Path(diretorio) / "biblioteca.int"
+
+        gerar = medir(str(completo), f"--interface={interface}")
+        inicio = time.perf_counter()
+        entradas = len(Interface.carregar(interface).entradas)
+        carregar = time.perf_counter() - inicio
+
+        print(f"{funcoes} funções x {comandos} comandos; principal com {100 * len(principal) / len(biblioteca):.1f}% do fonte:")
+        print(f"  gerar a interface     : {gerar:6.3f} s ({interface.stat().st_size} bytes, {entradas} entradas)")
+        print(f"  carregar a interface  : {carregar * 1000:6.2f} ms")
+        print(f"  tudo no mesmo fonte   : {medir(str(completo)):6.3f} s")
+        print(f"  principal + --importar: {medir(str(separado), f'--importar={interface}'):6.3f} s")
+
+
+if __name__ == "__main__":
+    main()
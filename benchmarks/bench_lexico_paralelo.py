@@ -0,0 +1,36 @@
+"""Escalabilidade do lexer paralelo com 1, 2, 4 e 8 processos.
+
+Uso: python3 benchmarks/bench_lexico_paralelo.py [funcoes] [comandos] [backend]
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexicoParalelo import AnalisadorLexicoParalelo
+from benchmarks.programas import gerar_programa
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    backend = sys.argv[3] if len(sys.argv) > 3 else "ply"
+    codigo = gerar_programa(funcoes, comandos)
+    print(f"{len(codigo) / 2**20:.1f} MiB, backend {backend}")
+
+    base = None
+    for trabalhadores in (1, 2, 4, 8):
+        inicio = time.perf_counter()
+        lexo = AnalisadorLexicoParalelo(codigo, trabalhadores=trabalhadores, backend=backend)
+        duracao = time.perf_counter() - inicio
+        base = base or duracao
+        print(
+            f"{trabalhadores} processo(s): {duracao:7.3f} s, "
+            f"{len(lexo.tokens) / duracao:12,.0f} tokens/s, speedup {base / duracao:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Memória da árvore sintática: nós com __dict__ x nós com __slots__.
+
+Uso: python3 benchmarks/bench_memoria_arvore.py [funcoes] [comandos]
+(o padrão gera 100 funções x 1000 comandos, ~100 mil atribuições)
+"""
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSintaticoLL1 import AnalisadorSintaticoLL1
+from benchmarks.programas import gerar_programa
+from utils.No import No
+
+
+class NoDicionario:
+    """O No antigo: atributos num __dict__ por instância."""
+
+    def __init__(self, tipo, filhos=None, valor=None):
+        self.tipo = tipo
+        self.filhos = filhos or []
+        self.valor = valor
+
+
+def copiar(raiz, classe):
+    nova = classe(raiz.tipo, valor=raiz.valor)
+    pilha = [(raiz, nova)]
+    while pilha:
+        origem, destino = pilha.pop()
+        for filho in origem.filhos:
+            copia = classe(filho.tipo, valor=filho.valor)
+            destino.filhos.append(copia)
+            pilha.append((filho, copia))
+    return nova
+
+
+def medir(raiz, classe):
+    tracemalloc.start()
+    copia = copiar(raiz, classe)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return copia, memoria
+
+
+def contar_nos(raiz):
+    total = 0
+    pilha = [raiz]
+    while pilha:
+        no = pilha.pop()
+        total += 1
+        pilha.extend(no.filhos)
+    return total
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    codigo = gerar_programa(funcoes, comandos)
+    lexo = AnalisadorLexico(codigo)
+    arvore = AnalisadorSintaticoLL1(lexo.tokens).arvoreSintatica
+    nos = contar_nos(arvore)
+    print(f"{funcoes * comandos} comandos gerados, {nos} nós")
+
+    for nome, classe in (("__dict__", NoDicionario), ("__slots__", No)):
+        copia, memoria = medir(arvore, classe)
+        print(f"{nome:9s}: {memoria / 2**20:8.2f} MiB ({memoria / nos:6.1f} B/nó)")
+        del copia
+
+
+if __name__ == "__main__":
+    main()
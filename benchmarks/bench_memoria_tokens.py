@@ -0,0 +1,42 @@
+"""Compara a memória da lista de tuplas com a TabelaTokens compacta.
+
+Uso: python3 benchmarks/bench_memoria_tokens.py [funcoes] [comandos]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from benchmarks.programas import gerar_programa
+
+
+def medir(codigo, compacto):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    lexo = AnalisadorLexico(codigo, compacto=compacto)
+    duracao = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(lexo.tokens), memoria, duracao
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    codigo = gerar_programa(funcoes, comandos)
+    AnalisadorLexico("")  # constrói o lexer base fora da medição
+
+    for nome, compacto in (("tuplas", False), ("compacto", True)):
+        quantidade, memoria, duracao = medir(codigo, compacto)
+        print(
+            f"{nome:9s}: {quantidade} tokens, {memoria / 2**20:8.2f} MiB "
+            f"({memoria / quantidade:6.1f} B/token), {duracao:6.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compara leitura completa + PLY com o lexer sobre arquivo mapeado.
+
+Cada modo roda em um processo separado para que o pico de memória residente
+(ru_maxrss) seja medido isoladamente.
+
+Uso: python3 benchmarks/bench_mmap.py [funcoes] [comandos]
+"""
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.programas import gerar_programa
+
+MEDICAO = """
+import resource, sys, time
+inicio = time.perf_counter()
+if sys.argv[2] == "mmap":
+    from analisadores.AnalisadorLexicoMapeado import AnalisadorLexicoMapeado
+    lexo = AnalisadorLexicoMapeado(sys.argv[1])
+else:
+    from analisadores.AnalisadorLexico import AnalisadorLexico
+    with open(sys.argv[1]) as arquivo:
+        lexo = AnalisadorLexico(arquivo.read(), otimizado=True, compacto=True)
+duracao = time.perf_counter() - inicio
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(len(lexo.tokens), duracao, rss)
+"""
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as arquivo:
+        arquivo.write(gerar_programa(funcoes, comandos))
+    caminho = Path(arquivo.name)
+    print(f"arquivo: {caminho.stat().st_size / 2**20:.1f} MiB")
+    try:
+        for modo in ("read", "mmap"):
+            saida = subprocess.run(
+                [sys.executable, "-c", MEDICAO, str(caminho), modo],
+                cwd=ROOT, capture_output=True, text=True, check=True,
+            ).stdout.split()
+            tokens, duracao, rss = int(saida[0]), float(saida[1]), int(saida[2])
+            print(f"{modo:5s}: {tokens} tokens em {duracao:6.3f} s, pico RSS {rss / 1024:8.1f} MiB")
+    finally:
+        caminho.unlink()
+
+
+if __name__ == "__main__":
+    main()
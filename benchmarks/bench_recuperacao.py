@@ -0,0 +1,51 @@
+"""Recuperação de erros do parser: lista de tokens x fluxo sob demanda.
+
+Remove uma fração dos tokens de um tipo (por padrão ATRIBUICAO, o que quebra
+os comandos) de um programa gerado e mede o parser LL(1) com a lista de tokens
+e com um iterador; nos dois o modo pânico descarta token a token.
+
+Uso: python3 benchmarks/bench_recuperacao.py [funcoes] [comandos] [fracao] [tipo] [repeticoes]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSintaticoLL1 import AnalisadorSintaticoLL1
+from benchmarks.programas import gerar_programa
+
+
+def medir(criar, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        sintatico = criar()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, sintatico
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    fracao = float(sys.argv[3]) if len(sys.argv) > 3 else 0.3
+    tipo = sys.argv[4] if len(sys.argv) > 4 else "ATRIBUICAO"
+    repeticoes = int(sys.argv[5]) if len(sys.argv) > 5 else 3
+    tokens = AnalisadorLexico(gerar_programa(funcoes, comandos), otimizado=True).tokens
+    gerador = random.Random(0)
+    quebrado = [token for token in tokens if token[0] != tipo or gerador.random() >= fracao]
+    print(f"{len(quebrado):,} tokens ({len(tokens) - len(quebrado):,} removidos)")
+
+    for nome, criar in (
+        ("lista", lambda: AnalisadorSintaticoLL1(quebrado)),
+        ("fluxo", lambda: AnalisadorSintaticoLL1(iter(quebrado))),
+    ):
+        duracao, sintatico = medir(criar, repeticoes)
+        print(f"{nome:7s}: {duracao:6.3f} s, {len(sintatico.erros):,} erros")
+
+
+if __name__ == "__main__":
+    main()
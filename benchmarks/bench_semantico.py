@@ -0,0 +1,35 @@
+"""Tempo da análise semântica (árvore concreta) em programas sintéticos grandes.
+
+Uso: python3 benchmarks/bench_semantico.py [funcoes] [comandos] [repeticoes]
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSemantico import AnalisadorSemantico
+from analisadores.AnalisadorSintaticoLL1 import AnalisadorSintaticoLL1
+from benchmarks.programas import gerar_programa
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    repeticoes = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    tokens = AnalisadorLexico(gerar_programa(funcoes, comandos), otimizado=True).tokens
+    arvore = AnalisadorSintaticoLL1(tokens).arvoreSintatica
+    print(f"{funcoes} funções x {comandos} comandos, {len(tokens):,} tokens")
+
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        AnalisadorSemantico(arvore).analisar()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    print(f"semântico: {melhor:6.3f} s ({len(tokens) / melhor:12,.0f} tokens/s)")
+
+
+if __name__ == "__main__":
+    main()
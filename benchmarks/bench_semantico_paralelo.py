@@ -0,0 +1,40 @@
+"""Escalabilidade da análise semântica com os corpos das funções em 1, 2, 4 e 8 processos.
+
+Com 1 processo a análise é a de sempre, em série, no próprio processo.
+
+Uso: python3 benchmarks/bench_semantico_paralelo.py [funcoes] [comandos]
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSemanticoParalelo import AnalisadorSemanticoParalelo
+from analisadores.AnalisadorSintaticoLL1 import AnalisadorSintaticoLL1
+from benchmarks.programas import gerar_programa
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    tokens = AnalisadorLexico(gerar_programa(funcoes, comandos), otimizado=True).tokens
+    arvore = AnalisadorSintaticoLL1(tokens).arvoreSintatica
+    print(f"{funcoes} funções, {len(tokens):,} tokens")
+
+    base = None
+    for trabalhadores in (1, 2, 4, 8):
+        inicio = time.perf_counter()
+        AnalisadorSemanticoParalelo(arvore, trabalhadores=trabalhadores).analisar()
+        duracao = time.perf_counter() - inicio
+        base = base or duracao
+        print(
+            f"{trabalhadores} processo(s): {duracao:7.3f} s, "
+            f"{len(tokens) / duracao:12,.0f} tokens/s, speedup {base / duracao:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Parser recursivo x parser LL(1) com pilha explícita.
+
+Uso: python3 benchmarks/bench_sintatico.py [funcoes] [comandos] [repeticoes]
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSintatico import AnalisadorSintatico
+from analisadores.AnalisadorSintaticoLL1 import AnalisadorSintaticoLL1
+from benchmarks.programas import gerar_programa
+
+
+def medir(classe, tokens, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        try:
+            classe(tokens)
+        except RecursionError:
+            return None
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    repeticoes = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    tokens = AnalisadorLexico(gerar_programa(funcoes, comandos), otimizado=True).tokens
+    print(f"{len(tokens):,} tokens")
+
+    for nome, classe in (("recursivo", AnalisadorSintatico), ("ll1", AnalisadorSintaticoLL1)):
+        duracao = medir(classe, tokens, repeticoes)
+        if duracao is None:
+            print(f"{nome:10s}: RecursionError")
+        else:
+            print(f"{nome:10s}: {duracao:6.3f} s ({len(tokens) / duracao:12,.0f} tokens/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Vazão (tokens por segundo) dos backends de lexer.
+
+Uso: python3 benchmarks/bench_vazao_lexico.py [funcoes] [comandos] [repeticoes]
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from benchmarks.programas import gerar_programa
+
+
+def medir(codigo, repeticoes, **opcoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        lexo = AnalisadorLexico(codigo, **opcoes)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return len(lexo.tokens), melhor
+
+
+def main():
+    funcoes = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    repeticoes = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    codigo = gerar_programa(funcoes, comandos)
+    AnalisadorLexico("")  # constrói o lexer PLY fora da medição
+
+    for nome, opcoes in (
+        ("ply", {}),
+        ("manual", {"backend": "manual"}),
+        ("manual+compacto", {"backend": "manual", "compacto": True}),
+    ):
+        quantidade, duracao = medir(codigo, repeticoes, **opcoes)
+        print(f"{nome:16s}: {quantidade / duracao:12,.0f} tokens/s ({duracao:6.3f} s)")
+
+
+if __name__ == "__main__":
+    main()
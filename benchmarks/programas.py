@@ -0,0 +1,48 @@
+"""Gera programas sintéticos válidos para os benchmarks."""
+
+
+def gerar_programa(funcoes=10, comandos=20):
+    """Programa com `funcoes` funções e `comandos` atribuições por corpo."""
+    linhas = [
+        "program sintetico;",
+        "const LIMITE := 100;",
+        "type",
+        "    vetor := array[10] of integer;",
+        "    ponto := record x, y : integer; end;",
+        "var",
+        "    a, b, c : integer;",
+        "    v : vetor;",
+        "    p : ponto;",
+    ]
+    for f in range(funcoes):
+        linhas += [
+            f"function f{f}(x: integer; y: integer) : integer",
+            "var i : integer;",
+            "begin",
+            "    i := 0;",
+            "    result := x;",
+        ]
+        for c in range(comandos):
+            linhas.append(f"    result := result + x * {c} - y;  $ passo {c} $")
+        linhas += [
+            "    while i < y",
+            "    begin",
+            "        i := i + 1;",
+            "    end;",
+            "end",
+            "",
+        ]
+    linhas.append("begin")
+    for c in range(comandos):
+        linhas.append(f"    a := b + c * {c};")
+    for f in range(min(funcoes, 50)):
+        linhas.append(f"    c := f{f}(a, b);")
+    linhas += [
+        "    p.x := a;",
+        "    if a > b then",
+        "        write \"maior\"",
+        "    else",
+        "        read b;",
+        "end",
+    ]
+    return "\n".join(linhas) + "\n"
@@ -2,69 +2,314 @@ import sys
 from analisadores.AnalisadorLexico import AnalisadorLexico
 from analisadores.AnalisadorSintatico import AnalisadorSintatico
 from analisadores.AnalisadorSemantico import AnalisadorSemantico
-from geradores.GeradorCI import GeradorCodigoIntermediario
-from geradores.Otimizador import OtimizadorCodigo
+from utils.Diagnosticos import LEXICO, SEMANTICO, SINTATICO, Diagnosticos
+from utils.No import No
 
-def main():
-    if len(sys.argv) < 2:
-        print("Erro: Nenhum arquivo foi informado.")
-        print("Como Usar: python3 compilador.py <arquivo.txt> [showTokens | showTree | showAll]")
-        sys.exit(1)
+def separarArgumentos(argumentos):
+    # "--nome" ou "--nome=valor" viram flags; o resto mantém a ordem posicional
+    posicionais = []
+    flags = {}
+    for argumento in argumentos:
+        if argumento.startswith("--"):
+            nome, _, valor = argumento[2:].partition("=")
+            flags[nome.lower()] = valor or True
+        else:
+            posicionais.append(argumento)
+    return posicionais, flags
+
+# opções numéricas e o menor valor aceito por cada uma
+MINIMOS = {"max-erros": 1, "jobs": 1, "profundidade": 0, "max-nos": 0}
+
+def lerNumeros(flags):
+    # troca o texto das opções numéricas pelo inteiro; valor inválido é erro de uso
+    for nome, minimo in MINIMOS.items():
+        if nome not in flags:
+            continue
+        try:
+            valor = int(flags[nome]) if isinstance(flags[nome], str) else None
+        except ValueError:
+            valor = None
+        if valor is None or valor < minimo:
+            print(f"Erro: --{nome} precisa ser um número inteiro maior ou igual a {minimo} (--{nome}=N).")
+            sys.exit(1)
+        flags[nome] = valor
+
+# valores aceitos pelas opções de escolha; o primeiro é o padrão
+ESCOLHAS = {
+    "backend": ("ply", "manual"),
+    "parser": ("recursivo", "ll1", "paralelo"),
+    "semantico": ("serial", "paralelo"),
+}
 
-    arquivo = sys.argv[1]
+def lerEscolhas(flags):
+    # valor fora da lista (ou a opção sem "=valor") é erro de uso
+    for nome, valores in ESCOLHAS.items():
+        valor = flags.get(nome, valores[0])
+        if valor not in valores:
+            opcoes = ", ".join(valores[:-1]) + " ou " + valores[-1]
+            print(f"Erro: --{nome} precisa ser {opcoes} (--{nome}={'|'.join(valores)}).")
+            sys.exit(1)
+
+def mostrarArvore(arvore, flags):
+    # escrita direta no stdout, linha a linha; a linha em branco final é a do print(arvore)
+    arvore.escrever(
+        sys.stdout,
+        profundidade=flags.get("profundidade"),
+        max_nos=flags.get("max-nos"),
+        cor=not flags.get("sem-cor"),
+    )
+    print("")
+
+def lerTexto(arquivo):
+    with open(arquivo, 'r') as file:
+        return file.read()
+
+def abrirFonte(arquivo, abrir):
+    # só as falhas ao abrir e ler o arquivo viram mensagem de erro; as do
+    # léxico em si seguem com o traceback
     try:
-        with open(arquivo, 'r') as file:
-            code = file.read()
+        return abrir(arquivo)
     except FileNotFoundError:
         print(f"Erro: Arquivo '{arquivo}' não encontrado.")
         sys.exit(1)
-    except Exception as e:
+    except (OSError, UnicodeDecodeError) as e:
         print(f"Erro ao ler o arquivo: {e}")
         sys.exit(1)
 
-    Lexo = AnalisadorLexico(code)
-    Lexo.printErros()
+def analisarLexico(arquivo, flags, streaming, max_erros):
+    if flags.get("mmap"):
+        # arquivo mapeado em memória e analisado direto nos bytes
+        from analisadores.AnalisadorLexicoMapeado import AnalisadorLexicoMapeado
+        mapeamento = abrirFonte(arquivo, AnalisadorLexicoMapeado.mapear)
+        return AnalisadorLexicoMapeado(arquivo, max_erros=max_erros, mapeamento=mapeamento)
+    code = abrirFonte(arquivo, lerTexto)
+    if flags.get("jobs", 1) > 1:
+        # lexing em trechos num pool de processos
+        from analisadores.AnalisadorLexicoParalelo import AnalisadorLexicoParalelo
+        return AnalisadorLexicoParalelo(code, trabalhadores=flags["jobs"], backend=flags.get("backend") or "ply", max_erros=max_erros)
+    return AnalisadorLexico(
+        code,
+        otimizado=True,
+        streaming=streaming,
+        compacto=bool(flags.get("compacto")),
+        backend=flags.get("backend") or "ply",
+        max_erros=max_erros,
+    )
 
-    if Lexo.erros:
-        sys.exit(1)
+def analisarSintatico(tokens, flags, max_erros):
+    if flags.get("parser") == "paralelo":
+        # funções analisadas num pool de processos (--jobs define quantos)
+        from analisadores.AnalisadorSintaticoParalelo import AnalisadorSintaticoParalelo
+        return AnalisadorSintaticoParalelo(tokens, trabalhadores=flags.get("jobs"), max_erros=max_erros)
+    elif flags.get("parser") == "ll1":
+        # parser dirigido por tabela, sem recursão por não terminal
+        from analisadores.AnalisadorSintaticoLL1 import AnalisadorSintaticoLL1
+        return AnalisadorSintaticoLL1(tokens, max_erros=max_erros)
+    return AnalisadorSintatico(tokens, max_erros=max_erros)
+
+def analisarSemantico(arvore, flags, max_erros, importadas):
+    if flags.get("semantico") == "paralelo":
+        # corpos das funções verificados num pool de processos (--jobs define quantos)
+        from analisadores.AnalisadorSemanticoParalelo import AnalisadorSemanticoParalelo
+        return AnalisadorSemanticoParalelo(arvore, trabalhadores=flags.get("jobs"), max_erros=max_erros, importadas=importadas)
+    return AnalisadorSemantico(arvore, max_erros=max_erros, importadas=importadas)
 
-    Sintatico = AnalisadorSintatico(Lexo.tokens)
+def importarInterfaces(flags):
+    # --importar=a.int,b.int: símbolos exportados por unidades compiladas com --interface;
+    # devolve as entradas e o conteúdo dos arquivos (o resultado semântico depende dele)
+    if not flags.get("importar"):
+        return [], []
+    from utils.Interface import Interface, InterfaceInvalida, importar
+    interfaces = []
+    conteudos = []
+    try:
+        for caminho in flags["importar"].split(","):
+            with open(caminho, 'rb') as file:
+                conteudos.append(file.read())
+            interfaces.append(Interface.desserializar(conteudos[-1], caminho))
+        return importar(interfaces), conteudos
+    except OSError:
+        print(f"Erro: Interface '{caminho}' não encontrada.")
+        sys.exit(1)
+    except InterfaceInvalida as e:
+        print(f"Erro: {e}")
+        sys.exit(1)
 
-    if Sintatico.erro:
+def gravarInterface(caminho, tabela, arvore):
+    from utils.Interface import Interface
+    try:
+        Interface.exportar(tabela, arvore).gravar(caminho)
+    except OSError as e:
+        print(f"Erro ao gravar a interface '{caminho}': {e}")
         sys.exit(1)
 
-    Semantico = AnalisadorSemantico(Sintatico.arvoreSintatica)
-    Semantico.analisar()
+def modoDeAnalise(flags):
+    # flags que mudam os artefatos: --mmap e --backend os tokens (dígitos não
+    # ASCII, por exemplo); --ast não muda nada, a AST guarda as linhas dos erros
+    return f"mmap={bool(flags.get('mmap'))} backend={flags.get('backend') or 'ply'}"
 
-    if Semantico.erros:
-        print("Erros semânticos encontrados:")
-        for erro in Semantico.erros:
-            print(f"- {erro}")
-        sys.exit(1)
+def abrirCache(arquivo, flags, conteudos=()):
+    # cache dos artefatos por conteúdo da fonte (e das interfaces importadas)
+    # e pelo modo de análise; --sem-cache desliga, --cache=DIR muda o diretório
+    if flags.get("sem-cache"):
+        return None, None
+    from utils.Cache import Cache
+    cache = Cache(flags["cache"] if isinstance(flags.get("cache"), str) else None)
+    try:
+        # a fonte é lida em blocos: com --mmap ela nunca fica inteira na memória
+        chave = cache.chave_do_arquivo(arquivo, modoDeAnalise(flags), *conteudos)
+    except OSError:
+        # o erro de leitura é relatado pela análise léxica, como sem cache
+        return None, None
+    return cache, chave
 
-    print("Análise concluída: Tudo OK!");
+def main():
+    argumentos, flags = separarArgumentos(sys.argv[1:])
+    if len(argumentos) < 1:
+        print("Erro: Nenhum arquivo foi informado.")
+        print("Como Usar: python3 compilador.py <arquivo.txt> [showTokens | showTree | showAll] [--streaming] [--compacto] [--mmap] [--backend=ply|manual] [--jobs=N] [--max-erros=N] [--fail-fast] [--diagnosticos=texto|json] [--parser=recursivo|ll1|paralelo] [--semantico=serial|paralelo] [--interface=ARQ] [--importar=ARQ[,ARQ]] [--ast] [--profundidade=N] [--max-nos=N] [--sem-cor] [--sem-cache] [--cache=DIR]")
+        sys.exit(1)
 
-    if len(sys.argv) > 2:
-        opcao = sys.argv[2].lower()
+    arquivo = argumentos[0]
+    if len(argumentos) > 1:
+        opcao = argumentos[1].lower()
     else:
         opcao = None
 
+    # streaming sobrepõe léxico e sintático; showTokens precisa da lista completa
+    streaming = bool(flags.get("streaming")) and opcao not in ("showtokens", "showall")
+    lerNumeros(flags)
+    lerEscolhas(flags)
+    # limite de erros do compilador inteiro: cada fase recebe o que sobrou dele
+    # e é interrompida ao atingi-lo; --fail-fast para no primeiro erro
+    max_erros = 1 if flags.get("fail-fast") else flags.get("max-erros")
+    formato = flags.get("diagnosticos") or "texto"
+    if formato not in Diagnosticos.FORMATOS:
+        print(f"Erro: formato de diagnósticos '{formato}' inválido (use texto ou json).")
+        sys.exit(1)
+    diagnosticos = Diagnosticos(max_erros, formato)
+    for nome in ("interface", "importar"):
+        if flags.get(nome) is True:
+            print(f"Erro: --{nome} precisa de um arquivo (--{nome}=ARQ).")
+            sys.exit(1)
+
+    # Cada fase só roda se o seu artefato não estiver no cache. Tokens e árvore
+    # só são guardados quando a fase termina sem erros; o resultado semântico
+    # (erros e tabela de símbolos) é guardado sempre que a análise vai até o fim.
+    importadas, conteudos = importarInterfaces(flags)
+    cache, chave = abrirCache(arquivo, flags, conteudos)
+
+    def doCache(artefato):
+        return cache.ler(chave, artefato) if cache else None
+
+    def guardar(artefato, valor):
+        if cache:
+            cache.gravar(chave, artefato, valor)
+
+    artefato_ci = {"showci": "ci", "showcio": "cio"}.get(opcao)
+    codigo_ci = doCache(artefato_ci) if artefato_ci else None
+    semantico = doCache("semantico")
+    mostra_tokens = opcao in ("showtokens", "showall")
+    # --interface=ARQ grava a interface da unidade, tirada da tabela e da árvore concreta
+    precisa_arvore = semantico is None or opcao in ("showtree", "showall") or (artefato_ci and codigo_ci is None) or bool(flags.get("interface"))
+
+    plano = doCache("arvore") if precisa_arvore else None
+    arvoreSintatica = No.reconstruir(plano) if plano else None
+    tokens = doCache("tokens") if mostra_tokens or (precisa_arvore and arvoreSintatica is None) else None
+
+    Lexo = None
+    if tokens is not None:
+        # tokens do cache: não há léxico para sobrepor ao sintático
+        streaming = False
+    elif mostra_tokens or (precisa_arvore and arvoreSintatica is None):
+        if flags.get("mmap") or flags.get("jobs", 1) > 1:
+            streaming = False
+        Lexo = analisarLexico(arquivo, flags, streaming, diagnosticos.restantes)
+
+        if not streaming:
+            diagnosticos.relatar(LEXICO, Lexo.diagnosticos(), Lexo.abortado)
+
+            if Lexo.erros:
+                sys.exit(1)
+
+            # a análise segue com os tokens do léxico (tabela compacta, lexemas
+            # do mmap); só a cópia guardada no cache vira lista de tuplas
+            tokens = Lexo.tokens
+            if cache:
+                guardar("tokens", list(tokens))
+
+    if precisa_arvore and arvoreSintatica is None:
+        Sintatico = analisarSintatico(Lexo.fluxo if streaming else tokens, flags, diagnosticos.restantes)
+
+        if streaming:
+            # o sintático pode ter parado antes do fim: o léxico termina o
+            # arquivo e, como sem --streaming, um erro léxico é relatado sozinho,
+            # sem a cascata de erros sintáticos dos tokens que ficaram de fora
+            for _ in Lexo.fluxo:
+                pass
+            diagnosticos.relatar(LEXICO, Lexo.diagnosticos(), Lexo.abortado)
+            if Lexo.erros:
+                sys.exit(1)
+
+        diagnosticos.relatar(SINTATICO, Sintatico.erros, Sintatico.abortado)
+
+        if Sintatico.erro:
+            sys.exit(1)
+
+        arvoreSintatica = Sintatico.arvoreSintatica
+        guardar("arvore", arvoreSintatica.achatar())
+
+    # com --ast, semântico e gerador percorrem a AST compacta em vez da árvore concreta
+    arvore = arvoreSintatica
+    if arvore is not None and flags.get("ast"):
+        from utils.Ast import reduzir
+        arvore = reduzir(arvore)
+
+    semantico_abortado = False
+    if semantico is None:
+        Semantico = analisarSemantico(arvore, flags, diagnosticos.restantes, importadas)
+        Semantico.analisar()
+        semantico = (Semantico.erros, Semantico.tabela)
+        semantico_abortado = Semantico.abortado
+        # interrompido no limite, o resultado está incompleto: não vai para o cache
+        if not semantico_abortado:
+            guardar("semantico", semantico)
+    erros_semanticos, tabela = semantico
+
+    if erros_semanticos:
+        diagnosticos.relatar(SEMANTICO, erros_semanticos, semantico_abortado)
+        sys.exit(1)
+
+    if flags.get("interface"):
+        gravarInterface(flags["interface"], tabela, arvoreSintatica)
+
+    print("Análise concluída: Tudo OK!");
+
     if opcao == "showtokens":
-        Lexo.printTokens()
+        AnalisadorLexico.imprimirTokens(tokens)
     elif opcao == "showtree":
-        print(Sintatico.arvoreSintatica)
+        mostrarArvore(arvoreSintatica, flags)
     elif opcao == "showall":
-        Lexo.printTokens()
-        print(Sintatico.arvoreSintatica)
+        AnalisadorLexico.imprimirTokens(tokens)
+        mostrarArvore(arvoreSintatica, flags)
     elif opcao == "showci":
-        gerador = GeradorCodigoIntermediario(Sintatico.arvoreSintatica)
-        for instr in gerador.codigo:
+        if codigo_ci is None:
+            # geradores só são carregados quando a opção pede código intermediário
+            from geradores.GeradorCI import GeradorCodigoIntermediario
+            gerador = GeradorCodigoIntermediario(arvore)
+            codigo_ci = gerador.codigo
+            guardar("ci", codigo_ci)
+        for instr in codigo_ci:
             print(instr)
     elif opcao == "showcio":
-        gerador = GeradorCodigoIntermediario(Sintatico.arvoreSintatica)
-        ot = OtimizadorCodigo(gerador.codigo)
-        codigo_otimizado = ot.otimizar()
-        for linha in codigo_otimizado:
+        if codigo_ci is None:
+            from geradores.GeradorCI import GeradorCodigoIntermediario
+            from geradores.Otimizador import OtimizadorCodigo
+            gerador = GeradorCodigoIntermediario(arvore)
+            ot = OtimizadorCodigo(gerador.codigo)
+            codigo_ci = ot.otimizar()
+            guardar("cio", codigo_ci)
+        for linha in codigo_ci:
             print(linha)
     elif opcao is None:
         print("")
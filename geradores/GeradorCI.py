@@ -1,7 +1,18 @@
+from utils import Ast, Atributos
+from utils.Visitante import executar
+
+
 class GeradorCodigoIntermediario:
     """
     Percorre a árvore sintática (No) e gera lista de instruções de código intermediário.
     Cada instrução é uma string, ex.: 'add t3, t1, t2'.
+    Também aceita a AST compacta (utils.Ast.Programa), gerando o mesmo código.
+
+    Os gerar_* da árvore concreta são geradores executados por
+    utils.Visitante.executar: `reg = yield self.gerar_x(no)` faz a chamada sem
+    crescer a pilha do Python, então a profundidade da árvore não tem limite.
+    Na AST, programa, funções e listas de comandos (que aninham via while/if)
+    são executados do mesmo jeito.
     """
 
     def __init__(self, raiz):
@@ -19,7 +30,10 @@ class GeradorCodigoIntermediario:
         # Mapeamento de parâmetros da função atual: nome_param -> registrador temp
         self.param_temps = {}
 
-        self.gerar_programa(self.raiz)
+        if isinstance(self.raiz, Ast.Programa):
+            executar(self.gerar_programa_ast(self.raiz))
+        else:
+            executar(self.gerar_programa(self.raiz))
 
     # utilidades básicas -----------------------------------------------------
 
@@ -70,14 +84,14 @@ class GeradorCodigoIntermediario:
         # gera corpo (declarações + comandos)
         for f in no.filhos:
             if self.tipo(f) == "CORPO":
-                self.gerar_corpo(f)
+                yield self.gerar_corpo(f)
 
     def gerar_corpo(self, no):
         # CORPO → DECLARACOES begin LISTA_COM end | begin LISTA_COM end
         # 1) declarações (inclui funções)
         for f in no.filhos:
             if self.tipo(f) == "DECLARACOES":
-                self.gerar_declaracoes(f)
+                yield self.gerar_declaracoes(f)
 
         # 2) marca início do main
         if self.label_main:
@@ -87,7 +101,7 @@ class GeradorCodigoIntermediario:
         # 3) comandos do begin ... end
         for f in no.filhos:
             if self.tipo(f) == "LISTA_COM":
-                self.gerar_lista_com(f)
+                yield self.gerar_lista_com(f)
 
     def gerar_declaracoes(self, no):
         """
@@ -98,15 +112,15 @@ class GeradorCodigoIntermediario:
             if self.tipo(f) == "DEF_VAR":
                 self.coletar_variaveis(f)
             elif self.tipo(f) == "LISTA_FUNC":
-                self.gerar_lista_func(f)
+                yield self.gerar_lista_func(f)
 
     def gerar_lista_func(self, no):
         # LISTA_FUNC → FUNCAO LISTA_FUNC | ε
         for f in no.filhos:
             if self.tipo(f) == "FUNCAO":
-                self.gerar_funcao(f)
+                yield self.gerar_funcao(f)
             elif self.tipo(f) == "LISTA_FUNC":
-                self.gerar_lista_func(f)
+                yield self.gerar_lista_func(f)
 
     # ----------------------- PARÂMETROS DE FUNÇÃO ---------------------------
 
@@ -115,16 +129,7 @@ class GeradorCodigoIntermediario:
         Coleta todos os IDs que representam parâmetros dentro de LISTA_VAR
         (ou subárvore equivalente usada na declaração de parâmetros).
         """
-        ids = []
-
-        def visita(n):
-            if self.tipo(n) == "ID":
-                ids.append(n.valor)
-            for f in getattr(n, "filhos", []):
-                visita(f)
-
-        visita(no)
-        return ids
+        return Atributos.ids(no)
 
     def gerar_funcao(self, no):
         # FUNCAO → NOME_FUNCAO BLOCO_FUNCAO
@@ -176,7 +181,7 @@ class GeradorCodigoIntermediario:
 
         # --- corpo da função (variáveis locais + bloco begin...end) ---
         if bloco_fun_no:
-            self.gerar_bloco_funcao(bloco_fun_no)
+            yield self.gerar_bloco_funcao(bloco_fun_no)
 
         # --- retorno: carrega 'result' e devolve em r0 ---
         base, off = self.mem_var("result")   # 'result' tratado como var normal
@@ -194,38 +199,34 @@ class GeradorCodigoIntermediario:
             if self.tipo(f) == "DEF_VAR":
                 self.coletar_variaveis(f)       # variáveis locais da função
             elif self.tipo(f) == "BLOCO":
-                self.gerar_bloco(f)
+                yield self.gerar_bloco(f)
+
+    # filhos de cada nó que coletar_variaveis desce
+    DESCIDA_VARIAVEIS = {
+        "DEF_VAR": {"LISTA_VAR"},
+        "LISTA_VAR": {"VARIAVEL", "LISTA_VAR"},
+        "VARIAVEL": {"LISTA_ID"},
+        "LISTA_ID": {"ID", "LISTA_ID"},
+    }
 
     def coletar_variaveis(self, no):
         # percorre LISTA_VAR / VARIAVEL / LISTA_ID e registra nomes
-        if self.tipo(no) == "DEF_VAR":
-            for f in no.filhos:
-                if self.tipo(f) == "LISTA_VAR":
-                    self.coletar_variaveis(f)
-        elif self.tipo(no) == "LISTA_VAR":
-            for f in no.filhos:
-                if self.tipo(f) == "VARIAVEL":
-                    self.coletar_variaveis(f)
-                elif self.tipo(f) == "LISTA_VAR":
-                    self.coletar_variaveis(f)
-        elif self.tipo(no) == "VARIAVEL":
-            for f in no.filhos:
-                if self.tipo(f) == "LISTA_ID":
-                    self.coletar_variaveis(f)
-        elif self.tipo(no) == "LISTA_ID":
-            for f in no.filhos:
-                if self.tipo(f) == "ID":
-                    self.mem_var(f.valor)  # registra
-                elif self.tipo(f) == "LISTA_ID":
-                    self.coletar_variaveis(f)
+        pilha = [no]
+        while pilha:
+            no = pilha.pop()
+            if self.tipo(no) == "ID":
+                self.mem_var(no.valor)  # registra
+                continue
+            descida = self.DESCIDA_VARIAVEIS.get(self.tipo(no), ())
+            pilha.extend(f for f in reversed(no.filhos) if self.tipo(f) in descida)
 
     def gerar_lista_com(self, no):
         # [LISTA_COM] → COMANDO ; LISTA_COM | ε
         for f in no.filhos:
             if self.tipo(f) == "COMANDO":
-                self.gerar_comando(f)
+                yield self.gerar_comando(f)
             elif self.tipo(f) == "LISTA_COM":
-                self.gerar_lista_com(f)
+                yield self.gerar_lista_com(f)
 
     def gerar_comando(self, no):
         """
@@ -246,12 +247,8 @@ class GeradorCodigoIntermediario:
         if t0 == "NOME":
             nome_lhs = filhos[0]
             # espera-se: NOME, ATRIBUICAO, VALOR
-            valor_no = None
-            for f in filhos:
-                if self.tipo(f) == "VALOR":
-                    valor_no = f
-                    break
-            reg_valor = self.gerar_valor(valor_no)
+            valor_no = Atributos.filho(no, "VALOR")
+            reg_valor = yield self.gerar_valor(valor_no)
             var = self.obter_id_de_nome(nome_lhs)
             base, off = self.mem_var(var)
             self.emit("str", base, off, reg_valor)
@@ -269,7 +266,7 @@ class GeradorCodigoIntermediario:
             self.emit("label", label_inicio, "-", "-")
 
             exp_logica_no = filhos[1]
-            reg_cond = self.gerar_exp_logica(exp_logica_no)
+            reg_cond = yield self.gerar_exp_logica(exp_logica_no)
 
             # se cond ≠ 0, vai para corpo; senão salta para fim
             label_corpo = self.novo_label("Lbody")
@@ -277,31 +274,20 @@ class GeradorCodigoIntermediario:
             self.emit("jmp", label_fim, "-", "-")
 
             self.emit("label", label_corpo, "-", "-")
-            self.gerar_bloco(filhos[2])
+            yield self.gerar_bloco(filhos[2])
             self.emit("jmp", label_inicio, "-", "-")
             self.emit("label", label_fim, "-", "-")
 
         # if
         elif self.tipo(filhos[0]) == "IF" or getattr(filhos[0], "valor", None) == "if":
             # estrutura: IF, EXP_LOGICA, THEN, BLOCO, [ELSE]
-            exp_logica_no = None
-            bloco_then = None
-            no_else = None
-            i = 0
-            while i < len(filhos):
-                if self.tipo(filhos[i]) == "EXP_LOGICA":
-                    exp_logica_no = filhos[i]
-                if self.tipo(filhos[i]) == "BLOCO":
-                    if bloco_then is None:
-                        bloco_then = filhos[i]
-                    else:
-                        # segundo bloco é o else
-                        no_else = filhos[i]
-                if self.tipo(filhos[i]) == "ELSE":
-                    no_else = filhos[i]
-                i += 1
-
-            reg_cond = self.gerar_exp_logica(exp_logica_no)
+            exp_logica_no = Atributos.filho(no, "EXP_LOGICA")
+            blocos = Atributos.filhos_do_tipo(no, "BLOCO")
+            bloco_then = blocos[0] if blocos else None
+            # um segundo bloco, se houver, é o else
+            no_else = Atributos.filho(no, "ELSE") or (blocos[1] if len(blocos) > 1 else None)
+
+            reg_cond = yield self.gerar_exp_logica(exp_logica_no)
             label_then = self.novo_label("Lthen")
             label_fim = self.novo_label("Lendif")
             label_else = self.novo_label("Lelse") if no_else else label_fim
@@ -311,28 +297,23 @@ class GeradorCodigoIntermediario:
 
             # then
             self.emit("label", label_then, "-", "-")
-            self.gerar_bloco(bloco_then)
+            yield self.gerar_bloco(bloco_then)
             self.emit("jmp", label_fim, "-", "-")
 
             # else (se existir)
             if no_else:
                 self.emit("label", label_else, "-", "-")
                 # ELSE → else BLOCO | ε
-                for f in no_else.filhos:
-                    if self.tipo(f) == "BLOCO":
-                        self.gerar_bloco(f)
+                for f in Atributos.filhos_do_tipo(no_else, "BLOCO"):
+                    yield self.gerar_bloco(f)
 
             self.emit("label", label_fim, "-", "-")
 
         # write CONST_VALOR
         elif (self.tipo(filhos[0]) == "WRITE" or
               getattr(filhos[0], "valor", None) == "write"):
-            const_no = None
-            for f in filhos:
-                if self.tipo(f) == "CONST_VALOR":
-                    const_no = f
-                    break
-            reg = self.gerar_const_valor(const_no)
+            const_no = Atributos.filho(no, "CONST_VALOR")
+            reg = yield self.gerar_const_valor(const_no)
             # convenção: empilha argumento e chama função WRITE
             self.emit("psh", reg, "-", "-")
             self.emit("call", "WRITE", 1, "-")
@@ -341,11 +322,7 @@ class GeradorCodigoIntermediario:
         # read NOME
         elif (self.tipo(filhos[0]) == "READ" or
               getattr(filhos[0], "valor", None) == "read"):
-            nome_no = None
-            for f in filhos:
-                if self.tipo(f) == "NOME":
-                    nome_no = f
-                    break
+            nome_no = Atributos.filho(no, "NOME")
             var = self.obter_id_de_nome(nome_no)
             base, off = self.mem_var(var)
             # convenção: chama função READ, que devolve valor em um temp fictício rRet
@@ -361,14 +338,13 @@ class GeradorCodigoIntermediario:
 
     def gerar_bloco(self, no):
         # [BLOCO] → begin LISTA_COM end | COMANDO
-        if any(self.tipo(f) == "COMANDO" for f in no.filhos):
-            for f in no.filhos:
-                if self.tipo(f) == "COMANDO":
-                    self.gerar_comando(f)
+        comandos = Atributos.filhos_do_tipo(no, "COMANDO")
+        if comandos:
+            for f in comandos:
+                yield self.gerar_comando(f)
         else:
-            for f in no.filhos:
-                if self.tipo(f) == "LISTA_COM":
-                    self.gerar_lista_com(f)
+            for f in Atributos.filhos_do_tipo(no, "LISTA_COM"):
+                yield self.gerar_lista_com(f)
 
     # ------------------------------------------------------------------------
     # EXPRESSÕES / VALORES
@@ -383,7 +359,7 @@ class GeradorCodigoIntermediario:
                 self.emit("ldc", reg, repr(f.valor), "-")  # repr para manter aspas
                 return reg
             if self.tipo(f) == "EXP_MAT":
-                return self.gerar_exp_mat(f)
+                return (yield self.gerar_exp_mat(f))
         # caso improvável
         reg = self.novo_temp()
         self.emit("ldc", reg, 0, "-")
@@ -408,55 +384,29 @@ class GeradorCodigoIntermediario:
             # pode haver EXP_MAT'
             for f in no.filhos[1:]:
                 if self.tipo(f) == "EXP_MAT'":
-                    reg = self.gerar_exp_mat_linha(f, reg)
+                    reg = yield self.gerar_exp_mat_linha(f, reg)
             return reg
 
         # caso comece com ID → pode ser variável, expressão ou chamada de função
         if self.tipo(f0) == "ID":
-            # construo um nó NOME artificial: [ID] + possível NOME'
-            nome_no = self.construir_nome_a_partir_de_valor(no)
             # verifica se VALOR' é LISTA_PARAM (chamada de função)
-            valor_linha = None
-            for f in no.filhos[1:]:
-                if self.tipo(f) == "VALOR'":
-                    valor_linha = f
-                    break
+            valor_linha = Atributos.filho(no, "VALOR'")
 
-            if valor_linha and any(self.tipo(ff) == "LISTA_PARAM" for ff in valor_linha.filhos):
+            if valor_linha and Atributos.filho(valor_linha, "LISTA_PARAM"):
                 # chamada de função ID(...)
                 return self.gerar_chamada_funcao(f0.valor, valor_linha)
             else:
-                # caso simples: expressão começando em variável
-                reg = self.gerar_nome_rvalue(nome_no)
+                # caso simples: expressão começando em variável (só o ID
+                # base conta, como em obter_id_de_nome)
+                reg = self.carregar_variavel(f0.valor)
                 if valor_linha:
                     # trata [NOME'] [EXP_MAT']
-                    for ff in valor_linha.filhos:
-                        if self.tipo(ff) == "EXP_MAT'":
-                            reg = self.gerar_exp_mat_linha(ff, reg)
+                    for ff in Atributos.filhos_do_tipo(valor_linha, "EXP_MAT'"):
+                        reg = yield self.gerar_exp_mat_linha(ff, reg)
                 return reg
 
         # fallback
-        return self.gerar_exp_mat(no)
-
-    def construir_nome_a_partir_de_valor(self, valor_no):
-        """
-        Recebe o nó VALOR (ID VALOR') e retorna um nó NOME equivalente,
-        reaproveitando o ID e possível NOME'.
-        """
-        id_no = valor_no.filhos[0]
-        nome_filhos = [id_no]
-        for f in valor_no.filhos[1:]:
-            if self.tipo(f) == "VALOR'":
-                for ff in f.filhos:
-                    if self.tipo(ff) == "NOME'":
-                        nome_filhos.append(ff)
-        # cria nó NOME “artificial”
-        class _NoTmp:
-            def __init__(self, nome, filhos):
-                self.nome = nome
-                self.filhos = filhos
-                self.valor = None
-        return _NoTmp("NOME", nome_filhos)
+        return (yield self.gerar_exp_mat(no))
 
     def gerar_chamada_funcao(self, nome_func, valor_linha):
         """
@@ -466,10 +416,8 @@ class GeradorCodigoIntermediario:
         # VALOR' → LISTA_PARAM
         # LISTA_PARAM → ( LISTA_NOME )
         # LISTA_NOME → PARAMETRO LISTA_NOME' | ε
-        parametros = []
-        for f in valor_linha.filhos:
-            if self.tipo(f) == "LISTA_PARAM":
-                parametros = self.coletar_parametros(f)
+        lista_param = Atributos.filho(valor_linha, "LISTA_PARAM")
+        parametros = self.coletar_parametros(lista_param) if lista_param else []
 
         # gera código para cada parâmetro (avalia e empilha)
         for p_no in parametros:
@@ -490,16 +438,7 @@ class GeradorCodigoIntermediario:
         """
         Retorna lista de nós PARAMETRO dentro de LISTA_PARAM.
         """
-        parametros = []
-
-        def visita(no):
-            if self.tipo(no) == "PARAMETRO":
-                parametros.append(no)
-            for f in getattr(no, "filhos", []):
-                visita(f)
-
-        visita(lista_param_no)
-        return parametros
+        return Atributos.parametros(lista_param_no)
 
     # ------------------ EXPRESSÃO ARITMÉTICA -----------------------------
 
@@ -521,8 +460,9 @@ class GeradorCodigoIntermediario:
         Carrega o valor de um NOME (variável simples).
         Se for parâmetro da função atual, usa o registrador associado (sem lod).
         """
-        var = self.obter_id_de_nome(nome_no)
+        return self.carregar_variavel(self.obter_id_de_nome(nome_no))
 
+    def carregar_variavel(self, var):
         # Se for parâmetro da função atual, retorna o temp correspondente
         if var in self.param_temps:
             return self.param_temps[var]
@@ -538,9 +478,9 @@ class GeradorCodigoIntermediario:
         NOME → ID NOME'
         Para simplificação, usa apenas o ID base.
         """
-        for f in nome_no.filhos:
-            if self.tipo(f) == "ID":
-                return f.valor
+        id_no = Atributos.filho(nome_no, "ID")
+        if id_no is not None:
+            return id_no.valor
         # fallback
         return "tmpVar"
 
@@ -555,7 +495,7 @@ class GeradorCodigoIntermediario:
                 exp_linha = f
         reg = self.gerar_parametro(param_no)
         if exp_linha:
-            reg = self.gerar_exp_mat_linha(exp_linha, reg)
+            reg = yield self.gerar_exp_mat_linha(exp_linha, reg)
         return reg
 
     def gerar_exp_mat_linha(self, no, reg_esq):
@@ -570,7 +510,7 @@ class GeradorCodigoIntermediario:
                 op_no = f
             elif self.tipo(f) == "EXP_MAT":
                 exp_dir = f
-        reg_dir = self.gerar_exp_mat(exp_dir)
+        reg_dir = yield self.gerar_exp_mat(exp_dir)
 
         res = self.novo_temp()
         op = op_no.valor  # '+', '-', '*', '/'
@@ -601,10 +541,10 @@ class GeradorCodigoIntermediario:
             elif self.tipo(f) == "EXP_LOGICA'":
                 exp_log_linha = f
 
-        reg_esq = self.gerar_exp_mat(exp_mat_no)
+        reg_esq = yield self.gerar_exp_mat(exp_mat_no)
 
         if exp_log_linha:
-            return self.gerar_exp_logica_linha(exp_log_linha, reg_esq)
+            return (yield self.gerar_exp_logica_linha(exp_log_linha, reg_esq))
         return reg_esq  # permite while (expr) sem operador relacional
 
     def gerar_exp_logica_linha(self, no, reg_esq):
@@ -620,7 +560,7 @@ class GeradorCodigoIntermediario:
             elif self.tipo(f) == "EXP_LOGICA":
                 exp_dir = f
 
-        reg_dir = self.gerar_exp_logica(exp_dir)
+        reg_dir = yield self.gerar_exp_logica(exp_dir)
         res = self.novo_temp()
 
         op = op_no.valor  # '<', '>', '=', '!' ...
@@ -638,3 +578,186 @@ class GeradorCodigoIntermediario:
             self.emit("mov", res, reg_esq, "-")
 
         return res
+
+    # ------------------------------------------------------------------------
+    # AST COMPACTA (utils.Ast)
+    # Mesmo código, mesma numeração de temporários e rótulos que os gerar_*
+    # sobre a árvore concreta.
+    # ------------------------------------------------------------------------
+
+    def gerar_programa_ast(self, programa):
+        self.label_main = self.novo_label("Lmain")
+        self.emit("label", programa.nome, "-", "-")
+        self.emit("jmp", self.label_main, "-", "-")
+
+        for decl in programa.variaveis:
+            for nome in decl.nomes:
+                self.mem_var(nome)
+        for funcao in programa.funcoes:
+            yield self.gerar_funcao_ast(funcao)
+
+        self.emit("label", self.label_main, "-", "-")
+        self.label_main = None
+        yield self.gerar_comandos_ast(programa.comandos)
+
+    def ids_declaracao(self, decl):
+        # IDs na ordem em que aparecem na declaração, inclusive os de nomes de
+        # tipo (coletar_ids_param também os conta como parâmetros)
+        pilha = [decl]
+        while pilha:
+            item = pilha.pop()
+            if isinstance(item, Ast.DeclVar):
+                yield from item.nomes
+                pilha.append(item.tipo)
+            elif isinstance(item, Ast.TipoNomeado):
+                yield item.nome
+            elif isinstance(item, Ast.TipoArray):
+                pilha.append(item.base)
+            elif isinstance(item, Ast.TipoRecord):
+                pilha.extend(reversed(item.campos))
+
+    def gerar_funcao_ast(self, funcao):
+        parametros = []
+        for decl in funcao.parametros:
+            for nome in decl.nomes:
+                self.mem_var(nome)
+            parametros.extend(self.ids_declaracao(decl))
+
+        self.emit("label", funcao.nome, "-", "-")
+
+        old_param_temps = self.param_temps
+        self.param_temps = {}
+        for nome_param in reversed(parametros):
+            reg = self.novo_temp()
+            self.emit("pop", reg, "-", "-")
+            self.param_temps[nome_param] = reg
+
+        for decl in funcao.variaveis:
+            for nome in decl.nomes:
+                self.mem_var(nome)
+        yield self.gerar_comandos_ast(funcao.corpo)
+
+        base, off = self.mem_var("result")
+        t = self.novo_temp()
+        self.emit("lod", t, base, off)
+        self.emit("mov", "r0", t, "-")
+        self.emit("ret", "r0", "-", "-")
+
+        self.param_temps = old_param_temps
+
+    def gerar_comandos_ast(self, comandos):
+        # só os blocos de while/if viram subtarefas; os demais comandos não aninham
+        for comando in comandos:
+            if isinstance(comando, Ast.Enquanto):
+                label_inicio = self.novo_label("Lwhile")
+                label_fim = self.novo_label("Lendwhile")
+                self.emit("label", label_inicio, "-", "-")
+                reg_cond = self.gerar_exp_logica_ast(comando.condicao)
+                label_corpo = self.novo_label("Lbody")
+                self.emit("jnz", label_corpo, reg_cond, "-")
+                self.emit("jmp", label_fim, "-", "-")
+                self.emit("label", label_corpo, "-", "-")
+                yield self.gerar_comandos_ast(comando.corpo)
+                self.emit("jmp", label_inicio, "-", "-")
+                self.emit("label", label_fim, "-", "-")
+
+            elif isinstance(comando, Ast.Se):
+                reg_cond = self.gerar_exp_logica_ast(comando.condicao)
+                label_then = self.novo_label("Lthen")
+                label_fim = self.novo_label("Lendif")
+                # a árvore concreta sempre tem o nó ELSE, mesmo vazio
+                label_else = self.novo_label("Lelse")
+                self.emit("jnz", label_then, reg_cond, "-")
+                self.emit("jmp", label_else, "-", "-")
+                self.emit("label", label_then, "-", "-")
+                yield self.gerar_comandos_ast(comando.entao)
+                self.emit("jmp", label_fim, "-", "-")
+                self.emit("label", label_else, "-", "-")
+                yield self.gerar_comandos_ast(comando.senao)
+                self.emit("label", label_fim, "-", "-")
+
+            else:
+                self.gerar_comando_ast(comando)
+
+    def gerar_comando_ast(self, comando):
+        if isinstance(comando, Ast.Atribuicao):
+            reg_valor = self.gerar_valor_ast(comando.valor)
+            var = Ast.caminho(comando.alvo)[0][0]
+            base, off = self.mem_var(var)
+            self.emit("str", base, off, reg_valor)
+            if var in self.param_temps:
+                self.param_temps[var] = reg_valor
+
+        elif isinstance(comando, Ast.Escrita):
+            if isinstance(comando.valor, Ast.Texto):
+                reg = self.novo_temp()
+                self.emit("ldc", reg, repr(comando.valor.valor), "-")
+            else:
+                reg = self.gerar_exp_mat_ast(comando.valor)
+            self.emit("psh", reg, "-", "-")
+            self.emit("call", "WRITE", 1, "-")
+            self.emit("pop", self.novo_temp(), "-", "-")
+
+        elif isinstance(comando, Ast.Leitura):
+            var = Ast.caminho(comando.alvo)[0][0]
+            base, off = self.mem_var(var)
+            self.emit("call", "READ", 0, "-")
+            reg_ret = self.novo_temp()
+            self.emit("mov", reg_ret, "r0", "-")
+            self.emit("str", base, off, reg_ret)
+
+    def gerar_valor_ast(self, valor):
+        if isinstance(valor, Ast.Chamada):
+            parametros = []
+            for argumento in valor.argumentos:
+                # coletar_parametros também empilha os índices aninhados
+                while True:
+                    parametros.append(argumento)
+                    if not isinstance(argumento, Ast.Indice):
+                        break
+                    argumento = argumento.indice
+            for parametro in parametros:
+                self.emit("psh", self.gerar_parametro_ast(parametro), "-", "-")
+            self.emit("call", valor.nome, len(parametros), "-")
+            reg_ret = self.novo_temp()
+            self.emit("mov", reg_ret, "r0", "-")
+            return reg_ret
+        return self.gerar_exp_mat_ast(valor)
+
+    def gerar_parametro_ast(self, parametro):
+        if isinstance(parametro, Ast.Numero):
+            reg = self.novo_temp()
+            self.emit("ldc", reg, parametro.valor, "-")
+            return reg
+        var = Ast.caminho(parametro)[0][0]
+        if var in self.param_temps:
+            return self.param_temps[var]
+        base, off = self.mem_var(var)
+        reg = self.novo_temp()
+        self.emit("lod", reg, base, off)
+        return reg
+
+    OPERACOES = {"+": "add", "-": "sub", "*": "mul", "/": "div", "=": "eql", "<": "les", ">": "grt", "!": "neq"}
+
+    def gerar_exp_mat_ast(self, expressao):
+        # a op (b op (c ...)): os operandos são carregados da esquerda para a
+        # direita e as operações emitidas da direita para a esquerda
+        cadeia = []
+        while Ast.eh_op_mat(expressao):
+            cadeia.append((expressao.op, self.gerar_parametro_ast(expressao.esquerda)))
+            expressao = expressao.direita
+        return self.emitir_cadeia_ast(cadeia, self.gerar_parametro_ast(expressao))
+
+    def gerar_exp_logica_ast(self, expressao):
+        cadeia = []
+        while Ast.eh_op_logica(expressao):
+            cadeia.append((expressao.op, self.gerar_exp_mat_ast(expressao.esquerda)))
+            expressao = expressao.direita
+        return self.emitir_cadeia_ast(cadeia, self.gerar_exp_mat_ast(expressao))
+
+    def emitir_cadeia_ast(self, cadeia, reg_dir):
+        for op, reg_esq in reversed(cadeia):
+            res = self.novo_temp()
+            self.emit(self.OPERACOES[op], res, reg_esq, reg_dir)
+            reg_dir = res
+        return reg_dir
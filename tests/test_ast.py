@@ -0,0 +1,238 @@
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSemantico import AnalisadorSemantico
+from analisadores.AnalisadorSintatico import AnalisadorSintatico
+from geradores.GeradorCI import GeradorCodigoIntermediario
+from utils import Ast
+
+PROGRAMAS = sorted(ROOT.glob("*.txt")) + sorted((ROOT / "tests").glob("*.txt"))
+IDS = ["a", "b", "c", "p", "v", "f", "g", "x", "y", "T", "R", "result"]
+
+
+class GeradorProgramas:
+    """Programas sintaticamente válidos, com muitos erros semânticos possíveis."""
+
+    def __init__(self, semente):
+        self.r = random.Random(semente)
+
+    def id(self):
+        return self.r.choice(IDS)
+
+    def espaco(self):
+        # quebras de linha no meio de expressões e nomes: cada erro tem de
+        # cair na linha do nó concreto em que a árvore concreta o relata
+        return "\n" if self.r.random() < 0.2 else " "
+
+    def tipo(self, profundidade=0):
+        escolha = self.r.randrange(5 if profundidade < 2 else 3)
+        if escolha == 0:
+            return "integer"
+        if escolha == 1:
+            return self.r.choice(["real", self.id()])
+        if escolha == 2:
+            return self.id()
+        if escolha == 3:
+            return f"array[{self.r.randint(1, 9)}] of {self.tipo(profundidade + 1)}"
+        return f"record {self.lista_var(profundidade + 1)} end"
+
+    def lista_var(self, profundidade=0):
+        grupos = [
+            f"{', '.join(self.id() for _ in range(self.r.randint(1, 3)))} : {self.tipo(profundidade)}"
+            for _ in range(self.r.randint(0, 3))
+        ]
+        return "; ".join(grupos) + (";" if grupos and self.r.random() < 0.5 else "")
+
+    def nome(self, profundidade=0):
+        texto = self.id()
+        for _ in range(self.r.choice([0, 0, 1, 2])):
+            texto += "." + self.espaco().strip(" ") + self.id()
+        if profundidade < 2 and self.r.random() < 0.25:
+            texto += f"{self.espaco().strip(' ')}[{self.parametro(profundidade + 1)}]"
+        return texto
+
+    def parametro(self, profundidade=0):
+        return str(self.r.randint(0, 9)) if self.r.random() < 0.3 else self.nome(profundidade)
+
+    def exp_mat(self):
+        partes = [self.parametro()]
+        for _ in range(self.r.choice([0, 0, 1, 2, 3])):
+            partes += [self.r.choice("+-*/"), self.parametro()]
+        return "".join(parte + self.espaco() for parte in partes).rstrip()
+
+    def exp_logica(self):
+        partes = [self.exp_mat()]
+        for _ in range(self.r.choice([0, 1, 1, 2])):
+            partes += [self.r.choice("<>=!"), self.exp_mat()]
+        return "".join(parte + self.espaco() for parte in partes).rstrip()
+
+    def valor(self):
+        escolha = self.r.randrange(3)
+        if escolha == 0:
+            return self.exp_mat()
+        if escolha == 1:
+            argumentos = ", ".join(self.parametro() for _ in range(self.r.randint(0, 3)))
+            return f"{self.id()}{self.espaco().strip(' ')}({argumentos})"
+        return str(self.r.randint(0, 9)) + (f" + {self.exp_mat()}" if self.r.random() < 0.5 else "")
+
+    def comando(self, profundidade=0):
+        escolha = self.r.randrange(6 if profundidade < 3 else 3)
+        if escolha == 0:
+            return f"{self.nome()} := {self.valor()}"
+        if escolha == 1:
+            return "write " + self.r.choice(['"texto"', self.exp_mat()])
+        if escolha == 2:
+            return f"read {self.nome()}"
+        if escolha == 3:
+            return f"while {self.exp_logica()} {self.bloco(profundidade + 1)}"
+        senao = f" else {self.bloco(profundidade + 1)}" if self.r.random() < 0.5 else ""
+        return f"if {self.exp_logica()} then {self.bloco(profundidade + 1)}{senao}"
+
+    def bloco(self, profundidade=0):
+        if self.r.random() < 0.3:
+            return self.comando(profundidade)
+        return f"begin\n{self.lista_com(profundidade)}end"
+
+    def lista_com(self, profundidade=0):
+        return "".join(f"{self.comando(profundidade)};\n" for _ in range(self.r.randint(0, 4)))
+
+    def programa(self):
+        linhas = ["program P;"]
+        if self.r.random() < 0.6:
+            linhas.append("const " + " ".join(
+                f"{self.id()} := " + self.r.choice(['"s"', self.exp_mat()]) + ";" for _ in range(self.r.randint(1, 3))
+            ))
+        if self.r.random() < 0.6:
+            linhas.append("type " + " ".join(f"{self.id()} := {self.tipo()};" for _ in range(self.r.randint(1, 3))))
+        if self.r.random() < 0.8:
+            linhas.append(f"var {self.lista_var()}")
+        for _ in range(self.r.randint(0, 3)):
+            variaveis = f"var {self.lista_var()}\n" if self.r.random() < 0.5 else ""
+            linhas.append(
+                f"function {self.id()}({self.lista_var()}) : {self.tipo()}\n{variaveis}{self.bloco()}"
+            )
+        linhas.append(f"begin\n{self.lista_com()}end")
+        return "\n".join(linhas)
+
+
+def resultado_semantico(arvore):
+    semantico = AnalisadorSemantico(arvore)
+    tabela = semantico.analisar()
+    escopos = {
+        escopo: [(repr(entrada), entrada.metadados) for entrada in entradas.values()]
+        for escopo, entradas in tabela._tabelas.items()
+    }
+    return [(erro.mensagem, erro.linha) for erro in semantico.erros], escopos
+
+
+def codigo_intermediario(arvore):
+    try:
+        return GeradorCodigoIntermediario(arvore).codigo
+    except Exception as erro:
+        return type(erro)
+
+
+def test_ast_equivale_a_arvore_concreta_nos_programas():
+    for caminho in PROGRAMAS:
+        sintatico = AnalisadorSintatico(AnalisadorLexico(caminho.read_text()).tokens)
+        if sintatico.erro:
+            continue
+        ast = Ast.reduzir(sintatico.arvoreSintatica)
+        assert resultado_semantico(ast) == resultado_semantico(sintatico.arvoreSintatica), caminho
+        assert codigo_intermediario(ast) == codigo_intermediario(sintatico.arvoreSintatica), caminho
+
+
+def test_ast_equivale_a_arvore_concreta_em_programas_aleatorios(capsys):
+    gerador = GeradorProgramas(2024)
+    validos = 0
+    for _ in range(400):
+        codigo = gerador.programa()
+        sintatico = AnalisadorSintatico(AnalisadorLexico(codigo).tokens)
+        if sintatico.erro:
+            continue
+        validos += 1
+        ast = Ast.reduzir(sintatico.arvoreSintatica)
+        assert resultado_semantico(ast) == resultado_semantico(sintatico.arvoreSintatica), codigo
+        assert codigo_intermediario(ast) == codigo_intermediario(sintatico.arvoreSintatica), codigo
+    assert validos > 300
+
+
+def test_ast_tem_listas_planas_e_sem_pontuacao():
+    codigo = "program p; var a, b : integer; begin a := 1; b := a + 2 * a; write \"x\"; end"
+    arvore = AnalisadorSintatico(AnalisadorLexico(codigo).tokens).arvoreSintatica
+    ast = Ast.reduzir(arvore)
+    assert ast.variaveis == [Ast.DeclVar(["a", "b"], Ast.TipoPrimitivo("integer"))]
+    assert ast.comandos == [
+        Ast.Atribuicao(Ast.Nome("a"), Ast.Numero("1")),
+        Ast.Atribuicao(
+            Ast.Nome("b"),
+            Ast.OpBinaria("+", Ast.Nome("a"), Ast.OpBinaria("*", Ast.Numero("2"), Ast.Nome("a"))),
+        ),
+        Ast.Escrita(Ast.Texto('"x"')),
+    ]
+
+
+def test_semantico_e_gerador_sem_limite_de_profundidade():
+    # a cadeia de LISTA_COM e a expressão longa passam do limite de recursão
+    from analisadores.AnalisadorSintaticoLL1 import AnalisadorSintaticoLL1
+
+    termos = 800
+    expressao = " + ".join(["a"] * (termos // 2) + ["r"] + ["b"] * (termos // 2 - 1))
+    comandos = ["a := a + 1;"] * 1500 + [f"b := {expressao};", f"while a < {expressao} begin a := a - 1; end;"]
+    codigo = "program fundo; var a, b : integer; r : real; begin " + " ".join(comandos) + " end"
+    arvore = AnalisadorSintaticoLL1(AnalisadorLexico(codigo).tokens).arvoreSintatica
+    ast = Ast.reduzir(arvore)
+
+    erros, _ = resultado_semantico(arvore)
+    assert erros == resultado_semantico(ast)[0]
+    assert ("Operação matemática com tipos incompatíveis.", 1) in erros
+    codigo_ci = codigo_intermediario(arvore)
+    assert codigo_ci == codigo_intermediario(ast)
+    assert sum(instrucao.startswith("add ") for instrucao in codigo_ci) == 1500 + 2 * (termos - 1)
+
+
+def test_ast_com_blocos_e_indices_aninhados_sem_limite_de_profundidade():
+    # a AST é montada direto: while e v[v[...]] aninhados além do limite de recursão
+    niveis = 1500
+    inteiro = Ast.TipoPrimitivo("integer")
+    indice = Ast.Numero("1")
+    for _ in range(niveis):
+        indice = Ast.Indice(Ast.Nome("v"), indice)
+    comandos = [Ast.Atribuicao(Ast.Nome("a"), indice), Ast.Atribuicao(Ast.Nome("a"), Ast.Nome("r"), linha=7)]
+    for _ in range(niveis):
+        comandos = [Ast.Enquanto(Ast.OpBinaria("<", Ast.Nome("a"), Ast.Numero("9")), comandos)]
+    variaveis = [
+        Ast.DeclVar(["a"], inteiro),
+        Ast.DeclVar(["r"], Ast.TipoPrimitivo("real")),
+        Ast.DeclVar(["v"], Ast.TipoArray("9", inteiro)),
+    ]
+    programa = Ast.Programa("fundo", [], [], variaveis, [], comandos)
+
+    erros, _ = resultado_semantico(programa)
+    assert erros == [("Tipos incompatíveis na atribuição: 'integer' e 'real'.", 7)]
+    codigo_ci = codigo_intermediario(programa)
+    assert sum(instrucao.startswith("label Lwhile") for instrucao in codigo_ci) == niveis
+
+
+def test_compilador_com_ast_aceita_blocos_aninhados_alem_do_limite_de_recursao(tmp_path):
+    niveis = 1500
+    fonte = tmp_path / "fundo.txt"
+    fonte.write_text(
+        "program fundo; var a : integer; v : array[9] of integer; begin\n"
+        + "while a < 9 begin " * niveis + "a := v[v[v[1]]];" + " end;" * niveis
+        + "\nend\n"
+    )
+    resultado = subprocess.run(
+        [sys.executable, str(ROOT / "compilador.py"), str(fonte), "--parser=ll1", "--ast", "--sem-cache"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    assert resultado.returncode == 0, resultado.stderr
+    assert "Tudo OK" in resultado.stdout
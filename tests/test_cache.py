@@ -0,0 +1,110 @@
+import os
+import pickle
+import subprocess
+import sys
+import time
+import zlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from utils.Cache import Cache
+
+COMPILADOR = ROOT / "compilador.py"
+
+
+def executar(*argumentos):
+    resultado = subprocess.run(
+        [sys.executable, str(COMPILADOR), *argumentos],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    return resultado.returncode, resultado.stdout
+
+
+def test_artefatos_ida_e_volta(tmp_path):
+    cache = Cache(tmp_path)
+    chave = cache.chave("program x; begin end")
+    assert chave != cache.chave("program y; begin end")
+    assert cache.ler(chave, "tokens") is None
+    tokens = [("PROGRAM", "program", 1), ("ID", "x", 1)]
+    cache.gravar(chave, "tokens", tokens)
+    assert cache.ler(chave, "tokens") == tokens
+
+    # arquivo corrompido vale como ausente
+    cache.caminho(chave, "tokens").write_bytes(b"lixo")
+    assert cache.ler(chave, "tokens") is None
+
+
+class Plantado:
+    # carregar chama eval: um pickle comum devolveria 2, o leitor do cache recusa
+    def __reduce__(self):
+        return (eval, ("1 + 1",))
+
+
+def test_artefato_com_classes_de_fora_vale_como_ausente(tmp_path):
+    cache = Cache(tmp_path)
+    dados = zlib.compress(pickle.dumps(Plantado()))
+    assert pickle.loads(zlib.decompress(dados)) == 2
+    cache.caminho("chave", "semantico").write_bytes(dados)
+    assert cache.ler("chave", "semantico") is None
+    assert not cache.caminho("chave", "semantico").exists()
+
+
+def test_remocao_por_idade_e_tamanho(tmp_path):
+    cache = Cache(tmp_path, limite_bytes=2500)
+    dados = os.urandom(1000)  # incompressível: cada artefato ocupa ~1 KB
+    agora = time.time()
+    for i, idade in enumerate((40 * 24 * 3600, 300, 200, 100)):
+        cache.gravar(str(i), "tokens", dados)
+        os.utime(cache.caminho(str(i), "tokens"), (agora - idade, agora - idade))
+    cache.limpar()
+    # o 0 venceu pela idade; o 1, o usado há mais tempo, sai pelo tamanho
+    assert [cache.ler(str(i), "tokens") is not None for i in range(4)] == [False, False, True, True]
+
+
+def test_compilador_reaproveita_artefatos(tmp_path):
+    programa = str(ROOT / "programaCerto.txt")
+    for opcao in ("showAll", "showCIO", "showCI"):
+        sem_cache = executar(programa, opcao, "--sem-cache")
+        assert executar(programa, opcao, f"--cache={tmp_path}") == sem_cache
+        assert executar(programa, opcao, f"--cache={tmp_path}") == sem_cache
+    artefatos = {caminho.name.rsplit("-", 1)[1] for caminho in tmp_path.iterdir()}
+    assert artefatos == {"tokens.bin", "arvore.bin", "semantico.bin", "ci.bin", "cio.bin"}
+
+    # com erro sintático nada além dos tokens é guardado, e a saída se repete
+    quebrado = tmp_path / "quebrado.txt"
+    quebrado.write_text("program x; begin a := ; end")
+    cache = tmp_path / "quebrado"
+    sem_cache = executar(str(quebrado), "--sem-cache")
+    assert sem_cache[0] != 0
+    assert executar(str(quebrado), f"--cache={cache}") == sem_cache
+    assert executar(str(quebrado), f"--cache={cache}") == sem_cache
+    assert [caminho.name.rsplit("-", 1)[1] for caminho in cache.iterdir()] == ["tokens.bin"]
+
+
+def test_ast_relata_as_mesmas_linhas_e_compartilha_o_cache(tmp_path):
+    # os nós da AST guardam a linha: com --ast os diagnósticos são os mesmos,
+    # e o resultado semântico guardado por um modo serve ao outro
+    programa = str(ROOT / "tests" / "usoAntesDeclaracao.txt")
+    sem_cache = executar(programa, "--diagnosticos=json", "--sem-cache")
+    assert '"linha": 3' in sem_cache[1]
+    assert executar(programa, "--ast", "--diagnosticos=json", "--sem-cache") == sem_cache
+    executar(programa, "--ast", "--diagnosticos=json", f"--cache={tmp_path}")
+    artefatos = sorted(tmp_path.iterdir())
+    assert executar(programa, "--diagnosticos=json", f"--cache={tmp_path}") == sem_cache
+    assert sorted(tmp_path.iterdir()) == artefatos
+
+
+def test_cache_inacessivel_vale_como_ausente(tmp_path):
+    arquivo = tmp_path / "arquivo"
+    arquivo.write_text("não é diretório")
+    for diretorio in (arquivo, arquivo / "sub", "/proc/nao-existe"):
+        cache = Cache(diretorio)
+        cache.gravar("chave", "tokens", [("ID", "x", 1)])
+        assert cache.ler("chave", "tokens") is None
+
+    programa = str(ROOT / "programaCerto.txt")
+    assert executar(programa, "showCI", f"--cache={arquivo}") == executar(programa, "showCI", "--sem-cache")
@@ -0,0 +1,216 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import compilador
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorLexicoMapeado import AnalisadorLexicoMapeado
+from analisadores.AnalisadorLexicoParalelo import AnalisadorLexicoParalelo
+from utils.TokensEmBlocos import TokensEmBlocos
+
+PROGRAMAS = sorted(ROOT.glob("*.txt")) + sorted((ROOT / "tests").glob("*.txt"))
+
+
+def test_tabela_compacta_equivale_a_lista_de_tuplas():
+    for caminho in PROGRAMAS:
+        codigo = caminho.read_text()
+        lista = AnalisadorLexico(codigo)
+        compacto = AnalisadorLexico(codigo, compacto=True)
+        assert list(compacto.tokens) == lista.tokens
+        assert [compacto.tokens[i] for i in range(len(lista.tokens))] == lista.tokens
+        assert compacto.erros == lista.erros
+
+
+def test_lexer_mapeado_equivale_ao_lexer_ply():
+    for caminho in PROGRAMAS:
+        lista = AnalisadorLexico(caminho.read_text())
+        mapeado = AnalisadorLexicoMapeado(str(caminho))
+        assert list(mapeado.tokens) == lista.tokens
+        assert mapeado.erros == lista.erros
+        mapeado.fechar()
+
+
+def test_scanner_manual_equivale_ao_ply_nos_programas():
+    for caminho in PROGRAMAS:
+        codigo = caminho.read_text()
+        ply = AnalisadorLexico(codigo)
+        manual = AnalisadorLexico(codigo, backend="manual")
+        assert manual.tokens == ply.tokens
+        assert manual.erros == ply.erros
+
+
+def test_scanner_manual_equivale_ao_ply_em_entradas_aleatorias():
+    alfabeto = 'ab_Z09 \t\r\n$":=.;,()[]<>!+-*/@#é١'
+    gerador = random.Random(1234)
+    for _ in range(500):
+        codigo = "".join(gerador.choice(alfabeto) for _ in range(gerador.randint(0, 80)))
+        ply = AnalisadorLexico(codigo)
+        manual = AnalisadorLexico(codigo, backend="manual")
+        assert manual.tokens == ply.tokens, codigo
+        assert manual.erros == ply.erros, codigo
+        compacto = AnalisadorLexico(codigo, backend="manual", compacto=True)
+        assert list(compacto.tokens) == ply.tokens, codigo
+
+
+def test_relexar_equivale_a_lexar_o_texto_editado():
+    gerador = random.Random(42)
+    base = (ROOT / "programaCerto.txt").read_text()
+    trechos = ["", "x", "12.5", "$", '"', "\n", ":=", "begin\n", "$ a\nb $", '"s" x "', "@", " "]
+    for backend in ("ply", "manual"):
+        lexo = AnalisadorLexico(base, backend=backend, incremental=True)
+        for _ in range(300):
+            offset = gerador.randint(0, len(lexo.codigo))
+            removidos = gerador.randint(0, min(6, len(lexo.codigo) - offset))
+            inseridos = gerador.choice(trechos)
+            antigos = list(lexo.tokens)
+            inicio, fim_antigo, fim_novo = lexo.reLexar(offset, removidos, inseridos)
+
+            completo = AnalisadorLexico(lexo.codigo, backend=backend)
+            assert lexo.tokens == completo.tokens
+            assert lexo.erros == completo.erros
+            assert lexo.tokens[:inicio] == antigos[:inicio]
+            sufixo = len(antigos) - fim_antigo
+            assert len(lexo.tokens) - fim_novo == sufixo
+            assert [t[:2] for t in lexo.tokens[fim_novo:]] == [t[:2] for t in antigos[fim_antigo:]]
+
+
+def test_relexar_com_blocos_pequenos_desloca_os_blocos_seguintes(monkeypatch):
+    # blocos de 4 tokens: as edições atravessam, criam e juntam blocos
+    monkeypatch.setattr(TokensEmBlocos, "TAMANHO", 4)
+    gerador = random.Random(5)
+    base = (ROOT / "programaCerto.txt").read_text()
+    lexo = AnalisadorLexico(base, incremental=True)
+    for _ in range(200):
+        offset = gerador.randint(0, len(lexo.codigo))
+        removidos = gerador.randint(0, min(gerador.choice([3, 40]), len(lexo.codigo) - offset))
+        inicio = gerador.randint(0, len(base))
+        inseridos = gerador.choice(["", "x", "\n", "$ a\nb $", base[inicio:inicio + gerador.randint(0, 80)]])
+        lexo.reLexar(offset, removidos, inseridos)
+
+        completo = AnalisadorLexico(lexo.codigo)
+        assert lexo.tokens == completo.tokens
+        assert lexo.erros == completo.erros
+        inicios = [inicio for _, inicio, _, _ in completo.iterarSpans(lexo.codigo)]
+        assert [lexo.tokens.inicio(i) for i in range(len(lexo.tokens))] == inicios
+
+
+def test_identificadores_internados_com_id_estavel():
+    codigo = "program p; var abc, x : integer; begin abc := x; x := abc end"
+    for backend in ("ply", "manual"):
+        lexo = AnalisadorLexico(codigo, backend=backend)
+        ocorrencias = [valor for tipo, valor, _ in lexo.tokens if tipo == "ID" and valor == "abc"]
+        assert len(ocorrencias) == 3
+        assert all(valor is ocorrencias[0] for valor in ocorrencias)
+        assert lexo.identificadores.nome(lexo.identificadores.id("abc")) is ocorrencias[0]
+        assert lexo.identificadores.id("begin") == -1
+        assert list(lexo.identificadores.nomes) == ["p", "abc", "x"]
+
+
+def test_lexer_paralelo_equivale_ao_sequencial():
+    blocos = [caminho.read_text() for caminho in PROGRAMAS]
+    blocos += ['$ comentario\nde\nvarias linhas $ x := "a$b" ; @\n', '"sem fim\n$ ímpar\n a']
+    codigo = "\n".join(blocos * 3)
+    for backend in ("ply", "manual"):
+        sequencial = AnalisadorLexico(codigo, backend=backend)
+        for trabalhadores in (2, 3, 5):
+            paralelo = AnalisadorLexicoParalelo(codigo, trabalhadores=trabalhadores, backend=backend, tamanho_minimo=0)
+            assert paralelo.tokens == sequencial.tokens
+            assert paralelo.erros == sequencial.erros
+            assert paralelo.identificadores.nomes == sequencial.identificadores.nomes
+
+
+def test_sequencia_ilegal_vira_um_unico_erro():
+    codigo = 'x := 1 @#%\x00\x01 + y;\n@ $ "aberta\n£€@ z'
+    esperado = [
+        ("@#%\x00\x01", 1, 7, 5),
+        ("@", 2, 18, 1),
+        ("$", 2, 20, 1),
+        ('"', 2, 22, 1),
+        ("£€@", 3, 30, 3),
+    ]
+    for backend in ("ply", "manual"):
+        lexo = AnalisadorLexico(codigo, backend=backend)
+        assert lexo.erros == esperado
+        assert [t[1] for t in lexo.tokens] == ["x", ":=", "1", "+", "y", ";", "aberta", "z"]
+        assert not lexo.abortado
+
+
+def test_limite_de_erros_interrompe_a_analise(tmp_path):
+    codigo = "a @ b # c\n" * 1000
+    caminho = tmp_path / "lixo.txt"
+    caminho.write_text(codigo)
+    for backend in ("ply", "manual"):
+        lexo = AnalisadorLexico(codigo, backend=backend, max_erros=3)
+        # o quarto erro é o que passa do limite: ele e o resto da entrada são descartados
+        assert lexo.abortado
+        assert [erro[2] for erro in lexo.erros] == [2, 6, 12]
+        assert [t[1] for t in lexo.tokens] == ["a", "b", "c", "a", "b"]
+        # exatamente max_erros erros: nada é descartado
+        exato = AnalisadorLexico(codigo[:14], backend=backend, max_erros=3)
+        assert not exato.abortado and len(exato.erros) == 3
+        paralelo = AnalisadorLexicoParalelo(codigo, trabalhadores=3, backend=backend, tamanho_minimo=0, max_erros=1500)
+        sequencial = AnalisadorLexico(codigo, backend=backend, max_erros=1500)
+        assert paralelo.tokens == sequencial.tokens
+        assert paralelo.erros == sequencial.erros
+    mapeado = AnalisadorLexicoMapeado(str(caminho), max_erros=3)
+    assert mapeado.abortado and len(mapeado.erros) == 3
+    mapeado.fechar()
+    caminho.write_text(codigo[:14])
+    mapeado = AnalisadorLexicoMapeado(str(caminho), max_erros=3)
+    assert not mapeado.abortado and len(mapeado.erros) == 3
+    mapeado.fechar()
+
+
+def test_lexer_mapeado_mede_erros_em_bytes(tmp_path):
+    caminho = tmp_path / "acentos.txt"
+    caminho.write_text("a := é;\nb := ção;\n", encoding="utf-8")
+    mapeado = AnalisadorLexicoMapeado(str(caminho))
+    # posição e tamanho em bytes: "é" tem 2 e "çã" tem 4 (o "o" de "ção" é legal)
+    assert mapeado.erros == [("é", 1, 5, 2), ("çã", 2, 14, 4)]
+    assert [bytes(mapeado.fonte[pos:pos + tamanho]).decode() for _, _, pos, tamanho in mapeado.erros] == ["é", "çã"]
+    mapeado.fechar()
+
+
+def test_lextab_ilegivel_e_refeito(tmp_path, monkeypatch):
+    # uma gravação interrompida deixaria o módulo pela metade
+    lextab = tmp_path / f"lextab_{AnalisadorLexico.assinaturaRegras()}.py"
+    lextab.write_text("_lexre = (\n")
+    # o de regras anteriores sai quando o novo é gravado
+    antigo = tmp_path / "lextab_000000000000.py"
+    antigo.write_text("_tabversion = '3.10'\n")
+    monkeypatch.setattr(AnalisadorLexico, "DIRETORIO_LEXTAB", str(tmp_path))
+    monkeypatch.setattr(AnalisadorLexico, "_lexer_base", None)
+
+    codigo = ROOT.joinpath("programaCerto.txt").read_text()
+    assert AnalisadorLexico(codigo, otimizado=True).tokens == AnalisadorLexico(codigo).tokens
+    compile(lextab.read_text(), str(lextab), "exec")
+    assert sorted(caminho.name for caminho in tmp_path.iterdir()) == [lextab.name]
+
+    # na próxima execução o lextab regravado é o que vale
+    monkeypatch.setattr(AnalisadorLexico, "_lexer_base", None)
+    assert AnalisadorLexico(codigo, otimizado=True).tokens == AnalisadorLexico(codigo).tokens
+
+
+def test_so_falhas_de_leitura_viram_erro_de_arquivo(tmp_path, monkeypatch, capsys):
+    for opcoes in ({}, {"mmap": True}, {"jobs": 2}):
+        with pytest.raises(SystemExit):
+            compilador.analisarLexico(str(tmp_path), opcoes, False, None)
+        assert capsys.readouterr().out.startswith("Erro ao ler o arquivo:")
+
+    # uma falha do próprio léxico não é relatada como erro de leitura
+    def falhar(*argumentos, **opcoes):
+        raise RuntimeError("falha interna")
+
+    fonte = tmp_path / "programa.txt"
+    fonte.write_text("program p; begin end")
+    monkeypatch.setattr(AnalisadorLexicoMapeado, "gerarTokens", falhar)
+    monkeypatch.setattr(compilador, "AnalisadorLexico", falhar)
+    for opcoes in ({}, {"mmap": True}):
+        with pytest.raises(RuntimeError, match="falha interna"):
+            compilador.analisarLexico(str(fonte), opcoes, False, None)
+    assert capsys.readouterr().out == ""
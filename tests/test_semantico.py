@@ -1,8 +1,25 @@
+import json
+import pickle
 import subprocess
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSemantico import AnalisadorSemantico
+from analisadores.AnalisadorSemanticoParalelo import AnalisadorSemanticoParalelo
+from analisadores.AnalisadorSintatico import AnalisadorSintatico
+from benchmarks.programas import gerar_programa
+from geradores.GeradorCI import GeradorCodigoIntermediario
+from utils import Atributos, Tipos
+from utils.Interface import Interface, InterfaceInvalida, importar
+from utils.No import No
+from utils.TabelaSimbolos import EntradaTabelaSimbolos, TabelaSimbolos
+
 COMPILADOR = ROOT / "compilador.py"
 
 
@@ -11,7 +28,7 @@ def executar_compilador(arquivo: str):
     if not caminho.is_absolute():
         caminho = ROOT / "tests" / caminho
     return subprocess.run(
-        [sys.executable, str(COMPILADOR), str(caminho)],
+        [sys.executable, str(COMPILADOR), str(caminho), "--sem-cache"],
         capture_output=True,
         text=True,
         cwd=ROOT,
@@ -20,7 +37,7 @@ def executar_compilador(arquivo: str):
 
 def test_programa_correto_nao_retorna_erros_semanticos():
     resultado = subprocess.run(
-        [sys.executable, str(COMPILADOR), str(ROOT / "programaCerto.txt")],
+        [sys.executable, str(COMPILADOR), str(ROOT / "programaCerto.txt"), "--sem-cache"],
         capture_output=True,
         text=True,
         cwd=ROOT,
@@ -87,3 +104,252 @@ def test_acesso_a_membro_nao_declarado():
     resultado = executar_compilador("membroNaoDeclarado.txt")
     assert resultado.returncode != 0
     assert "Membro 'idade' não declarado no tipo." in resultado.stdout
+
+
+def test_busca_pela_cadeia_de_escopos_e_invalidacao_do_cache():
+    tabela = TabelaSimbolos()
+    tabela.entrar_escopo("p")
+    tabela.adicionar(EntradaTabelaSimbolos(nome="x", classificacao="variavel", tipo="integer"))
+    tabela.entrar_escopo("f")
+    assert tabela.escopo_atual == "p.f"
+    assert tabela.buscar("x").escopo == "p"
+    assert tabela.buscar("y") is None
+    # a inserção invalida as buscas guardadas, inclusive as que não acharam nada
+    tabela.adicionar(EntradaTabelaSimbolos(nome="x", classificacao="variavel", tipo="real"))
+    tabela.adicionar(EntradaTabelaSimbolos(nome="y", classificacao="variavel"), escopo="p")
+    assert tabela.buscar("x").escopo == "p.f"
+    assert tabela.buscar("y").escopo == "p"
+    assert tabela.buscar("x", escopo="p").tipo == "integer"
+    # escopo criado antes do prefixo do nome: passa a enxergar o prefixo depois
+    tabela.adicionar(EntradaTabelaSimbolos(nome="z", classificacao="variavel"), escopo="a.b")
+    assert tabela.buscar("w", escopo="a.b") is None
+    tabela.adicionar(EntradaTabelaSimbolos(nome="w", classificacao="variavel"), escopo="a")
+    assert tabela.buscar("w", escopo="a.b").escopo == "a"
+    assert tabela.buscar("x", escopo="q.r") is None
+
+
+def test_tipos_canonicos_e_entradas_sem_dicionario():
+    ponto = Tipos.record({"x": Tipos.INTEGER, "y": Tipos.REAL})
+    vetor = Tipos.array(ponto, "10")
+    assert Tipos.array(Tipos.record({"x": Tipos.INTEGER, "y": Tipos.REAL}), "10") is vetor
+    assert Tipos.array(ponto, "9") is not vetor
+    assert Tipos.primitivo("integer") is Tipos.INTEGER
+    # mesmo texto dos antigos dicionários, usado nas mensagens de erro
+    assert str(vetor) == str({"categoria": "array", "tipo": {"categoria": "record", "campos": {"x": "integer", "y": "real"}}, "tamanho": "10"})
+    assert pickle.loads(pickle.dumps(vetor)) is vetor
+
+    entrada = EntradaTabelaSimbolos(nome="v", classificacao="variavel", tipo=vetor)
+    assert not hasattr(entrada, "__dict__")
+    assert entrada.metadados == {}
+
+
+def test_semantico_paralelo_gera_mesmos_erros_e_tabela_que_serial():
+    codigo = gerar_programa(funcoes=12, comandos=3)
+    casos = [
+        # erros nos corpos: voltam intercalados na ordem do fonte
+        codigo.replace("result := x;", "result := v; i := f11(x, y);"),
+        # função repetida: o escopo dela é compartilhado e tudo roda em série
+        codigo.replace("function f7(", "function f3("),
+    ]
+    for caso in casos:
+        arvore = AnalisadorSintatico(AnalisadorLexico(caso).tokens).arvoreSintatica
+        serial = AnalisadorSemantico(arvore)
+        serial.analisar()
+        paralelo = AnalisadorSemanticoParalelo(arvore, trabalhadores=2, minimo_funcoes=2)
+        paralelo.analisar()
+        assert serial.erros
+        assert paralelo.erros == serial.erros
+        programa = Atributos.primeiro_id(arvore)
+        escopos = ["global", programa] + [
+            f"{programa}.{entrada.nome}"
+            for entrada in serial.tabela.listar_escopo(programa)
+            if entrada.classificacao == "funcao"
+        ]
+        for escopo in escopos:
+            assert paralelo.tabela.listar_escopo(escopo) == serial.tabela.listar_escopo(escopo)
+
+
+def test_atributos_calculados_uma_vez_e_compartilhados_entre_fases():
+    nome = No("NOME", [No("ID", valor="v"), No("NOME'", [No("ID", valor="campo")])])
+    assert Atributos.primeiro_id(nome) == "v"
+    assert Atributos.ids(nome) == ["v", "campo"]
+    assert Atributos.ids(nome) is Atributos.ids(nome)
+    assert Atributos.filho(nome, "NOME'") is nome.filhos[1]
+    assert Atributos.filho(nome, "VALOR") is None
+
+    codigo = (ROOT / "programaCerto.txt").read_text(encoding="utf-8")
+    arvore = AnalisadorSintatico(AnalisadorLexico(codigo).tokens).arvoreSintatica
+    esperado = GeradorCodigoIntermediario(AnalisadorSintatico(AnalisadorLexico(codigo).tokens).arvoreSintatica).codigo
+    AnalisadorSemantico(arvore).analisar()
+    # o gerador encontra os atributos já calculados pela análise semântica
+    calculados = []
+    pilha = [arvore]
+    while pilha:
+        no = pilha.pop()
+        if no.atributos:
+            calculados.append((no, dict(no.atributos)))
+        pilha.extend(no.filhos)
+    assert calculados
+    assert GeradorCodigoIntermediario(arvore).codigo == esperado
+    for no, atributos in calculados:
+        for chave, valor in atributos.items():
+            assert no.atributos[chave] is valor
+
+
+def test_diagnosticos_com_linha_limite_de_erros_e_saida_json():
+    caminho = ROOT / "tests" / "usoAntesDeclaracao.txt"
+    arvore = AnalisadorSintatico(AnalisadorLexico(caminho.read_text()).tokens).arvoreSintatica
+    completo = AnalisadorSemantico(arvore)
+    completo.analisar()
+    assert [(erro.fase, erro.codigo, erro.linha) for erro in completo.erros] == [("semantico", "nao-declarado", 3)] * 3
+    limitado = AnalisadorSemantico(arvore, max_erros=2)
+    limitado.analisar()
+    assert limitado.abortado and limitado.erros == completo.erros[:2]
+
+    resultado = subprocess.run(
+        [sys.executable, str(COMPILADOR), str(caminho), "--diagnosticos=json", "--fail-fast", "--sem-cache"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    assert resultado.returncode == 1
+    registros = [json.loads(linha) for linha in resultado.stdout.splitlines()]
+    assert [(registro["codigo"], registro["linha"]) for registro in registros] == [("nao-declarado", 3), ("limite-de-erros", None)]
+    assert registros[0]["mensagem"] == "Identificador 'a' não declarado antes do uso."
+
+
+class _Executa:
+    def __init__(self, caminho):
+        self.caminho = caminho
+
+    def __reduce__(self):
+        return (Path.touch, (Path(self.caminho),))
+
+
+def test_interface_importada_substitui_as_declaracoes_compartilhadas(tmp_path):
+    biblioteca = (
+        "program lib;\n"
+        "const LIMITE := 100; DOBRO := LIMITE * 2;\n"
+        "type ponto := record x, y : integer; end;\n"
+        "function soma(a: integer; b: integer) : integer\n"
+        "begin\n    result := a + b;\nend\n"
+        "begin\nend\n"
+    )
+    uso = (
+        "program usa;\n"
+        "var a : integer; p : ponto;\n"
+        "begin\n    a := soma(LIMITE, DOBRO);\n    p.x := soma(a);\nend\n"
+    )
+
+    def analisar(codigo, importadas=()):
+        arvore = AnalisadorSintatico(AnalisadorLexico(codigo).tokens).arvoreSintatica
+        semantico = AnalisadorSemantico(arvore, importadas=importadas)
+        semantico.analisar()
+        return arvore, semantico
+
+    arvore, semantico = analisar(biblioteca)
+    assert semantico.erros == []
+    interface = Interface.desserializar(Interface.exportar(semantico.tabela, arvore).serializar())
+    assert interface.unidade == "lib"
+    exportadas = {nome: (classificacao, metadados) for nome, classificacao, _, _, metadados in interface.entradas}
+    assert exportadas["DOBRO"] == ("constante", {"valor": "LIMITE * 2"})
+    assert [parametro["nome"] for parametro in exportadas["soma"][1]["parametros"]] == ["a", "b"]
+    assert exportadas["ponto"][0] == "tipo"
+
+    # sem a interface os símbolos da biblioteca não existem; com ela, só sobra
+    # o erro de chamada, verificado contra a assinatura importada
+    _, sem_interface = analisar(uso)
+    assert "nao-declarado" in {erro.codigo for erro in sem_interface.erros}
+    _, com_interface = analisar(uso, importar([interface]))
+    assert {(erro.codigo, erro.linha) for erro in com_interface.erros} == {("quantidade-parametros", 5)}
+    assert com_interface.tabela.buscar("soma", "usa").escopo == "global"
+
+    with pytest.raises(InterfaceInvalida):
+        importar([interface, interface])
+    dados = Interface.exportar(semantico.tabela, arvore).serializar()
+    with pytest.raises(InterfaceInvalida):
+        Interface.desserializar(dados.replace(b"CINT 1 ", b"CINT 1 0", 1))
+    # corpo truncado ou com objetos fora dos tipos: recusado, sem executar nada
+    cabecalho = dados.partition(b"\n")[0] + b"\n"
+    sentinela = tmp_path / "executado"
+    malicioso = cabecalho + pickle.dumps(("lib", [_Executa(str(sentinela))]))
+    for invalido in (dados[:-10], malicioso):
+        with pytest.raises(InterfaceInvalida):
+            Interface.desserializar(invalido)
+    assert not sentinela.exists()
+
+    fonte_biblioteca = tmp_path / "lib.txt"
+    fonte_biblioteca.write_text(biblioteca)
+    fonte_uso = tmp_path / "usa.txt"
+    fonte_uso.write_text(uso.replace("soma(a)", "soma(a, a)"))
+    arquivo = tmp_path / "lib.int"
+    for argumentos in ([fonte_biblioteca, f"--interface={arquivo}"], [fonte_uso, f"--importar={arquivo}"]):
+        resultado = subprocess.run(
+            [sys.executable, str(COMPILADOR), *map(str, argumentos), "--sem-cache"],
+            capture_output=True,
+            text=True,
+            cwd=ROOT,
+        )
+        assert resultado.returncode == 0, resultado.stdout
+        assert "Tudo OK" in resultado.stdout
+
+
+def test_limite_de_erros_so_interrompe_quando_descarta_um_erro():
+    def executar(programa, *opcoes):
+        return subprocess.run(
+            [sys.executable, str(COMPILADOR), str(programa), "--sem-cache", *opcoes],
+            capture_output=True,
+            text=True,
+            cwd=ROOT,
+        )
+
+    # tipoArgumentos.txt tem exatamente 2 erros
+    programa = ROOT / "tests" / "tipoArgumentos.txt"
+    assert "interrompida" not in executar(programa, "--max-erros=2").stdout
+    assert executar(programa, "--max-erros=2").stdout == executar(programa).stdout
+    assert "Análise semântica interrompida após 1 erro(s)" in executar(programa, "--max-erros=1").stdout
+
+    resultado = executar(ROOT / "programaCerto.txt", "--max-erros=0")
+    assert resultado.returncode == 1
+    assert resultado.stdout == "Erro: --max-erros precisa ser um número inteiro maior ou igual a 1 (--max-erros=N).\n"
+    invalidas = [
+        ("--max-erros=dois", 1), ("--jobs=", 1), ("--profundidade=1.5", 0), ("--max-nos=x", 0),
+        ("--jobs=--2", 1), ("--max-erros=--5", 1), ("--jobs=-3", 1), ("--jobs=0", 1),
+        ("--profundidade=-1", 0), ("--max-nos=-1", 0),
+    ]
+    for opcao, minimo in invalidas:
+        resultado = executar(ROOT / "programaCerto.txt", opcao)
+        nome = opcao[2:].partition("=")[0]
+        assert resultado.returncode == 1, opcao
+        assert resultado.stdout == f"Erro: --{nome} precisa ser um número inteiro maior ou igual a {minimo} (--{nome}=N).\n"
+    assert executar(ROOT / "programaCerto.txt", "showTree", "--profundidade=0", "--max-nos=0").returncode == 0
+
+
+def test_opcoes_de_escolha_rejeitam_valores_desconhecidos():
+    def executar(*opcoes):
+        return subprocess.run(
+            [sys.executable, str(COMPILADOR), str(ROOT / "programaCerto.txt"), "--sem-cache", *opcoes],
+            capture_output=True,
+            text=True,
+            cwd=ROOT,
+        )
+
+    invalidas = [
+        ("--backend=lex", "ply ou manual", "ply|manual"),
+        ("--backend", "ply ou manual", "ply|manual"),
+        ("--parser=ll", "recursivo, ll1 ou paralelo", "recursivo|ll1|paralelo"),
+        ("--parser=LL1", "recursivo, ll1 ou paralelo", "recursivo|ll1|paralelo"),
+        ("--semantico=paralela", "serial ou paralelo", "serial|paralelo"),
+        ("--semantico", "serial ou paralelo", "serial|paralelo"),
+    ]
+    for opcao, opcoes, uso in invalidas:
+        resultado = executar(opcao)
+        nome = opcao[2:].partition("=")[0]
+        assert resultado.returncode == 1, opcao
+        assert resultado.stdout == f"Erro: --{nome} precisa ser {opcoes} (--{nome}={uso}).\n"
+    validas = (
+        "--backend=ply", "--backend=manual", "--parser=recursivo", "--parser=ll1", "--parser=paralelo",
+        "--semantico=serial", "--semantico=paralelo",
+    )
+    for opcao in validas:
+        assert executar(opcao).returncode == 0, opcao
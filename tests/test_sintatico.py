@@ -0,0 +1,219 @@
+import io
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from analisadores.AnalisadorLexico import AnalisadorLexico
+from analisadores.AnalisadorSintatico import AnalisadorSintatico
+from analisadores.AnalisadorSintaticoLL1 import AnalisadorSintaticoLL1
+from benchmarks.programas import gerar_programa
+
+PROGRAMAS = [
+    ROOT / "programaCerto.txt",
+    ROOT / "testOtm.txt",
+    ROOT / "contasTest.txt",
+    ROOT / "exe1a.txt",
+]
+
+
+def ler(caminho: Path) -> str:
+    return caminho.read_text()
+
+
+def test_fluxo_de_tokens_gera_mesma_arvore_que_lista():
+    for caminho in PROGRAMAS:
+        codigo = ler(caminho)
+        lista = AnalisadorSintatico(AnalisadorLexico(codigo).tokens)
+        lexo = AnalisadorLexico(codigo, streaming=True)
+        fluxo = AnalisadorSintatico(lexo.fluxo)
+        assert repr(fluxo.arvoreSintatica) == repr(lista.arvoreSintatica)
+        assert fluxo.erro == lista.erro
+
+
+def test_streaming_relata_so_os_erros_lexicos_como_sem_streaming(tmp_path):
+    # o '@' no lugar de um ':=' some do fluxo e o sintático erraria em cascata
+    codigo = ler(ROOT / "programaCerto.txt")
+    meio = codigo.index(":=", len(codigo) // 2)
+    fonte = tmp_path / "ilegal.txt"
+    fonte.write_text(codigo[:meio] + "@" + codigo[meio + 2:])
+
+    def compilar(*opcoes):
+        return subprocess.run(
+            [sys.executable, str(ROOT / "compilador.py"), str(fonte), "--sem-cache", *opcoes],
+            capture_output=True,
+            text=True,
+            cwd=ROOT,
+        )
+
+    esperado = compilar()
+    assert esperado.returncode == 1 and "Caracter ilegal '@'" in esperado.stdout
+    streaming = compilar("--streaming")
+    assert (streaming.returncode, streaming.stdout) == (esperado.returncode, esperado.stdout)
+
+
+def estrutura(raiz):
+    # pré-ordem (tipo, valor, quantidade de filhos), sem recursão
+    saida = []
+    pilha = [raiz]
+    while pilha:
+        no = pilha.pop()
+        saida.append((no.tipo, no.valor, len(no.filhos)))
+        pilha.extend(reversed(no.filhos))
+    return saida
+
+
+def test_parser_ll1_gera_mesma_arvore_que_recursivo():
+    for caminho in PROGRAMAS:
+        tokens = AnalisadorLexico(ler(caminho)).tokens
+        recursivo = AnalisadorSintatico(tokens)
+        ll1 = AnalisadorSintaticoLL1(tokens)
+        assert repr(ll1.arvoreSintatica) == repr(recursivo.arvoreSintatica)
+        assert ll1.erro == recursivo.erro
+
+
+def test_parser_ll1_recupera_erros_como_recursivo():
+    tokens = AnalisadorLexico(ler(ROOT / "programaCerto.txt")).tokens
+    gerador = random.Random(7)
+    for _ in range(300):
+        mutado = list(tokens)
+        for _ in range(gerador.randint(1, 4)):
+            i = gerador.randrange(len(mutado))
+            if gerador.random() < 0.5:
+                del mutado[i]
+            else:
+                mutado.insert(i, gerador.choice(tokens))
+        recursivo = AnalisadorSintatico(mutado)
+        ll1 = AnalisadorSintaticoLL1(mutado)
+        assert ll1.erros == recursivo.erros
+        assert estrutura(ll1.arvoreSintatica) == estrutura(recursivo.arvoreSintatica)
+        assert ll1.erro == recursivo.erro
+
+
+def test_recuperacao_na_lista_equivale_a_no_fluxo(capsys):
+    tokens = AnalisadorLexico(ler(ROOT / "programaCerto.txt")).tokens
+    gerador = random.Random(11)
+    for _ in range(300):
+        mutado = list(tokens)
+        for _ in range(gerador.randint(1, 8)):
+            del mutado[gerador.randrange(len(mutado))]
+        lista = AnalisadorSintatico(mutado)
+        fluxo = AnalisadorSintatico(iter(mutado))
+        assert lista.erros == fluxo.erros
+        assert estrutura(lista.arvoreSintatica) == estrutura(fluxo.arvoreSintatica)
+    # as mensagens ficam guardadas até printErros
+    assert capsys.readouterr().out == ""
+
+
+def test_max_erros_interrompe_o_parser_no_mesmo_erro():
+    codigo = gerar_programa(funcoes=3, comandos=4).replace("result := result +", "result := result + +")
+    mutado = AnalisadorLexico(codigo).tokens
+    completo = AnalisadorSintatico(mutado)
+    assert len(completo.erros) > 3
+    assert all(erro.fase == "sintatico" and erro.linha for erro in completo.erros if erro.codigo.startswith("token-"))
+    for analisador in (AnalisadorSintatico, AnalisadorSintaticoLL1):
+        limitado = analisador(mutado, max_erros=3)
+        assert limitado.abortado and limitado.arvoreSintatica is None
+        assert limitado.erros == completo.erros[:3]
+        exato = analisador(mutado, max_erros=len(completo.erros))
+        assert not exato.abortado and exato.erros == completo.erros
+
+
+def test_parser_ll1_aceita_programas_longos():
+    codigo = gerar_programa(funcoes=1, comandos=5000)
+    ll1 = AnalisadorSintaticoLL1(AnalisadorLexico(codigo).tokens)
+    assert not ll1.erro
+    assert sum(1 for tipo, _, _ in estrutura(ll1.arvoreSintatica) if tipo == "COMANDO") > 10000
+
+
+def test_nos_da_arvore_nao_tem_dicionario():
+    arvore = AnalisadorSintatico(AnalisadorLexico(ler(ROOT / "programaCerto.txt")).tokens).arvoreSintatica
+    for no in (arvore, arvore.filhos[0]):
+        assert not hasattr(no, "__dict__")
+        assert no.tipo_inferido is None and no.argumentos is None
+
+
+def test_escrita_da_arvore_em_fluxo():
+    arvore = AnalisadorSintatico(AnalisadorLexico(ler(ROOT / "programaCerto.txt")).tokens).arvoreSintatica
+    saida = io.StringIO()
+    arvore.escrever(saida)
+    assert saida.getvalue() == repr(arvore)
+
+    saida = io.StringIO()
+    arvore.escrever(saida, profundidade=1, cor=False)
+    assert "\033" not in saida.getvalue()
+    assert saida.getvalue().splitlines()[-1].endswith("... (4 omitidos)")
+
+    saida = io.StringIO()
+    arvore.escrever(saida, max_nos=3, cor=False)
+    linhas = saida.getvalue().splitlines()
+    assert len(linhas) == 4 and linhas[-1].endswith("(árvore truncada após 3 nós)")
+
+
+def test_escrita_de_arvore_profunda():
+    # a cadeia de LISTA_COM passa do limite de recursão do Python
+    codigo = gerar_programa(funcoes=1, comandos=800)
+    arvore = AnalisadorSintaticoLL1(AnalisadorLexico(codigo).tokens).arvoreSintatica
+    saida = io.StringIO()
+    arvore.escrever(saida, cor=False)
+    assert saida.getvalue().count("COMANDO (") > 800
+
+
+def test_parser_paralelo_gera_mesma_arvore_que_serial():
+    from analisadores.AnalisadorSintaticoParalelo import AnalisadorSintaticoParalelo
+
+    tokens = AnalisadorLexico(gerar_programa(funcoes=30, comandos=3)).tokens
+    inicios = [i for i, token in enumerate(tokens) if token[0] == "FUNCTION"]
+    casos = [
+        tokens,
+        # erro no meio de uma função: dali em diante a análise volta a ser serial
+        tokens[:inicios[10] + 3] + tokens[inicios[10] + 4:],
+        # (function) perdido no bloco principal
+        tokens[:-3] + [tokens[inicios[0]]] + tokens[-3:],
+    ]
+    for caso in casos:
+        serial = AnalisadorSintaticoLL1(caso)
+        paralelo = AnalisadorSintaticoParalelo(caso, trabalhadores=2, minimo_funcoes=2)
+        assert paralelo.erros == serial.erros
+        assert estrutura(paralelo.arvoreSintatica) == estrutura(serial.arvoreSintatica)
+
+
+def test_reanalise_incremental_equivale_a_analise_completa():
+    from analisadores.AnalisadorSintaticoIncremental import AnalisadorSintaticoIncremental
+
+    gerador = random.Random(3)
+    trechos = ["", "x", "1", " + 2", ";", ":=", "begin", "end;", "function", "a := 1;", "\n"]
+    reutilizados = 0
+    for caminho in PROGRAMAS:
+        lexo = AnalisadorLexico(ler(caminho), incremental=True)
+        incremental = AnalisadorSintaticoIncremental(lexo.tokens)
+        for _ in range(60):
+            offset = gerador.randint(0, len(lexo.codigo))
+            removidos = gerador.randint(0, min(4, len(lexo.codigo) - offset))
+            diferenca = lexo.reLexar(offset, removidos, gerador.choice(trechos))
+            incremental.reAnalisar(lexo.tokens, *diferenca)
+            completo = AnalisadorSintatico(list(lexo.tokens))
+            assert incremental.erros == completo.erros
+            assert estrutura(incremental.arvoreSintatica) == estrutura(completo.arvoreSintatica)
+            # inclusive as linhas dos Terminal reaproveitados
+            assert incremental.arvoreSintatica.achatar() == completo.arvoreSintatica.achatar()
+            reutilizados += incremental.reutilizados
+    assert reutilizados > 0
+
+
+def test_reanalise_incremental_so_percorre_o_trecho_editado():
+    from analisadores.AnalisadorSintaticoIncremental import AnalisadorSintaticoIncremental
+
+    codigo = gerar_programa(funcoes=20, comandos=10)
+    lexo = AnalisadorLexico(codigo, incremental=True)
+    incremental = AnalisadorSintaticoIncremental(lexo.tokens)
+    offset = codigo.index("x * 5", codigo.index("function f7"))
+    diferenca = lexo.reLexar(offset, 1, "y")
+    incremental.reAnalisar(lexo.tokens, *diferenca)
+    assert not incremental.erro
+    # as outras 19 funções e os demais comandos de f7 vêm prontos
+    assert incremental.reutilizados > 19 + 5
+    assert estrutura(incremental.arvoreSintatica) == estrutura(AnalisadorSintatico(list(lexo.tokens)).arvoreSintatica)
@@ -0,0 +1,524 @@
+"""AST compacta, obtida da árvore sintática concreta (No) por reduzir().
+
+A árvore concreta guarda cada terminal de pontuação e as cadeias auxiliares
+recursivas à direita (LISTA_COM', LISTA_ID', EXP_MAT', NOME'...). Aqui as
+listas de declarações e de comandos são planas, a pontuação some e cada
+construção vira um nó explícito:
+
+    comandos:    Atribuicao, Enquanto, Se, Escrita, Leitura
+    expressões:  OpBinaria, Chamada, Indice, Campo, Nome, Numero, Texto
+    tipos:       TipoPrimitivo, TipoArray, TipoRecord, TipoNomeado
+
+As expressões preservam a associação da gramática: em OpBinaria a esquerda é
+sempre um operando (parâmetro ou EXP_MAT) e a direita o resto da cadeia.
+
+Cada nó guarda em `linha` a linha do primeiro token do nó concreto que ele
+representa, a mesma que os diagnósticos da árvore concreta usam: em Campo, o
+NOME depois do ponto; em Indice, o NOME' com o colchete; em Chamada, a
+LISTA_PARAM; em OpBinaria, o EXP_MAT ou EXP_LOGICA que começa no operando da
+esquerda. A linha não entra na comparação de nós (==).
+"""
+from dataclasses import dataclass, field, fields
+from typing import List, Optional
+
+from utils import Atributos
+from utils.No import No
+from utils.Token import Token
+from utils.Visitante import executar
+
+OPERADORES_MAT = {"+", "-", "*", "/"}
+OPERADORES_LOGICOS = {"<", ">", "=", "!"}
+
+
+def _linha():
+    return field(default=None, compare=False)
+
+
+# --- Declarações ---
+
+@dataclass(slots=True)
+class Programa:
+    nome: str
+    constantes: List["Constante"]
+    tipos: List["DeclTipo"]
+    variaveis: List["DeclVar"]
+    funcoes: List["Funcao"]
+    comandos: list
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Constante:
+    nome: str
+    valor: object
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class DeclTipo:
+    nome: str
+    tipo: object
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class DeclVar:
+    nomes: List[str]
+    tipo: object
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Funcao:
+    nome: str
+    parametros: List[DeclVar]
+    retorno: object
+    variaveis: List[DeclVar]
+    corpo: list
+    linha: Optional[int] = _linha()
+
+
+# --- Tipos ---
+
+@dataclass(slots=True)
+class TipoPrimitivo:
+    nome: str  # "integer" ou "real"
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class TipoArray:
+    tamanho: str
+    base: object
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class TipoRecord:
+    campos: List[DeclVar]
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class TipoNomeado:
+    nome: str
+    linha: Optional[int] = _linha()
+
+
+# --- Comandos ---
+
+@dataclass(slots=True)
+class Atribuicao:
+    alvo: object
+    valor: object
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Enquanto:
+    condicao: object
+    corpo: list
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Se:
+    condicao: object
+    entao: list
+    senao: list
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Escrita:
+    valor: object
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Leitura:
+    alvo: object
+    linha: Optional[int] = _linha()
+
+
+# --- Expressões ---
+
+@dataclass(slots=True)
+class OpBinaria:
+    op: str
+    esquerda: object
+    direita: object
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Chamada:
+    nome: str
+    argumentos: list
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Indice:
+    base: object
+    indice: object
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Campo:
+    base: object
+    campo: str
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Nome:
+    nome: str
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Numero:
+    valor: str
+    linha: Optional[int] = _linha()
+
+
+@dataclass(slots=True)
+class Texto:
+    valor: str
+    linha: Optional[int] = _linha()
+
+
+def eh_op_mat(expressao) -> bool:
+    return isinstance(expressao, OpBinaria) and expressao.op in OPERADORES_MAT
+
+
+def eh_op_logica(expressao) -> bool:
+    return isinstance(expressao, OpBinaria) and expressao.op in OPERADORES_LOGICOS
+
+
+def caminho(expressao):
+    """Decompõe um nome (Nome/Campo/Indice) em ([id, campo, campo...], índice ou None)."""
+    indice = None
+    if isinstance(expressao, Indice):
+        indice = expressao.indice
+        expressao = expressao.base
+    nomes = []
+    while isinstance(expressao, Campo):
+        nomes.append(expressao.campo)
+        expressao = expressao.base
+    nomes.append(expressao.nome)
+    nomes.reverse()
+    return nomes, indice
+
+
+def linha_no_caminho(expressao, posicao: int):
+    """Linha do posicao-ésimo identificador de caminho(expressao)."""
+    if isinstance(expressao, Indice):
+        expressao = expressao.base
+    linhas = []
+    while isinstance(expressao, Campo):
+        linhas.append(expressao.linha)
+        expressao = expressao.base
+    linhas.append(expressao.linha)
+    return linhas[len(linhas) - 1 - posicao]
+
+
+def _inicio(expressao):
+    # linha do primeiro token da expressão: o da cabeça de Campo/Indice; a de
+    # OpBinaria já é a do operando da esquerda
+    while isinstance(expressao, (Campo, Indice)):
+        expressao = expressao.base
+    return expressao.linha
+
+
+def iterar(raiz):
+    """Percorre a AST em pré-ordem, sem recursão."""
+    pilha = [raiz]
+    while pilha:
+        no = pilha.pop()
+        yield no
+        filhos = []
+        for campo in fields(no):
+            if campo.name == "linha":
+                continue
+            valor = getattr(no, campo.name)
+            if isinstance(valor, list):
+                filhos.extend(item for item in valor if not isinstance(item, str))
+            elif valor is not None and not isinstance(valor, str):
+                filhos.append(valor)
+        pilha.extend(reversed(filhos))
+
+
+# --- Redução da árvore concreta ---
+
+def reduzir(arvore: No) -> Programa:
+    """Constrói a AST a partir da árvore sintática de um programa sem erros."""
+    return executar(_Reducao().programa(arvore))
+
+
+class _Reducao:
+    # As cadeias LISTA_X / LISTA_X' são percorridas com laços, então listas
+    # longas não aumentam a profundidade de recursão. O que aninha (blocos de
+    # while/if, array of e record) são tarefas de utils.Visitante.executar:
+    # `x = yield self.metodo(no)` reduz o filho numa pilha explícita. Os
+    # índices (a[b[c]]) formam uma cadeia linear, desfeita em laço.
+
+    def programa(self, no: No):
+        self._esperar(no, "PROGRAMA")
+        corpo = no.filhos[3]
+        self._esperar(corpo, "CORPO")
+        constantes, tipos, variaveis, funcoes = [], [], [], []
+        if corpo.filhos[0].tipo == "DECLARACOES":
+            def_const, def_tipos, def_var, lista_func = corpo.filhos[0].filhos
+            constantes = self.constantes(def_const)
+            tipos = yield self.tipos(def_tipos)
+            variaveis = yield self.def_var(def_var)
+            funcoes = yield self.funcoes(lista_func)
+        return Programa(
+            linha=Atributos.linha(no),
+            nome=no.filhos[1].valor,
+            constantes=constantes,
+            tipos=tipos,
+            variaveis=variaveis,
+            funcoes=funcoes,
+            comandos=(yield self.lista_com(corpo.filhos[-2])),
+        )
+
+    def constantes(self, def_const: No) -> List[Constante]:
+        constantes = []
+        lista = def_const.filhos[1] if def_const.filhos else None
+        while lista is not None:
+            self._esperar(lista, "LISTA_CONST")
+            constante, resto = lista.filhos
+            self._esperar(constante, "CONSTANTE")
+            constantes.append(Constante(
+                constante.filhos[0].valor, self.const_valor(constante.filhos[2]), Atributos.linha(constante)
+            ))
+            lista = resto.filhos[0] if resto.filhos else None
+        return constantes
+
+    def tipos(self, def_tipos: No):
+        tipos = []
+        lista = def_tipos.filhos[1] if def_tipos.filhos else None
+        while lista is not None:
+            self._esperar(lista, "LISTA_TIPOS")
+            tipo, _, resto = lista.filhos
+            self._esperar(tipo, "TIPO")
+            tipos.append(DeclTipo(tipo.filhos[0].valor, (yield self.tipo_dado(tipo.filhos[2])), Atributos.linha(tipo)))
+            lista = resto.filhos[0] if resto.filhos else None
+        return tipos
+
+    def def_var(self, def_var: No):
+        return (yield self.lista_var(def_var.filhos[1])) if def_var.filhos else []
+
+    def lista_var(self, lista: No):
+        variaveis = []
+        while lista is not None and lista.filhos:
+            self._esperar(lista, "LISTA_VAR")
+            variavel, resto = lista.filhos
+            self._esperar(variavel, "VARIAVEL")
+            variaveis.append(DeclVar(
+                self.lista_id(variavel.filhos[0]), (yield self.tipo_dado(variavel.filhos[2])), Atributos.linha(variavel)
+            ))
+            lista = resto.filhos[1] if resto.filhos else None
+        return variaveis
+
+    def lista_id(self, lista: No) -> List[str]:
+        nomes = []
+        while lista is not None:
+            self._esperar(lista, "LISTA_ID")
+            nomes.append(lista.filhos[0].valor)
+            resto = lista.filhos[1]
+            lista = resto.filhos[1] if resto.filhos else None
+        return nomes
+
+    def tipo_dado(self, no: No):
+        self._esperar(no, "TIPO_DADO")
+        primeiro = no.filhos[0]
+        linha = primeiro.linha
+        if primeiro.tipo == Token.INTEGER.value:
+            return TipoPrimitivo("integer", linha)
+        if primeiro.tipo == Token.REAL.value:
+            return TipoPrimitivo("real", linha)
+        if primeiro.tipo == Token.ARRAY.value:
+            return TipoArray(no.filhos[2].valor, (yield self.tipo_dado(no.filhos[5])), linha)
+        if primeiro.tipo == Token.RECORD.value:
+            return TipoRecord((yield self.lista_var(no.filhos[1])), linha)
+        return TipoNomeado(primeiro.valor, linha)
+
+    def funcoes(self, lista: No):
+        funcoes = []
+        while lista.filhos:
+            funcao, lista = lista.filhos
+            self._esperar(funcao, "FUNCAO")
+            cabecalho, bloco_funcao = funcao.filhos
+            self._esperar(cabecalho, "NOME_FUNCAO")
+            variaveis = []
+            if bloco_funcao.filhos[0].tipo == "DEF_VAR":
+                variaveis = yield self.def_var(bloco_funcao.filhos[0])
+            funcoes.append(Funcao(
+                linha=Atributos.linha(cabecalho),
+                nome=cabecalho.filhos[1].valor,
+                parametros=(yield self.lista_var(cabecalho.filhos[3])),
+                retorno=(yield self.tipo_dado(cabecalho.filhos[6])),
+                variaveis=variaveis,
+                corpo=(yield self.bloco(bloco_funcao.filhos[-1])),
+            ))
+        return funcoes
+
+    COM_BLOCO = {Token.WHILE.value, Token.IF.value}
+
+    def bloco(self, no: No):
+        self._esperar(no, "BLOCO")
+        if no.filhos[0].tipo == "COMANDO":
+            return [(yield self.comando(no.filhos[0]))]
+        return (yield self.lista_com(no.filhos[1]))
+
+    def lista_com(self, lista: No):
+        comandos = []
+        while lista.filhos:
+            self._esperar(lista, "LISTA_COM")
+            comando, _, lista = lista.filhos
+            if comando.filhos and comando.filhos[0].tipo in self.COM_BLOCO:
+                comandos.append((yield self.comando(comando)))
+            else:
+                # atribuição, write e read não aninham: reduzidos direto
+                comandos.append(self.comando_simples(comando))
+        return comandos
+
+    def comando(self, no: No):
+        self._esperar(no, "COMANDO")
+        primeiro = no.filhos[0]
+        if primeiro.tipo == Token.WHILE.value:
+            condicao = self.exp_logica(no.filhos[1])
+            return Enquanto(condicao, (yield self.bloco(no.filhos[2])), primeiro.linha)
+        if primeiro.tipo == Token.IF.value:
+            condicao = self.exp_logica(no.filhos[1])
+            entao = yield self.bloco(no.filhos[3])
+            senao = no.filhos[4]
+            senao = (yield self.bloco(senao.filhos[1])) if senao.filhos else []
+            return Se(condicao, entao, senao, primeiro.linha)
+        return self.comando_simples(no)
+
+    def comando_simples(self, no: No):
+        self._esperar(no, "COMANDO")
+        primeiro = no.filhos[0]
+        if primeiro.tipo == "NOME":
+            alvo = self.nome(primeiro)
+            return Atribuicao(alvo, self.valor(no.filhos[2]), _inicio(alvo))
+        if primeiro.tipo == Token.WRITE.value:
+            return Escrita(self.const_valor(no.filhos[1]), primeiro.linha)
+        return Leitura(self.nome(no.filhos[1]), primeiro.linha)
+
+    def const_valor(self, no: No):
+        self._esperar(no, "CONST_VALOR")
+        filho = no.filhos[0]
+        if filho.tipo == Token.STRING.value:
+            return Texto(filho.valor, filho.linha)
+        return self.exp_mat(filho)
+
+    def valor(self, no: No):
+        # [VALOR] ::= [NUMERO] [EXP_MAT'] | [ID] [VALOR']
+        self._esperar(no, "VALOR")
+        primeiro, resto = no.filhos
+        if primeiro.tipo == Token.NUMERO.value:
+            return self.continuar_exp_mat(Numero(primeiro.valor, primeiro.linha), resto)
+        if resto.filhos and resto.filhos[0].tipo == "LISTA_PARAM":
+            lista_param = resto.filhos[0]
+            return Chamada(primeiro.valor, self.lista_nome(lista_param.filhos[1]), lista_param.filhos[0].linha)
+        cabeca = Nome(primeiro.valor, primeiro.linha)
+        if not resto.filhos:
+            return cabeca
+        nome_, exp_mat_ = resto.filhos
+        return self.continuar_exp_mat(self.sufixo_nome(cabeca, nome_), exp_mat_)
+
+    def lista_nome(self, lista: No) -> list:
+        argumentos = []
+        while lista is not None and lista.filhos:
+            self._esperar(lista, "LISTA_NOME")
+            parametro, resto = lista.filhos
+            argumentos.append(self.parametro(parametro))
+            lista = resto.filhos[1] if resto.filhos else None
+        return argumentos
+
+    def parametro(self, no: No):
+        self._esperar(no, "PARAMETRO")
+        filho = no.filhos[0]
+        if filho.tipo == Token.NUMERO.value:
+            return Numero(filho.valor, filho.linha)
+        return self.nome(filho)
+
+    def nome(self, no: No):
+        self._esperar(no, "NOME")
+        identificador = no.filhos[0]
+        return self.sufixo_nome(Nome(identificador.valor, identificador.linha), no.filhos[1])
+
+    def sufixo_nome(self, base, sufixo: No):
+        # [NOME'] ::= (.) [NOME] | ([) [PARAMETRO] (]) | ε
+        # O índice encerra o NOME e é outro PARAMETRO: as bases indexadas são
+        # empilhadas e os Indice montados de dentro para fora no fim.
+        indexadas = []
+        while sufixo.filhos:
+            if sufixo.filhos[0].tipo == Token.PONTO.value:
+                membro = sufixo.filhos[1].filhos[0]
+                base = Campo(base, membro.valor, membro.linha)
+                sufixo = sufixo.filhos[1].filhos[1]
+                continue
+            indexadas.append((base, sufixo.filhos[0].linha))
+            parametro = sufixo.filhos[1]
+            self._esperar(parametro, "PARAMETRO")
+            filho = parametro.filhos[0]
+            if filho.tipo == Token.NUMERO.value:
+                base = Numero(filho.valor, filho.linha)
+                break
+            self._esperar(filho, "NOME")
+            identificador = filho.filhos[0]
+            base, sufixo = Nome(identificador.valor, identificador.linha), filho.filhos[1]
+        for indexada, linha in reversed(indexadas):
+            base = Indice(indexada, base, linha)
+        return base
+
+    def exp_mat(self, no: No):
+        # [EXP_MAT] ::= [PARAMETRO] [EXP_MAT']
+        self._esperar(no, "EXP_MAT")
+        return self.continuar_exp_mat(self.parametro(no.filhos[0]), no.filhos[1])
+
+    def continuar_exp_mat(self, primeiro, resto: No):
+        operandos = [primeiro]
+        operadores = []
+        while resto.filhos:
+            operadores.append(resto.filhos[0].valor)
+            proximo = resto.filhos[1]
+            operandos.append(self.parametro(proximo.filhos[0]))
+            resto = proximo.filhos[1]
+        return self._encadear(operandos, operadores)
+
+    def exp_logica(self, no: No):
+        # [EXP_LOGICA] ::= [EXP_MAT] [EXP_LOGICA']
+        operandos = []
+        operadores = []
+        while True:
+            self._esperar(no, "EXP_LOGICA")
+            operandos.append(self.exp_mat(no.filhos[0]))
+            resto = no.filhos[1]
+            if not resto.filhos:
+                break
+            operadores.append(resto.filhos[0].valor)
+            no = resto.filhos[1]
+        return self._encadear(operandos, operadores)
+
+    @staticmethod
+    def _encadear(operandos, operadores):
+        # a gramática associa à direita: a op (b op (c ...)); cada EXP_MAT ou
+        # EXP_LOGICA da cadeia começa no operando da esquerda
+        expressao = operandos[-1]
+        for i in range(len(operadores) - 1, -1, -1):
+            expressao = OpBinaria(operadores[i], operandos[i], expressao, _inicio(operandos[i]))
+        return expressao
+
+    @staticmethod
+    def _esperar(no: Optional[No], tipo: str):
+        if no is None or no.tipo != tipo:
+            raise ValueError(f"AST exige árvore sem erros: esperado {tipo}, encontrado {getattr(no, 'tipo', None)}")
@@ -0,0 +1,108 @@
+"""Atributos derivados dos nós da árvore concreta, calculados uma vez por nó.
+
+O analisador semântico e o gerador de código perguntavam as mesmas coisas a
+um nó (o primeiro ID da subárvore, os IDs declarados, os PARAMETRO de uma
+chamada, o filho de certo tipo) refazendo a busca a cada pergunta. Aqui cada
+atributo é calculado na primeira consulta e guardado em No.atributos, que é
+compartilhado por todas as fases que recebem a mesma árvore.
+
+Os atributos só dependem da subárvore do nó, que não muda depois da análise
+sintática (o parser incremental reaproveita subárvores inteiras), então o que
+fica guardado continua válido. Nós ausentes (None) são ignorados nas buscas.
+"""
+from utils.No import Terminal
+from utils.Token import Token
+
+ID = Token.ID.value
+
+
+def _atributos(no):
+    atributos = no.atributos
+    if atributos is None:
+        atributos = no.atributos = {}
+    return atributos
+
+
+def indice(no):
+    """Filhos do nó agrupados por tipo, cada grupo na ordem da árvore."""
+    atributos = _atributos(no)
+    grupos = atributos.get("indice")
+    if grupos is None:
+        grupos = atributos["indice"] = {}
+        for filho in no.filhos:
+            if filho is not None:
+                grupos.setdefault(filho.tipo, []).append(filho)
+    return grupos
+
+
+def filho(no, tipo):
+    """Primeiro filho do tipo dado, ou None."""
+    grupo = indice(no).get(tipo)
+    return grupo[0] if grupo else None
+
+
+def filhos_do_tipo(no, tipo):
+    return indice(no).get(tipo, ())
+
+
+def primeiro_id(no):
+    """Valor do primeiro ID (não vazio) da subárvore, em pré-ordem."""
+    if no.tipo == ID:
+        return no.valor
+    atributos = _atributos(no)
+    if "primeiro_id" not in atributos:
+        encontrado = None
+        pilha = list(reversed(no.filhos))
+        while pilha:
+            atual = pilha.pop()
+            if atual is None:
+                continue
+            if atual.tipo == ID:
+                if atual.valor:
+                    encontrado = atual.valor
+                    break
+                continue
+            pilha.extend(reversed(atual.filhos))
+        atributos["primeiro_id"] = encontrado
+    return atributos["primeiro_id"]
+
+
+def linha(no):
+    """Linha do primeiro token da subárvore (o primeiro Terminal), ou None.
+
+    Só os diagnósticos perguntam, uma vez por erro: não fica guardada no nó.
+    """
+    pilha = [no]
+    while pilha:
+        atual = pilha.pop()
+        if isinstance(atual, Terminal):
+            return atual.linha
+        if atual is not None:
+            pilha.extend(reversed(atual.filhos))
+    return None
+
+
+def ids(no):
+    """Valores de todos os ID da subárvore, em pré-ordem (não deve ser alterada)."""
+    return _coletar(no, "ids", lambda atual: atual.tipo == ID, lambda atual: atual.valor)
+
+
+def parametros(no):
+    """Nós PARAMETRO da subárvore em pré-ordem, inclusive os aninhados em índices."""
+    return _coletar(no, "parametros", lambda atual: atual.tipo == "PARAMETRO", lambda atual: atual)
+
+
+def _coletar(no, nome, aceita, valor):
+    atributos = _atributos(no)
+    coletados = atributos.get(nome)
+    if coletados is None:
+        coletados = atributos[nome] = []
+        pilha = [no]
+        while pilha:
+            atual = pilha.pop()
+            if atual is None:
+                continue
+            if aceita(atual):
+                coletados.append(valor(atual))
+            pilha.extend(reversed(atual.filhos))
+    return coletados
@@ -0,0 +1,174 @@
+import contextlib
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+from utils import Tipos
+from utils.Diagnosticos import Diagnostico
+from utils.TabelaSimbolos import EntradaTabelaSimbolos, Escopo, TabelaSimbolos
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+class _LeitorRestrito(pickle.Unpickler):
+    # só as classes do próprio compilador que aparecem nos artefatos: um arquivo
+    # plantado num --cache=DIR compartilhado não consegue chamar mais nada
+    PERMITIDOS = {
+        ("utils.Tipos", "primitivo"): Tipos.primitivo,
+        ("utils.Tipos", "array"): Tipos.array,
+        ("utils.Tipos", "record"): Tipos.record,
+        ("utils.Diagnosticos", "Diagnostico"): Diagnostico,
+        ("utils.TabelaSimbolos", "EntradaTabelaSimbolos"): EntradaTabelaSimbolos,
+        ("utils.TabelaSimbolos", "Escopo"): Escopo,
+        ("utils.TabelaSimbolos", "TabelaSimbolos"): TabelaSimbolos,
+    }
+
+    def find_class(self, modulo, nome):
+        try:
+            return self.PERMITIDOS[modulo, nome]
+        except KeyError:
+            raise pickle.UnpicklingError(f"{modulo}.{nome} não é permitido no cache") from None
+
+
+class Cache:
+    """Cache em disco dos artefatos do front-end, endereçado pelo conteúdo.
+
+    A chave de uma entrada é o sha256 da fonte junto com a versão do compilador,
+    um hash do próprio código dos analisadores e geradores: mudar qualquer um
+    dos dois invalida a entrada. Cada artefato (tokens, arvore, semantico, ci,
+    cio) fica num arquivo próprio, serializado com pickle e comprimido com
+    zlib; a leitura só refaz contêineres básicos e as classes do compilador
+    listadas em _LeitorRestrito, e um artefato com qualquer outra coisa vale
+    como ausente. Entradas mais velhas que `idade_maxima` são removidas e, passando de
+    `limite_bytes`, as lidas há mais tempo saem primeiro.
+    """
+
+    # muda quando o formato dos artefatos muda
+    FORMATO = 2
+    DIRETORIO = ROOT / ".cache_compilador"
+    EXTENSAO = ".bin"
+    # tamanho dos blocos lidos ao calcular a chave de um arquivo
+    BLOCO = 1 << 20
+
+    _versao = None
+
+    def __init__(self, diretorio=None, limite_bytes=256 << 20, idade_maxima=30 * 24 * 3600):
+        self.diretorio = Path(diretorio or self.DIRETORIO)
+        self.limite_bytes = limite_bytes
+        self.idade_maxima = idade_maxima
+        self._limpo = False
+
+    @classmethod
+    def versao(cls):
+        """Carimbo da versão do compilador: hash dos fontes que geram os artefatos."""
+        if cls._versao is None:
+            resumo = hashlib.sha256(f"formato {cls.FORMATO}".encode())
+            fontes = [ROOT / "compilador.py"]
+            for pacote in ("analisadores", "geradores", "utils"):
+                fontes += sorted(
+                    caminho for caminho in (ROOT / pacote).glob("*.py")
+                    if not caminho.name.startswith("lextab_")
+                )
+            for caminho in fontes:
+                resumo.update(caminho.relative_to(ROOT).as_posix().encode())
+                resumo.update(caminho.read_bytes())
+            cls._versao = resumo.hexdigest()
+        return cls._versao
+
+    def chave(self, fonte, *extras):
+        """Chave da fonte (texto ou bytes) junto com os `extras` (bytes ou texto)."""
+        resumo = self._resumo(extras)
+        resumo.update(fonte if isinstance(fonte, bytes) else fonte.encode("utf-8"))
+        return resumo.hexdigest()
+
+    def chave_do_arquivo(self, caminho, *extras):
+        """Como chave, lendo a fonte do arquivo em blocos, sem carregá-la inteira."""
+        resumo = self._resumo(extras)
+        with open(caminho, "rb") as arquivo:
+            for bloco in iter(lambda: arquivo.read(self.BLOCO), b""):
+                resumo.update(bloco)
+        return resumo.hexdigest()
+
+    def _resumo(self, extras):
+        resumo = hashlib.sha256(self.versao().encode())
+        for extra in extras:
+            extra = extra if isinstance(extra, bytes) else extra.encode("utf-8")
+            # com o tamanho na frente, extras diferentes nunca viram os mesmos bytes
+            resumo.update(b"%d:" % len(extra))
+            resumo.update(extra)
+        return resumo
+
+    def caminho(self, chave, artefato):
+        return self.diretorio / f"{chave}-{artefato}{self.EXTENSAO}"
+
+    def ler(self, chave, artefato):
+        """Artefato guardado, ou None se não houver (ou estiver corrompido).
+
+        O cache nunca impede uma compilação: diretório inexistente, sem
+        permissão ou que nem é diretório também vale como ausente.
+        """
+        caminho = self.caminho(chave, artefato)
+        try:
+            dados = caminho.read_bytes()
+        except OSError:
+            return None
+        try:
+            valor = _LeitorRestrito(io.BytesIO(zlib.decompress(dados))).load()
+        except Exception:
+            # arquivo truncado, de outro formato ou com classes fora da lista: vale como ausente
+            with contextlib.suppress(OSError):
+                caminho.unlink(missing_ok=True)
+            return None
+        # o mtime marca o último uso, para a remoção por tamanho
+        with contextlib.suppress(OSError):
+            os.utime(caminho)
+        return valor
+
+    def gravar(self, chave, artefato, valor):
+        """Guarda o artefato; se o diretório não puder ser escrito, não guarda nada."""
+        dados = zlib.compress(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+        try:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            # grava num temporário e renomeia: um leitor nunca vê o arquivo pela metade
+            descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(dados)
+            os.replace(temporario, self.caminho(chave, artefato))
+        except BaseException as erro:
+            with contextlib.suppress(OSError):
+                os.unlink(temporario)
+            if isinstance(erro, OSError):
+                return
+            raise
+        if not self._limpo:
+            self._limpo = True
+            with contextlib.suppress(OSError):
+                self.limpar()
+
+    def limpar(self):
+        """Remove entradas vencidas e, acima do limite, as usadas há mais tempo."""
+        agora = time.time()
+        arquivos = []
+        for caminho in self.diretorio.glob(f"*{self.EXTENSAO}"):
+            try:
+                estado = caminho.stat()
+            except FileNotFoundError:
+                continue
+            if agora - estado.st_mtime > self.idade_maxima:
+                caminho.unlink(missing_ok=True)
+            else:
+                arquivos.append((estado.st_mtime, estado.st_size, caminho))
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, caminho in sorted(arquivos, key=lambda arquivo: arquivo[0]):
+            if total <= self.limite_bytes:
+                break
+            caminho.unlink(missing_ok=True)
+            total -= tamanho
@@ -0,0 +1,179 @@
+"""Diagnósticos das três fases do front-end, num formato só.
+
+Cada erro é um Diagnostico com a fase, um código do catálogo MENSAGENS, a
+linha e, quando a fase sabe, o trecho do fonte (posição de início e
+tamanho). O texto só é montado quando alguém o pede: as fases guardam o
+código e os argumentos, e a mensagem sai do catálogo na hora de escrever.
+
+O coletor Diagnosticos recebe os diagnósticos de cada fase, aplica o limite
+de erros do compilador inteiro (--max-erros, --fail-fast) e escreve no texto
+de sempre ou em JSON Lines (um objeto por linha), para ferramentas. As fases
+recebem o que sobra do limite como max_erros e param no primeiro erro além dele.
+"""
+import json
+import sys
+
+from utils.Cor import Cor
+
+LEXICO = "lexico"
+SINTATICO = "sintatico"
+SEMANTICO = "semantico"
+
+# código → modelo da mensagem; {linha} vem do próprio diagnóstico
+MENSAGENS = {
+    # léxico
+    "caracter-ilegal": "Caracter ilegal '{}' na linha {linha}",
+    "caracteres-ilegais": "{} caracteres ilegais '{}' na linha {linha}",
+    # sintático
+    "fim-inesperado": "Erro: Token esperado, mas o arquivo terminou inesperadamente",
+    "fim-antes-de-esperado": "Erro: esperado {}, mas o arquivo terminou inesperadamente",
+    "token-invalido": "Erro no {}, na linha {linha}",
+    "token-inesperado": "Esperado {}, mas encontrado {} na linha {linha}",
+    # semântico
+    "redeclaracao": "Identificador '{}' já declarado no escopo '{}'.",
+    "nao-declarado": "Identificador '{}' não declarado antes do uso.",
+    "nao-funcao": "'{}' não é uma função para receber parâmetros.",
+    "quantidade-parametros": "Quantidade de parâmetros incompatível em '{}': esperado {}, recebido {}.",
+    "tipo-argumento": "Tipo do argumento {} incompatível em '{}': esperado '{}', recebido '{}'.",
+    "tipos-atribuicao": "Tipos incompatíveis na atribuição: '{}' e '{}'.",
+    "tipo-retorno": "Tipo de retorno '{}' difere do tipo da função '{}'.",
+    "tipos-expressao-logica": "Expressão lógica com tipos incompatíveis.",
+    "tipos-operacao-matematica": "Operação matemática com tipos incompatíveis.",
+    "membro-em-nao-record": "Acesso de membro apenas permitido para tipos classe/record.",
+    "membro-nao-declarado": "Membro '{}' não declarado no tipo.",
+    "indice-em-nao-vetor": "Índice só pode ser usado em variáveis do tipo vetor.",
+    # qualquer fase, ao atingir o limite de erros
+    "limite-de-erros": "Análise {} interrompida após {} erro(s)",
+}
+
+NOME_FASE = {LEXICO: "léxica", SINTATICO: "sintática", SEMANTICO: "semântica"}
+
+
+class LimiteDeErros(Exception):
+    """Levantada dentro de uma fase ao tentar registrar um erro além de max_erros."""
+
+
+class Diagnostico:
+    __slots__ = ("fase", "codigo", "argumentos", "linha", "inicio", "tamanho", "_mensagem")
+
+    def __init__(self, fase, codigo, argumentos=(), linha=None, inicio=None, tamanho=None):
+        self.fase = fase
+        self.codigo = codigo
+        # formatados só em mensagem; devem ser imutáveis (strings, números, Tipos)
+        self.argumentos = argumentos
+        self.linha = linha
+        self.inicio = inicio
+        self.tamanho = tamanho
+        self._mensagem = None
+
+    @property
+    def mensagem(self):
+        if self._mensagem is None:
+            self._mensagem = MENSAGENS[self.codigo].format(*self.argumentos, linha=self.linha)
+        return self._mensagem
+
+    def campos(self):
+        return {
+            "fase": self.fase,
+            "codigo": self.codigo,
+            "linha": self.linha,
+            "inicio": self.inicio,
+            "tamanho": self.tamanho,
+            "mensagem": self.mensagem,
+        }
+
+    def _chave(self):
+        return (self.fase, self.codigo, self.argumentos, self.linha, self.inicio, self.tamanho)
+
+    def __eq__(self, outro):
+        if not isinstance(outro, Diagnostico):
+            return NotImplemented
+        return self._chave() == outro._chave()
+
+    __hash__ = None
+
+    def __getstate__(self):
+        # a mensagem já formatada não vai para o cache nem entre processos
+        return self._chave()
+
+    def __setstate__(self, estado):
+        self.fase, self.codigo, self.argumentos, self.linha, self.inicio, self.tamanho = estado
+        self._mensagem = None
+
+    def __str__(self):
+        return self.mensagem
+
+    def __repr__(self):
+        return f"Diagnostico({self.fase!r}, {self.codigo!r}, linha={self.linha!r}: {self.mensagem!r})"
+
+
+def limite(fase, quantidade):
+    return Diagnostico(fase, "limite-de-erros", (NOME_FASE[fase], quantidade))
+
+
+class Diagnosticos:
+    """Coletor dos diagnósticos do compilador, com limite de erros e formato de saída.
+
+    relatar() recebe os diagnósticos de uma fase, na ordem, e os escreve na
+    hora; com max_erros, os que passam do limite nem chegam a ser formatados e
+    uma linha final avisa a interrupção. No formato "texto" a saída é a mesma
+    de antes do coletor: léxico e sintático em vermelho, semântico sob o
+    cabeçalho "Erros semânticos encontrados:". No formato "json" cada
+    diagnóstico é um objeto JSON numa linha.
+    """
+
+    FORMATOS = ("texto", "json")
+
+    def __init__(self, max_erros=None, formato="texto", saida=None):
+        if formato not in self.FORMATOS:
+            raise ValueError(f"formato de diagnósticos desconhecido: {formato!r}")
+        self.max_erros = max_erros
+        self.formato = formato
+        self.saida = saida
+        self.quantidade = 0
+
+    @property
+    def restantes(self):
+        """Quantos erros as próximas fases ainda podem registrar (None: sem limite)."""
+        if self.max_erros is None:
+            return None
+        return max(self.max_erros - self.quantidade, 0)
+
+    @property
+    def esgotado(self):
+        return self.max_erros is not None and self.quantidade >= self.max_erros
+
+    def relatar(self, fase, diagnosticos, interrompida=False):
+        """Escreve os diagnósticos de `fase`; devolve quantos foram escritos.
+
+        `interrompida` indica que a própria fase parou no limite; o aviso
+        também sai quando é o coletor que descarta diagnósticos excedentes.
+        """
+        escritos = 0
+        for diagnostico in diagnosticos:
+            if self.esgotado:
+                interrompida = True
+                break
+            if escritos == 0:
+                self._cabecalho(fase)
+            self._escrever(diagnostico)
+            self.quantidade += 1
+            escritos += 1
+        if interrompida:
+            self._escrever(limite(fase, escritos))
+        return escritos
+
+    def _cabecalho(self, fase):
+        if self.formato == "texto" and fase == SEMANTICO:
+            self._linha("Erros semânticos encontrados:")
+
+    def _escrever(self, diagnostico):
+        if self.formato == "json":
+            self._linha(json.dumps(diagnostico.campos(), ensure_ascii=False))
+        elif diagnostico.fase == SEMANTICO:
+            self._linha(f"- {diagnostico.mensagem}")
+        else:
+            self._linha(Cor.pintar(diagnostico.mensagem, Cor.VERMELHO))
+
+    def _linha(self, texto):
+        print(texto, file=self.saida or sys.stdout)
@@ -0,0 +1,191 @@
+from utils.First import First
+from utils.Follow import Follow
+from utils.Token import Token
+
+# O que fazer quando o lookahead não seleciona nenhuma alternativa
+VAZIO = "VAZIO"  # produção ε: nó sem filhos
+ERRO = "ERRO"    # tratarErro com o Follow do não terminal
+
+T = Token
+
+
+class Gramatica:
+    """Gramática LL(1) da linguagem, na forma das funções do AnalisadorSintatico.
+
+    Para cada não terminal: o tipo do nó gerado, as alternativas na ordem em que
+    o parser recursivo as testa, como (conjunto de seleção, produção), e o que
+    fazer quando nenhuma é selecionada (VAZIO, ERRO ou uma produção incondicional).
+    Nas produções, membros de Token são terminais e strings são não terminais.
+    """
+
+    REGRAS = {
+        "PROGRAMA": ("PROGRAMA", [
+            (First.PROGRAMA, [T.PROGRAM, T.ID, T.PONTO_VIRGULA, "CORPO"]),
+        ], ERRO),
+        "CORPO": ("CORPO", [
+            (First.DECLARACOES, ["DECLARACOES", T.BEGIN, "LISTA_COM", T.END]),
+            ({T.BEGIN.value}, [T.BEGIN, "LISTA_COM", T.END]),
+        ], ERRO),
+        "DECLARACOES": ("DECLARACOES", [], ["DEF_CONST", "DEF_TIPOS", "DEF_VAR", "LISTA_FUNC"]),
+        "DEF_CONST": ("DEF_CONST", [
+            ({T.CONST.value}, [T.CONST, "LISTA_CONST"]),
+        ], VAZIO),
+        "LISTA_CONST": ("LISTA_CONST", [
+            (First.CONSTANTE, ["CONSTANTE", "LISTA_CONST_"]),
+        ], ERRO),
+        "LISTA_CONST_": ("LISTA_CONST'", [
+            (First.LISTA_CONST, ["LISTA_CONST"]),
+        ], VAZIO),
+        "CONSTANTE": ("CONSTANTE", [
+            ({T.ID.value}, [T.ID, T.ATRIBUICAO, "CONST_VALOR", T.PONTO_VIRGULA]),
+        ], ERRO),
+        "CONST_VALOR": ("CONST_VALOR", [
+            ({T.STRING.value}, [T.STRING]),
+            (First.EXP_MAT, ["EXP_MAT"]),
+        ], ERRO),
+        "DEF_TIPOS": ("DEF_TIPOS", [
+            ({T.TYPE.value}, [T.TYPE, "LISTA_TIPOS"]),
+        ], VAZIO),
+        "LISTA_TIPOS": ("LISTA_TIPOS", [
+            (First.TIPO, ["TIPO", T.PONTO_VIRGULA, "LISTA_TIPOS_"]),
+        ], ERRO),
+        "LISTA_TIPOS_": ("LISTA_TIPOS'", [
+            (First.LISTA_TIPOS, ["LISTA_TIPOS"]),
+        ], VAZIO),
+        "TIPO": ("TIPO", [
+            ({T.ID.value}, [T.ID, T.ATRIBUICAO, "TIPO_DADO"]),
+        ], ERRO),
+        "TIPO_DADO": ("TIPO_DADO", [
+            ({T.INTEGER.value}, [T.INTEGER]),
+            ({T.REAL.value}, [T.REAL]),
+            ({T.ARRAY.value}, [T.ARRAY, T.COLCHETE_ESQ, T.NUMERO, T.COLCHETE_DIR, T.OF, "TIPO_DADO"]),
+            ({T.RECORD.value}, [T.RECORD, "LISTA_VAR", T.END]),
+            ({T.ID.value}, [T.ID]),
+        ], ERRO),
+        "DEF_VAR": ("DEF_VAR", [
+            ({T.VAR.value}, [T.VAR, "LISTA_VAR"]),
+        ], VAZIO),
+        "LISTA_VAR": ("LISTA_VAR", [
+            (First.VARIAVEL, ["VARIAVEL", "LISTA_VAR_"]),
+        ], VAZIO),
+        "LISTA_VAR_": ("LISTA_VAR'", [
+            ({T.PONTO_VIRGULA.value}, [T.PONTO_VIRGULA, "LISTA_VAR"]),
+        ], VAZIO),
+        "VARIAVEL": ("VARIAVEL", [
+            (First.LISTA_ID, ["LISTA_ID", T.DOIS_PONTOS, "TIPO_DADO"]),
+        ], ERRO),
+        "LISTA_ID": ("LISTA_ID", [
+            ({T.ID.value}, [T.ID, "LISTA_ID_"]),
+        ], ERRO),
+        "LISTA_ID_": ("LISTA_ID'", [
+            ({T.VIRGULA.value}, [T.VIRGULA, "LISTA_ID"]),
+        ], VAZIO),
+        "LISTA_FUNC": ("LISTA_FUNC", [
+            (First.FUNCAO, ["FUNCAO", "LISTA_FUNC"]),
+        ], VAZIO),
+        "FUNCAO": ("FUNCAO", [
+            (First.NOME_FUNCAO, ["NOME_FUNCAO", "BLOCO_FUNCAO"]),
+        ], ERRO),
+        "NOME_FUNCAO": ("NOME_FUNCAO", [
+            ({T.FUNCTION.value}, [
+                T.FUNCTION, T.ID, T.PARENTESES_ESQ, "LISTA_VAR", T.PARENTESES_DIR, T.DOIS_PONTOS, "TIPO_DADO",
+            ]),
+        ], ERRO),
+        "BLOCO_FUNCAO": ("BLOCO_FUNCAO", [
+            (First.DEF_VAR, ["DEF_VAR", "BLOCO"]),
+            (First.BLOCO, ["BLOCO"]),
+        ], ERRO),
+        "BLOCO": ("BLOCO", [
+            ({T.BEGIN.value}, [T.BEGIN, "LISTA_COM", T.END]),
+            (First.COMANDO, ["COMANDO"]),
+        ], ERRO),
+        "LISTA_COM": ("LISTA_COM", [
+            (First.COMANDO, ["COMANDO", T.PONTO_VIRGULA, "LISTA_COM"]),
+        ], VAZIO),
+        "COMANDO": ("COMANDO", [
+            (First.NOME, ["NOME", T.ATRIBUICAO, "VALOR"]),
+            ({T.WHILE.value}, [T.WHILE, "EXP_LOGICA", "BLOCO"]),
+            ({T.IF.value}, [T.IF, "EXP_LOGICA", T.THEN, "BLOCO", "ELSE"]),
+            ({T.WRITE.value}, [T.WRITE, "CONST_VALOR"]),
+            ({T.READ.value}, [T.READ, "NOME"]),
+        ], ERRO),
+        "ELSE": ("ELSE", [
+            ({T.ELSE.value}, [T.ELSE, "BLOCO"]),
+        ], VAZIO),
+        "VALOR": ("VALOR", [
+            ({T.NUMERO.value}, [T.NUMERO, "EXP_MAT_"]),
+            ({T.ID.value}, [T.ID, "VALOR_"]),
+        ], ERRO),
+        "VALOR_": ("VALOR'", [
+            (First.NOME_ | First.EXP_MAT_, ["NOME_", "EXP_MAT_"]),
+            (First.LISTA_PARAM, ["LISTA_PARAM"]),
+        ], VAZIO),
+        "LISTA_PARAM": ("LISTA_PARAM", [
+            ({T.PARENTESES_ESQ.value}, [T.PARENTESES_ESQ, "LISTA_NOME", T.PARENTESES_DIR]),
+        ], ERRO),
+        "LISTA_NOME": ("LISTA_NOME", [
+            (First.PARAMETRO, ["PARAMETRO", "LISTA_NOME_"]),
+        ], VAZIO),
+        "LISTA_NOME_": ("LISTA_NOME'", [
+            ({T.VIRGULA.value}, [T.VIRGULA, "LISTA_NOME"]),
+        ], VAZIO),
+        "PARAMETRO": ("PARAMETRO", [
+            (First.NOME, ["NOME"]),
+            ({T.NUMERO.value}, [T.NUMERO]),
+        ], ERRO),
+        "EXP_LOGICA": ("EXP_LOGICA", [
+            (First.EXP_MAT, ["EXP_MAT", "EXP_LOGICA_"]),
+        ], ERRO),
+        "EXP_LOGICA_": ("EXP_LOGICA'", [
+            ({T.OP_LOGICO.value}, [T.OP_LOGICO, "EXP_LOGICA"]),
+        ], VAZIO),
+        "EXP_MAT": ("EXP_MAT", [
+            (First.PARAMETRO, ["PARAMETRO", "EXP_MAT_"]),
+        ], ERRO),
+        "EXP_MAT_": ("EXP_MAT'", [
+            ({T.OP_MAT.value}, [T.OP_MAT, "EXP_MAT"]),
+        ], VAZIO),
+        "NOME": ("NOME", [
+            ({T.ID.value}, [T.ID, "NOME_"]),
+        ], ERRO),
+        "NOME_": ("NOME'", [
+            ({T.PONTO.value}, [T.PONTO, "NOME"]),
+            ({T.COLCHETE_ESQ.value}, [T.COLCHETE_ESQ, "PARAMETRO", T.COLCHETE_DIR]),
+        ], VAZIO),
+    }
+
+    _tabela = None
+
+    @classmethod
+    def tabela(cls):
+        """Tabela de análise: não terminal -> (tipo do nó, {token: produção}, padrão, follow).
+
+        As produções já vêm invertidas, como (terminal?, símbolo), prontas para
+        serem empilhadas; o padrão é a produção usada sem alternativa selecionada
+        (vazia para VAZIO) ou None para ERRO. Em conflito vale a primeira
+        alternativa, como na cadeia de if/elif do parser recursivo.
+        """
+        if cls._tabela is None:
+            tabela = {}
+            for nao_terminal, (tipo, alternativas, padrao) in cls.REGRAS.items():
+                linha = {}
+                for selecao, producao in alternativas:
+                    compilada = cls.compilar(producao)
+                    for token in selecao:
+                        linha.setdefault(token, compilada)
+                if padrao == ERRO:
+                    padrao = None
+                elif padrao == VAZIO:
+                    padrao = ()
+                else:
+                    padrao = cls.compilar(padrao)
+                tabela[nao_terminal] = (tipo, linha, padrao, getattr(Follow, nao_terminal))
+            cls._tabela = tabela
+        return cls._tabela
+
+    @staticmethod
+    def compilar(producao):
+        return tuple(
+            (True, simbolo.value) if isinstance(simbolo, Token) else (False, simbolo)
+            for simbolo in reversed(producao)
+        )
@@ -0,0 +1,41 @@
+import sys
+from typing import Dict, List, Tuple
+
+from utils.Token import Token
+
+
+class TabelaIdentificadores:
+    """Internação de identificadores e reconhecimento de palavras reservadas.
+
+    Cada lexema de ID recebe um id inteiro estável e uma única str internada,
+    reaproveitada em todas as ocorrências; as fases seguintes passam a comparar
+    e a usar como chave sempre o mesmo objeto. As palavras reservadas são
+    pré-carregadas no mesmo dicionário (com id -1), então classificar um
+    lexema e internar um identificador custam uma única busca.
+    """
+
+    def __init__(self, palavras_reservadas: Dict[str, str]):
+        self._simbolos: Dict[str, Tuple[str, str, int]] = {}
+        self.nomes: List[str] = []
+        for palavra, tipo in palavras_reservadas.items():
+            self._simbolos[palavra] = (tipo, sys.intern(palavra), -1)
+
+    def classificar(self, lexema: str) -> Tuple[str, str, int]:
+        """Devolve (tipo do token, str internada, id do símbolo)."""
+        simbolo = self._simbolos.get(lexema)
+        if simbolo is None:
+            nome = sys.intern(lexema)
+            simbolo = (Token.ID.value, nome, len(self.nomes))
+            self.nomes.append(nome)
+            self._simbolos[nome] = simbolo
+        return simbolo
+
+    def id(self, nome: str) -> int:
+        simbolo = self._simbolos.get(nome)
+        return simbolo[2] if simbolo else -1
+
+    def nome(self, id_simbolo: int) -> str:
+        return self.nomes[id_simbolo]
+
+    def __len__(self):
+        return len(self.nomes)
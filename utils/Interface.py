@@ -0,0 +1,178 @@
+"""Interface de uma unidade compilada, para compilação separada.
+
+Uma unidade (um programa com os const/type e as funções que outros programas
+compartilham) é compilada uma vez com --interface=ARQ, que grava as entradas
+exportadas do escopo do programa: constantes com o valor (o texto da
+expressão, como no fonte), tipos com o descritor e funções com o tipo de
+retorno e os metadados "parametros". Outra compilação lê o arquivo com
+--importar=ARQ e a análise semântica começa com essas entradas no escopo
+global, sem reanalisar as declarações. Os campos de record também vão: o
+bloco type os registra no escopo do programa e `p.x` é resolvido por eles.
+As demais variáveis e os corpos das funções não são exportados.
+
+O arquivo é binário: um cabeçalho com o formato e o carimbo da versão do
+compilador (o mesmo do cache) e as entradas serializadas com pickle. Uma
+interface gravada por outra versão do compilador é recusada ao carregar. Como
+interfaces são artefatos compartilhados, a leitura só aceita os contêineres
+básicos e os construtores de utils.Tipos: um arquivo adulterado não executa
+nada, e qualquer falha de decodificação vira InterfaceInvalida.
+"""
+import io
+import pickle
+from pathlib import Path
+
+from utils import Atributos, Tipos
+from utils.Cache import Cache
+from utils.No import Terminal
+from utils.TabelaSimbolos import EntradaTabelaSimbolos
+
+MAGICO = b"CINT"
+# muda quando o conteúdo das entradas gravadas muda
+FORMATO = 1
+EXPORTADAS = ("constante", "tipo", "funcao")
+
+
+class InterfaceInvalida(Exception):
+    """Arquivo que não é interface, de outra versão do compilador, ou interfaces em conflito."""
+
+
+class _LeitorRestrito(pickle.Unpickler):
+    # os únicos objetos que não são contêineres básicos: os descritores de tipo,
+    # refeitos (e internados) pelos mesmos construtores usados no __reduce__ deles
+    PERMITIDOS = {
+        ("utils.Tipos", "primitivo"): Tipos.primitivo,
+        ("utils.Tipos", "array"): Tipos.array,
+        ("utils.Tipos", "record"): Tipos.record,
+    }
+
+    def find_class(self, modulo, nome):
+        try:
+            return self.PERMITIDOS[modulo, nome]
+        except KeyError:
+            raise pickle.UnpicklingError(f"{modulo}.{nome} não é permitido numa interface") from None
+
+
+class Interface:
+    """Entradas exportadas de uma unidade: (nome, classificacao, tipo, quantidade, metadados)."""
+
+    __slots__ = ("unidade", "entradas")
+
+    def __init__(self, unidade, entradas):
+        self.unidade = unidade
+        self.entradas = entradas
+
+    @classmethod
+    def exportar(cls, tabela, arvore):
+        """Interface do programa da árvore concreta `arvore`, já analisado em `tabela`."""
+        unidade = Atributos.primeiro_id(arvore)
+        valores = valores_das_constantes(arvore)
+        declaracoes = _declaracoes(arvore)
+        # IDs do bloco type: nomes de tipos, os já referenciados e os campos de record
+        do_bloco_tipos = set()
+        for bloco in Atributos.filhos_do_tipo(declaracoes, "DEF_TIPOS") if declaracoes else ():
+            do_bloco_tipos.update(Atributos.ids(bloco))
+        entradas = []
+        for entrada in tabela.listar_escopo(unidade):
+            if entrada.classificacao not in EXPORTADAS and entrada.nome not in do_bloco_tipos:
+                continue
+            if entrada.classificacao == "constante":
+                metadados = {"valor": valores.get(entrada.nome)}
+            elif entrada.classificacao == "funcao":
+                metadados = {"parametros": [dict(parametro) for parametro in entrada.metadados.get("parametros", [])]}
+            else:
+                metadados = None
+            entradas.append((entrada.nome, entrada.classificacao, entrada.tipo, entrada.quantidade, metadados))
+        return cls(unidade, entradas)
+
+    def serializar(self):
+        cabecalho = b"%s %d %s\n" % (MAGICO, FORMATO, Cache.versao().encode())
+        return cabecalho + pickle.dumps((self.unidade, self.entradas), protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def desserializar(cls, dados, origem="<interface>"):
+        cabecalho, _, corpo = dados.partition(b"\n")
+        partes = cabecalho.split(b" ")
+        if len(partes) != 3 or partes[0] != MAGICO:
+            raise InterfaceInvalida(f"'{origem}' não é um arquivo de interface")
+        if partes[1] != str(FORMATO).encode() or partes[2] != Cache.versao().encode():
+            raise InterfaceInvalida(f"'{origem}' foi gerada por outra versão do compilador; gere a interface de novo")
+        try:
+            unidade, entradas = _LeitorRestrito(io.BytesIO(corpo)).load()
+            entradas = [tuple(entrada) for entrada in entradas]
+            if not isinstance(unidade, str) or not all(
+                len(entrada) == 5 and isinstance(entrada[0], str) and isinstance(entrada[1], str)
+                for entrada in entradas
+            ):
+                raise ValueError("entradas fora do formato")
+        except Exception as erro:
+            raise InterfaceInvalida(f"'{origem}' está corrompida ou adulterada ({erro})") from erro
+        return cls(unidade, entradas)
+
+    def gravar(self, caminho):
+        Path(caminho).write_bytes(self.serializar())
+
+    @classmethod
+    def carregar(cls, caminho):
+        return cls.desserializar(Path(caminho).read_bytes(), caminho)
+
+    def simbolos(self):
+        """Entradas novas da tabela de símbolos, uma por símbolo exportado."""
+        return [
+            EntradaTabelaSimbolos(nome, classificacao, tipo, quantidade=quantidade, metadados=metadados)
+            for nome, classificacao, tipo, quantidade, metadados in self.entradas
+        ]
+
+
+def importar(interfaces):
+    """Símbolos de todas as interfaces; um nome exportado por duas unidades é erro."""
+    simbolos = []
+    origem = {}
+    for interface in interfaces:
+        for entrada in interface.simbolos():
+            if entrada.nome in origem:
+                raise InterfaceInvalida(
+                    f"'{entrada.nome}' é exportado pelas unidades '{origem[entrada.nome]}' e '{interface.unidade}'"
+                )
+            origem[entrada.nome] = interface.unidade
+            simbolos.append(entrada)
+    return simbolos
+
+
+def valores_das_constantes(arvore):
+    """Nome → texto do valor de cada CONSTANTE declarada no programa."""
+    valores = {}
+    declaracoes = _declaracoes(arvore)
+    if declaracoes is None:
+        return valores
+    pilha = list(reversed(Atributos.filhos_do_tipo(declaracoes, "DEF_CONST")))
+    while pilha:
+        atual = pilha.pop()
+        if atual is None:
+            continue
+        if atual.tipo == "CONSTANTE":
+            valor = Atributos.filho(atual, "CONST_VALOR")
+            if valor is not None:
+                valores[Atributos.primeiro_id(atual)] = " ".join(
+                    terminal.valor for terminal in _terminais(valor)
+                )
+            continue
+        pilha.extend(reversed(atual.filhos))
+    return valores
+
+
+def _declaracoes(arvore):
+    # PROGRAMA → CORPO → DECLARACOES
+    corpo = Atributos.filho(arvore, "CORPO")
+    return Atributos.filho(corpo, "DECLARACOES") if corpo is not None else None
+
+
+def _terminais(no):
+    pilha = [no]
+    while pilha:
+        atual = pilha.pop()
+        if atual is None:
+            continue
+        if isinstance(atual, Terminal):
+            yield atual
+        else:
+            pilha.extend(reversed(atual.filhos))
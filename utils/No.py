@@ -1,33 +1,117 @@
+import io
+
 from utils.Cor import Cor
 
 class No:
+    # Sem __dict__ por nó: a árvore concreta é a maior estrutura em memória.
+    # tipo_inferido e argumentos são preenchidos depois pelo AnalisadorSemantico;
+    # atributos guarda os atributos derivados de utils.Atributos, sob demanda.
+    __slots__ = ("tipo", "filhos", "valor", "tipo_inferido", "argumentos", "atributos")
+
     def __init__(self, tipo, filhos=None, valor=None):
         self.tipo = tipo
         self.filhos = filhos or []
         self.valor = valor
+        self.tipo_inferido = None
+        self.argumentos = None
+        self.atributos = None
 
     def printar(self, prefixo="", ultimo=True):
-        conector = "└── " if ultimo else "├── "
+        saida = io.StringIO()
+        self.escrever(saida, prefixo, ultimo)
+        return saida.getvalue()
+
+    def escrever(self, saida, prefixo="", ultimo=True, profundidade=None, max_nos=None, cor=True):
+        """Escreve a árvore em `saida` linha a linha, sem recursão.
 
-        tipo_color = Cor.pintar(self.tipo, Cor.AZUL)
-        qtd_filhos_texto = f"({len(self.filhos)} filho{'s' if len(self.filhos) != 1 else ''})"
-        qtd_filhos = Cor.pintar(qtd_filhos_texto, Cor.CINZA)
+        Sem limites, o texto é idêntico ao de printar. `profundidade` corta os
+        filhos abaixo desse nível e `max_nos` interrompe a escrita depois de
+        tantos nós; nos dois casos uma linha "..." marca o que foi omitido.
+        """
+        pintar = Cor.pintar if cor else (lambda texto, _: texto)
+        escritos = 0
+        # (nó, prefixo, último?, nível)
+        pilha = [(self, prefixo, ultimo, 0)]
+        while pilha:
+            no, prefixo, ultimo, nivel = pilha.pop()
+            if max_nos is not None and escritos >= max_nos:
+                saida.write(prefixo + "└── " + pintar(f"... (árvore truncada após {escritos} nós)", Cor.CINZA) + "\n")
+                return
+            escritos += 1
 
-        rep = prefixo + conector + f"{tipo_color} {qtd_filhos}"
+            filhos = no.filhos
+            qtd_filhos = pintar(f"({len(filhos)} filho{'s' if len(filhos) != 1 else ''})", Cor.CINZA)
+            linha = prefixo + ("└── " if ultimo else "├── ") + f"{pintar(no.tipo, Cor.AZUL)} {qtd_filhos}"
+            if no.valor is not None:
+                linha += f": {pintar(no.valor, Cor.VERDE)}"
+            saida.write(linha + "\n")
 
-        if self.valor is not None:
-            valor_color = Cor.pintar(self.valor, Cor.VERDE)
-            rep += f": {valor_color}"
+            if not filhos:
+                continue
+            prefixo_filho = prefixo + ("    " if ultimo else "│   ")
+            if profundidade is not None and nivel >= profundidade:
+                saida.write(prefixo_filho + "└── " + pintar(f"... ({len(filhos)} omitido{'s' if len(filhos) != 1 else ''})", Cor.CINZA) + "\n")
+                continue
+            # filhos empilhados do último para o primeiro para saírem em ordem
+            ultimo_indice = len(filhos) - 1
+            for i in range(ultimo_indice, -1, -1):
+                pilha.append((filhos[i], prefixo_filho, i == ultimo_indice, nivel + 1))
 
-        rep += "\n"
+    def achatar(self):
+        """A árvore em pré-ordem, como tuplas (tipo, valor, quantidade de filhos, linha).
 
-        prefixo_filho = prefixo + ("    " if ultimo else "│   ")
+        A linha só existe nos Terminal; nos outros nós é None.
 
-        for i, filho in enumerate(self.filhos):
-            ultimo_filho = i == len(self.filhos) - 1
-            rep += filho.printar(prefixo_filho, ultimo_filho)
+        Forma plana, sem recursão, para serializar a árvore (entre processos ou
+        em disco); bem mais barata de pickle do que os nós com __slots__.
+        """
+        plano = []
+        pilha = [self]
+        while pilha:
+            no = pilha.pop()
+            plano.append((no.tipo, no.valor, len(no.filhos), getattr(no, "linha", None)))
+            pilha.extend(reversed(no.filhos))
+        return plano
 
-        return rep
+    @classmethod
+    def reconstruir(cls, plano):
+        """Inverso de achatar."""
+        raiz = None
+        # (lista de filhos a preencher, quantos ainda faltam)
+        pendentes = []
+        for tipo, valor, quantidade, linha in plano:
+            no = cls(tipo, valor=valor) if linha is None else Terminal(tipo, valor, linha)
+            if pendentes:
+                filhos, faltam = pendentes[-1]
+                filhos.append(no)
+                if faltam == 1:
+                    pendentes.pop()
+                else:
+                    pendentes[-1] = (filhos, faltam - 1)
+            else:
+                raiz = no
+            if quantidade:
+                pendentes.append((no.filhos, quantidade))
+        return raiz
 
     def __repr__(self):
         return self.printar()
+
+
+class Terminal(No):
+    """Folha de um token consumido pelo parser, com a linha dele no fonte.
+
+    Só as folhas pagam pela linha; a de um nó interno é a do primeiro
+    Terminal da subárvore (Atributos.linha), usada nos diagnósticos.
+    """
+    __slots__ = ("linha",)
+
+    def __init__(self, tipo, valor, linha):
+        # sem passar por No.__init__: o parser cria um Terminal por token
+        self.tipo = tipo
+        self.filhos = []
+        self.valor = valor
+        self.tipo_inferido = None
+        self.argumentos = None
+        self.atributos = None
+        self.linha = linha
@@ -1,23 +1,60 @@
-from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+from utils.Tipos import Tipo
+
 
-@dataclass
 class EntradaTabelaSimbolos:
-    nome: str
-    classificacao: str
-    tipo: Optional[str] = None
-    escopo: str = "global"
-    quantidade: Optional[int] = None
-    ordem: Optional[int] = None
-    linha: Optional[int] = None
-    metadados: Dict[str, str] = field(default_factory=dict)
+    """Símbolo da tabela. Com __slots__, e metadados só é criado quando usado
+    (na prática, só as funções guardam nele a lista de parâmetros)."""
+
+    __slots__ = ("nome", "classificacao", "tipo", "escopo", "quantidade", "ordem", "linha", "_metadados")
+    CAMPOS = ("nome", "classificacao", "tipo", "escopo", "quantidade", "ordem", "linha", "metadados")
+
+    def __init__(
+        self,
+        nome: str,
+        classificacao: str,
+        tipo: Optional[Tipo] = None,
+        escopo: str = "global",
+        quantidade: Optional[int] = None,
+        ordem: Optional[int] = None,
+        linha: Optional[int] = None,
+        metadados: Optional[Dict[str, object]] = None,
+    ):
+        self.nome = nome
+        self.classificacao = classificacao
+        self.tipo = tipo
+        self.escopo = escopo
+        self.quantidade = quantidade
+        self.ordem = ordem
+        self.linha = linha
+        self._metadados = metadados
+
+    @property
+    def metadados(self) -> Dict[str, object]:
+        if self._metadados is None:
+            self._metadados = {}
+        return self._metadados
+
+    @metadados.setter
+    def metadados(self, metadados: Dict[str, object]):
+        self._metadados = metadados
+
+    def campos(self) -> Dict[str, object]:
+        return {campo: getattr(self, campo) for campo in self.CAMPOS}
 
     def atualizar(self, **campos):
         for chave, valor in campos.items():
             if valor is not None:
                 setattr(self, chave, valor)
 
+    def __eq__(self, outra):
+        if outra.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, campo) == getattr(outra, campo) for campo in self.CAMPOS)
+
+    __hash__ = None
+
     def __repr__(self):
         return (
             f"EntradaTabelaSimbolos(nome={self.nome!r}, classificacao={self.classificacao!r}, "
@@ -26,21 +63,50 @@ class EntradaTabelaSimbolos:
         )
 
 
+class Escopo:
+    """Um escopo da tabela: os símbolos dele e o escopo pai.
+
+    `resolvidos` guarda as buscas já feitas a partir deste escopo (inclusive
+    as que não acharam nada) e vale enquanto `geracao` for a da tabela.
+    """
+
+    __slots__ = ("nome", "pai", "simbolos", "resolvidos", "geracao")
+
+    def __init__(self, nome: str, pai: Optional["Escopo"], simbolos: Dict[str, EntradaTabelaSimbolos]):
+        self.nome = nome
+        self.pai = pai
+        self.simbolos = simbolos
+        self.resolvidos: Dict[str, Optional[EntradaTabelaSimbolos]] = {}
+        self.geracao = -1
+
+
+_AUSENTE = object()
+
+
 class TabelaSimbolos:
-    """Tabela de símbolos com acesso rápido por escopo e nome."""
+    """Tabela de símbolos com acesso rápido por escopo e nome.
+
+    Cada escopo é um objeto com ponteiro para o pai ("p.f" -> "p" -> "global"),
+    e a busca sobe por essa cadeia. O resultado fica no cache do escopo de
+    onde se buscou; inserir um símbolo ou criar um escopo muda a geração da
+    tabela e invalida todos os caches. Uma busca repetida não aloca nada.
+    """
 
     def __init__(self):
-        self._escopos: List[str] = ["global"]
         self._tabelas: Dict[str, Dict[str, EntradaTabelaSimbolos]] = {"global": {}}
+        self._por_nome: Dict[str, Escopo] = {"global": Escopo("global", None, self._tabelas["global"])}
+        self._escopos: List[Escopo] = [self._por_nome["global"]]
+        # escopos criados antes de um prefixo do próprio nome ("a.b" antes de "a")
+        self._orfaos: List[Escopo] = []
+        self._geracao = 0
 
     @property
     def escopo_atual(self) -> str:
-        return self._escopos[-1]
+        return self._escopos[-1].nome
 
     def entrar_escopo(self, nome: str) -> str:
         novo_escopo = self._nomear_escopo(nome)
-        self._escopos.append(novo_escopo)
-        self._tabelas.setdefault(novo_escopo, {})
+        self._escopos.append(self._registrar(novo_escopo))
         return novo_escopo
 
     def sair_escopo(self):
@@ -49,13 +115,14 @@ class TabelaSimbolos:
 
     def adicionar(self, entrada: EntradaTabelaSimbolos, escopo: Optional[str] = None) -> EntradaTabelaSimbolos:
         alvo_escopo = escopo or self.escopo_atual
-        tabela = self._tabelas.setdefault(alvo_escopo, {})
+        tabela = self._registrar(alvo_escopo).simbolos
         if entrada.nome not in tabela:
             entrada.escopo = alvo_escopo
             entrada.ordem = entrada.ordem or (len(tabela) + 1)
             tabela[entrada.nome] = entrada
+            self._geracao += 1
         else:
-            self.atualizar(entrada.nome, escopo=alvo_escopo, **entrada.__dict__)
+            self.atualizar(entrada.nome, escopo=alvo_escopo, **entrada.campos())
         return tabela[entrada.nome]
 
     def atualizar(self, nome: str, escopo: Optional[str] = None, **campos):
@@ -66,23 +133,79 @@ class TabelaSimbolos:
         return entrada
 
     def buscar(self, nome: str, escopo: Optional[str] = None) -> Optional[EntradaTabelaSimbolos]:
-        escopo_inicial = escopo or self.escopo_atual
-        for escopo_atual in self._iterar_escopos(escopo_inicial):
-            tabela = self._tabelas.get(escopo_atual, {})
-            if nome in tabela:
-                return tabela[nome]
-        return None
+        inicial = self._escopos[-1] if not escopo else self._por_nome.get(escopo)
+        if inicial is None:
+            return self._buscar_pelos_nomes(nome, escopo)
+        if inicial.geracao != self._geracao:
+            inicial.resolvidos.clear()
+            inicial.geracao = self._geracao
+        entrada = inicial.resolvidos.get(nome, _AUSENTE)
+        if entrada is not _AUSENTE:
+            return entrada
+        atual = inicial
+        while atual is not None:
+            entrada = atual.simbolos.get(nome)
+            if entrada is not None:
+                break
+            atual = atual.pai
+        inicial.resolvidos[nome] = entrada
+        return entrada
 
     def listar_escopo(self, escopo: Optional[str] = None) -> List[EntradaTabelaSimbolos]:
         return list(self._tabelas.get(escopo or self.escopo_atual, {}).values())
 
+    def substituir_escopo(self, escopo: str, entradas: List[EntradaTabelaSimbolos]):
+        """Troca o conteúdo do escopo pelas entradas, na ordem dada.
+
+        Usado para trazer de volta o escopo de uma função analisada em outro processo.
+        """
+        simbolos = self._registrar(escopo).simbolos
+        simbolos.clear()
+        for entrada in entradas:
+            simbolos[entrada.nome] = entrada
+        self._geracao += 1
+
     def existe_no_escopo(self, nome: str, escopo: Optional[str] = None) -> bool:
-        tabela = self._tabelas.get(escopo or self.escopo_atual, {})
-        return nome in tabela
+        alvo = self._escopos[-1] if not escopo else self._por_nome.get(escopo)
+        return alvo is not None and nome in alvo.simbolos
 
     def __contains__(self, nome: str) -> bool:
         return self.buscar(nome) is not None
 
+    def _registrar(self, nome: str) -> Escopo:
+        escopo = self._por_nome.get(nome)
+        if escopo is not None:
+            return escopo
+        escopo = Escopo(nome, self._pai(nome), self._tabelas.setdefault(nome, {}))
+        self._por_nome[nome] = escopo
+        if "." in nome and escopo.pai.nome != nome.rsplit(".", 1)[0]:
+            self._orfaos.append(escopo)
+        prefixo = nome + "."
+        for orfao in self._orfaos:
+            if orfao.nome.startswith(prefixo):
+                orfao.pai = self._pai(orfao.nome)
+        self._geracao += 1
+        return escopo
+
+    def _pai(self, nome: str) -> Optional[Escopo]:
+        # prefixo pontuado mais longo já registrado; no fim da cadeia, o global
+        if nome == "global":
+            return None
+        while "." in nome:
+            nome = nome.rsplit(".", 1)[0]
+            pai = self._por_nome.get(nome)
+            if pai is not None:
+                return pai
+        return self._por_nome["global"]
+
+    def _buscar_pelos_nomes(self, nome: str, escopo: str) -> Optional[EntradaTabelaSimbolos]:
+        # escopo que não existe na tabela: só os prefixos dele (e o global) contam
+        for escopo_atual in self._iterar_escopos(escopo):
+            tabela = self._tabelas.get(escopo_atual, {})
+            if nome in tabela:
+                return tabela[nome]
+        return None
+
     def _iterar_escopos(self, escopo: str):
         if escopo in self._tabelas:
             yield escopo
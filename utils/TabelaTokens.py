@@ -0,0 +1,54 @@
+from array import array
+from collections.abc import Sequence
+
+from utils.Token import Token
+
+
+class TabelaTokens(Sequence):
+    """Fluxo de tokens em colunas compactas (tipo, início, fim, linha).
+
+    O tipo é guardado como um inteiro pequeno derivado da ordem de Token e os
+    lexemas não são copiados: são fatiados da fonte apenas quando pedidos.
+    Indexar ou iterar produz as mesmas tuplas (tipo, valor, linha) da lista
+    gerada pelo AnalisadorLexico.
+    """
+
+    TIPOS = [token.value for token in Token]
+    CODIGOS = {tipo: codigo for codigo, tipo in enumerate(TIPOS)}
+
+    def __init__(self, fonte):
+        self.fonte = fonte
+        self.codigos = array("B")
+        self.inicios = array("q")
+        self.fins = array("q")
+        self.linhas = array("l")
+
+    def adicionar(self, tipo, inicio, fim, linha):
+        self.codigos.append(self.CODIGOS[tipo])
+        self.inicios.append(inicio)
+        self.fins.append(fim)
+        self.linhas.append(linha)
+
+    def tipo(self, indice):
+        return self.TIPOS[self.codigos[indice]]
+
+    def lexema(self, indice):
+        valor = self.fonte[self.inicios[indice]:self.fins[indice]]
+        return valor if isinstance(valor, str) else bytes(valor).decode("utf-8")
+
+    def linha(self, indice):
+        return self.linhas[indice]
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        return (self.TIPOS[self.codigos[indice]], self.lexema(indice), self.linhas[indice])
+
+    def __iter__(self):
+        tipos = self.TIPOS
+        lexema = self.lexema
+        for i, (codigo, linha) in enumerate(zip(self.codigos, self.linhas)):
+            yield (tipos[codigo], lexema(i), linha)
@@ -0,0 +1,95 @@
+"""Universo canônico de tipos da análise semântica.
+
+Cada tipo existe uma única vez: INTEGER, REAL e STRING são constantes e
+array() / record() devolvem o descritor já existente quando a estrutura é a
+mesma (hash-consing). Assim a igualdade de tipos é uma comparação de
+identidade, e tipos aninhados de record/array não se repetem por variável.
+
+Um nome de tipo declarado (type vetor := array[10] of integer) não ganha
+descritor próprio: ele resolve para o descritor do tipo à direita, como antes,
+então a equivalência continua estrutural.
+
+O texto dos descritores é o mesmo dos dicionários usados até aqui
+({'categoria': 'array', ...}), para as mensagens de erro não mudarem.
+"""
+import weakref
+from typing import Dict, Optional
+
+
+class Tipo:
+    __slots__ = ("__weakref__",)
+
+
+class Primitivo(Tipo):
+    __slots__ = ("nome",)
+
+    def __init__(self, nome: str):
+        self.nome = nome
+
+    def __str__(self):
+        return self.nome
+
+    def __repr__(self):
+        return repr(self.nome)
+
+    def __reduce__(self):
+        return primitivo, (self.nome,)
+
+
+class Array(Tipo):
+    __slots__ = ("base", "tamanho")
+
+    def __init__(self, base: Optional[Tipo], tamanho: Optional[str]):
+        self.base = base
+        self.tamanho = tamanho
+
+    def __repr__(self):
+        return f"{{'categoria': 'array', 'tipo': {self.base!r}, 'tamanho': {self.tamanho!r}}}"
+
+    def __reduce__(self):
+        return array, (self.base, self.tamanho)
+
+
+class Record(Tipo):
+    __slots__ = ("campos",)
+
+    def __init__(self, campos: Dict[str, Optional[Tipo]]):
+        # compartilhado por todos que usam o tipo: não deve ser alterado
+        self.campos = campos
+
+    def __repr__(self):
+        campos = ", ".join(f"{nome!r}: {tipo!r}" for nome, tipo in self.campos.items())
+        return f"{{'categoria': 'record', 'campos': {{{campos}}}}}"
+
+    def __reduce__(self):
+        return record, (self.campos,)
+
+
+INTEGER = Primitivo("integer")
+REAL = Primitivo("real")
+STRING = Primitivo("string")
+PRIMITIVOS = {tipo.nome: tipo for tipo in (INTEGER, REAL, STRING)}
+
+# descritores compostos em uso, pela estrutura
+_universo = weakref.WeakValueDictionary()
+
+
+def primitivo(nome: str) -> Primitivo:
+    return PRIMITIVOS[nome]
+
+
+def array(base: Optional[Tipo], tamanho: Optional[str]) -> Array:
+    chave = ("array", base, tamanho)
+    tipo = _universo.get(chave)
+    if tipo is None:
+        tipo = _universo[chave] = Array(base, tamanho)
+    return tipo
+
+
+def record(campos: Dict[str, Optional[Tipo]]) -> Record:
+    # a ordem dos campos faz parte do tipo (e do texto dele nas mensagens)
+    chave = ("record", tuple(campos.items()))
+    tipo = _universo.get(chave)
+    if tipo is None:
+        tipo = _universo[chave] = Record(dict(campos))
+    return tipo
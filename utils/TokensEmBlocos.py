@@ -0,0 +1,135 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+
+
+class TokensEmBlocos(Sequence):
+    """Tokens (tipo, valor, linha) do modo incremental, guardados em blocos.
+
+    Cada bloco tem as tuplas dos seus tokens e o início de cada um no código,
+    relativo a um deslocamento do bloco. Uma edição troca só os tokens do
+    trecho re-lexado (e refaz os dois blocos das pontas): os blocos seguintes
+    andam somando a diferença ao deslocamento deles, e a diferença de linhas
+    fica pendente, aplicada às tuplas de um bloco só quando ele é lido de novo.
+    Indexar ou iterar produz as mesmas tuplas da lista do AnalisadorLexico.
+    """
+
+    TAMANHO = 512
+
+    def __init__(self):
+        self._blocos = [[]]
+        self._inicios = [array("q")]
+        # por bloco: índice do primeiro token, deslocamento dos inícios e
+        # diferença de linhas ainda não aplicada às tuplas
+        self._primeiros = [0]
+        self._deslocamentos = [0]
+        self._linhas = [0]
+        self._tamanho = 0
+
+    def adicionar(self, token, inicio):
+        if len(self._blocos[-1]) >= self.TAMANHO:
+            self._blocos.append([])
+            self._inicios.append(array("q"))
+            self._primeiros.append(self._tamanho)
+            self._deslocamentos.append(0)
+            self._linhas.append(0)
+        self._blocos[-1].append(token)
+        self._inicios[-1].append(inicio - self._deslocamentos[-1])
+        self._tamanho += 1
+
+    def inicio(self, indice):
+        """Posição no código onde começa o token `indice`."""
+        bloco = bisect_right(self._primeiros, indice) - 1
+        return self._inicios[bloco][indice - self._primeiros[bloco]] + self._deslocamentos[bloco]
+
+    def buscar(self, posicao, de=0):
+        """Índice do primeiro token, a partir de `de`, que começa em `posicao` ou depois."""
+        if not self._tamanho:
+            return de
+        bloco = max(bisect_right(range(len(self._blocos)), posicao, key=self._primeiraPosicao) - 1, 0)
+        indice = self._primeiros[bloco] + bisect_left(self._inicios[bloco], posicao - self._deslocamentos[bloco])
+        return max(indice, de)
+
+    def substituir(self, inicio, fim, tokens, inicios, delta, delta_linhas):
+        """Troca os tokens [inicio:fim] por `tokens` (com `inicios` no código novo).
+
+        Os tokens depois de `fim` passam a começar `delta` posições e
+        `delta_linhas` linhas adiante.
+        """
+        primeiro = bisect_right(self._primeiros, inicio) - 1
+        ultimo = bisect_right(self._primeiros, fim) - 1 if fim < self._tamanho else len(self._blocos) - 1
+        corte = inicio - self._primeiros[primeiro]
+        self._materializar(primeiro)
+        deslocamento = self._deslocamentos[primeiro]
+        novos = self._blocos[primeiro][:corte] + tokens
+        novos_inicios = array("q", (valor + deslocamento for valor in self._inicios[primeiro][:corte]))
+        novos_inicios.extend(inicios)
+        self._anexar(novos, novos_inicios, ultimo, fim - self._primeiros[ultimo], delta, delta_linhas)
+        if len(novos) < self.TAMANHO // 4 and ultimo + 1 < len(self._blocos):
+            # o bloco refeito ficou pequeno: junta o próximo
+            ultimo += 1
+            self._anexar(novos, novos_inicios, ultimo, 0, delta, delta_linhas)
+
+        # o trecho refeito volta em blocos de até TAMANHO tokens, com inícios absolutos
+        pedacos = range(0, len(novos), self.TAMANHO) if novos else range(1 if len(self._blocos) == ultimo - primeiro + 1 else 0)
+        self._blocos[primeiro:ultimo + 1] = [novos[i:i + self.TAMANHO] for i in pedacos]
+        self._inicios[primeiro:ultimo + 1] = [novos_inicios[i:i + self.TAMANHO] for i in pedacos]
+        self._deslocamentos[primeiro:ultimo + 1] = [0] * len(pedacos)
+        self._linhas[primeiro:ultimo + 1] = [0] * len(pedacos)
+        seguinte = primeiro + len(pedacos)
+        for bloco in range(seguinte, len(self._blocos)):
+            self._deslocamentos[bloco] += delta
+            self._linhas[bloco] += delta_linhas
+        self._tamanho += len(tokens) - (fim - inicio)
+        self._primeiros[primeiro:] = [0] * (len(self._blocos) - primeiro)
+        quantidade = self._primeiros[primeiro - 1] + len(self._blocos[primeiro - 1]) if primeiro else 0
+        for bloco in range(primeiro, len(self._blocos)):
+            self._primeiros[bloco] = quantidade
+            quantidade += len(self._blocos[bloco])
+
+    def _anexar(self, tokens, inicios, bloco, desde, delta, delta_linhas):
+        # tokens do bloco a partir de `desde`, já com as diferenças da edição
+        self._materializar(bloco)
+        if delta_linhas:
+            tokens.extend((tipo, valor, linha + delta_linhas) for tipo, valor, linha in self._blocos[bloco][desde:])
+        else:
+            tokens.extend(self._blocos[bloco][desde:])
+        deslocamento = self._deslocamentos[bloco] + delta
+        inicios.extend(valor + deslocamento for valor in self._inicios[bloco][desde:])
+
+    def _primeiraPosicao(self, bloco):
+        return self._inicios[bloco][0] + self._deslocamentos[bloco]
+
+    def _materializar(self, bloco):
+        diferenca = self._linhas[bloco]
+        if diferenca:
+            self._blocos[bloco] = [(tipo, valor, linha + diferenca) for tipo, valor, linha in self._blocos[bloco]]
+            self._linhas[bloco] = 0
+
+    def __len__(self):
+        return self._tamanho
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(self._tamanho))]
+        if indice < 0:
+            indice += self._tamanho
+        if not 0 <= indice < self._tamanho:
+            raise IndexError("índice de token fora da lista")
+        bloco = bisect_right(self._primeiros, indice) - 1
+        if self._linhas[bloco]:
+            self._materializar(bloco)
+        return self._blocos[bloco][indice - self._primeiros[bloco]]
+
+    def __iter__(self):
+        for bloco in range(len(self._blocos)):
+            if self._linhas[bloco]:
+                self._materializar(bloco)
+            yield from self._blocos[bloco]
+
+    def __eq__(self, outra):
+        if not isinstance(outra, Sequence) or isinstance(outra, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(outra) and all(a == b for a, b in zip(self, outra))
+
+    __hash__ = None
@@ -0,0 +1,71 @@
+class Visitante:
+    """Percurso em profundidade com pilha explícita, sem recursão.
+
+    Subclasses definem os ganchos:
+    - entrar(no, herdado) -> (estado, herdado_dos_filhos): em pré-ordem;
+      `herdado` é o valor passado pelo pai (ou o de percorrer, na raiz);
+    - filhos(no): os filhos a visitar, por padrão no.filhos;
+    - sair(no, estado): em pós-ordem, com o estado devolvido por entrar.
+
+    Nós None são ignorados. A profundidade da árvore só é limitada pela memória.
+    """
+
+    def percorrer(self, raiz, herdado=None):
+        # (saindo?, nó, herdado na entrada ou estado na saída)
+        pilha = [(False, raiz, herdado)]
+        while pilha:
+            saindo, no, valor = pilha.pop()
+            if saindo:
+                self.sair(no, valor)
+                continue
+            if not no:
+                continue
+            estado, herdado_filhos = self.entrar(no, valor)
+            pilha.append((True, no, estado))
+            filhos = self.filhos(no)
+            # empilhados do último para o primeiro para saírem em ordem
+            for i in range(len(filhos) - 1, -1, -1):
+                pilha.append((False, filhos[i], herdado_filhos))
+
+    def entrar(self, no, herdado):
+        return None, herdado
+
+    def filhos(self, no):
+        return no.filhos
+
+    def sair(self, no, estado):
+        pass
+
+
+def executar(tarefa):
+    """Executa uma tarefa geradora e devolve o valor retornado por ela.
+
+    Para visitas que agem entre um filho e outro (a geração de código emite
+    rótulos antes, no meio e depois dos filhos), cada método é um gerador e
+    `resultado = yield self.outro_metodo(filho)` chama o outro como subtarefa.
+    As tarefas pendentes ficam numa pilha explícita; exceções sobem de uma
+    subtarefa para quem a chamou, como numa chamada comum.
+    """
+    pilha = [tarefa]
+    valor = None
+    erro = None
+    while pilha:
+        try:
+            if erro is None:
+                subtarefa = pilha[-1].send(valor)
+            else:
+                excecao, erro = erro, None
+                subtarefa = pilha[-1].throw(excecao)
+        except StopIteration as fim:
+            pilha.pop()
+            valor = fim.value
+            continue
+        except BaseException as excecao:
+            pilha.pop()
+            if not pilha:
+                raise
+            erro = excecao
+            continue
+        pilha.append(subtarefa)
+        valor = None
+    return valor